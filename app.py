@@ -5,6 +5,9 @@ from ui.pages.simulation_page import render_simulation_page
 from ui.pages.plan_view_page import render_plan_view_page
 from ui.pages.input_page import render_input_form
 from config.languages import DEFAULT_LANGUAGE
+from services.export_cache import export_cache
+from services.plan_cache import plan_cache
+from utils.storage import storage_manager
 from utils.i18n import i18n, _
 import streamlit as st
 import os
@@ -45,6 +48,14 @@ def render_language_selector():
         st.rerun()  # Rechargement de l'interface pour appliquer la nouvelle langue
 
 
+def configure_caches():
+    """Adosse les caches partagés par toutes les sessions au répertoire de stockage"""
+    if export_cache.cache_dir is None:
+        export_cache.cache_dir = storage_manager.cache_dir("exports")
+    if plan_cache.cache_dir is None:
+        plan_cache.cache_dir = storage_manager.cache_dir("plans")
+
+
 def initialize_session_state():
     """Initialise les variables d'état de session Streamlit nécessaires au fonctionnement de l'application"""
     # Configuration de la langue par défaut
@@ -148,6 +159,7 @@ def render_sidebar():
 def main():
     """Point d'entrée principal de l'application - orchestration du flux d'exécution"""
     setup_page_config()
+    configure_caches()
 
     # Initialisation de l'état
     initialize_session_state()
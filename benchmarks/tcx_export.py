@@ -0,0 +1,153 @@
+"""
+Comparaison de l'export TCX en flux (XmlWriter) avec l'ancien export par
+arbre ElementTree remis en forme par minidom
+
+Usage:
+    python -m benchmarks.tcx_export [--weeks 16] [--sessions 5] [--repeat 20]
+"""
+import argparse
+import sys
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+from xml.dom import minidom
+from xml.etree import ElementTree as ET
+
+from config.languages import SESSION_TYPE_TRANSLATIONS
+from models.course import Course, RaceType
+from models.plan import TrainingPlan
+from models.session import SessionType
+from models.user_data import UserData
+from services.export_service import ExportService
+from services.plan_generator import PlanGenerator
+from utils.date_utils import format_date
+
+
+def export_to_tcx_minidom(plan: TrainingPlan, lang: str = "fr") -> bytes:
+    """
+    Ancien export TCX: arbre ElementTree complet, sérialisé puis relu par
+    minidom pour l'indentation (référence de sortie et de performance)
+
+    Args:
+        plan: Plan d'entraînement à exporter
+        lang: Code de langue
+
+    Returns:
+        Contenu du fichier TCX en bytes
+    """
+    root = ET.Element("TrainingCenterDatabase")
+    root.set("xmlns", "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2")
+    root.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
+    root.set("xsi:schemaLocation", "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2 "
+                                   "http://www.garmin.com/xmlschemas/TrainingCenterDatabasev2.xsd")
+
+    workouts = ET.SubElement(root, "Workouts")
+
+    for session_date, session in plan.sessions.items():
+        if session.session_type == SessionType.REST:
+            continue
+
+        workout = ET.SubElement(workouts, "Workout")
+        workout.set("Sport", "Running")
+
+        session_type_name = SESSION_TYPE_TRANSLATIONS.get(lang, {}).get(
+            session.session_type.value,
+            session.session_type.value
+        )
+
+        ET.SubElement(workout, "Name").text = f"{format_date(session_date, lang, False)} - {session_type_name}"
+        ET.SubElement(workout, "Notes").text = session.description
+
+        if session.blocks:
+            steps = [(block.description, block.distance, 1000 / block.pace.total_seconds())
+                     for block in session.blocks]
+        else:
+            steps = [(session_type_name, session.total_distance,
+                      1000 / plan.user_data.pace_marathon.total_seconds())]
+
+        for step_id, (name, distance, speed_mps) in enumerate(steps, start=1):
+            step = ET.SubElement(workout, "Step")
+            step.set("xsi:type", "Step_t")
+            ET.SubElement(step, "StepId").text = str(step_id)
+            ET.SubElement(step, "Name").text = name
+
+            duration = ET.SubElement(step, "Duration")
+            duration.set("xsi:type", "Distance_t")
+            ET.SubElement(duration, "Meters").text = str(int(distance * 1000))
+
+            ET.SubElement(step, "Intensity").text = "Active"
+
+            target = ET.SubElement(step, "Target")
+            target.set("xsi:type", "Speed_t")
+            speed_zone = ET.SubElement(target, "SpeedZone")
+            ET.SubElement(speed_zone, "LowInMetersPerSecond").text = f"{speed_mps * 0.95:.2f}"
+            ET.SubElement(speed_zone, "HighInMetersPerSecond").text = f"{speed_mps * 1.05:.2f}"
+
+        ET.SubElement(workout, "ScheduledOn").text = session_date.strftime("%Y-%m-%d")
+
+    rough_string = ET.tostring(root, 'utf-8')
+    reparsed = minidom.parseString(rough_string)
+    return reparsed.toprettyxml(indent="  ", encoding="utf-8")
+
+
+def benchmark_plan(weeks: int, sessions_per_week: int) -> TrainingPlan:
+    """Génère le plan (marathon) utilisé par la comparaison"""
+    start_date = date(2025, 1, 6)
+    user_data = UserData(
+        start_date=start_date,
+        main_race=Course(race_date=start_date + timedelta(weeks=weeks, days=6), race_type=RaceType.MARATHON),
+        pace_5k=timedelta(minutes=4),
+        pace_10k=timedelta(minutes=4, seconds=10),
+        pace_half_marathon=timedelta(minutes=4, seconds=25),
+        pace_marathon=timedelta(minutes=4, seconds=40),
+        sessions_per_week=sessions_per_week,
+        min_volume=40,
+        max_volume=70
+    )
+    return PlanGenerator(cache=None).generate_plan(user_data)
+
+
+def measure(export, repeat: int):
+    """Meilleur temps (ms) sur repeat exécutions et pic d'allocation (Mo)"""
+    best = min(timeit.repeat(export, number=1, repeat=repeat)) * 1000
+
+    tracemalloc.start()
+    export()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak / (1024 * 1024)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=16, help="Durée du plan en semaines")
+    parser.add_argument("--sessions", type=int, default=5, help="Séances par semaine")
+    parser.add_argument("--repeat", type=int, default=20, help="Nombre de mesures par export")
+    parser.add_argument("--lang", default="fr", help="Code de langue")
+    args = parser.parse_args(argv)
+
+    plan = benchmark_plan(args.weeks, args.sessions)
+    service = ExportService(cache=None)
+
+    streamed = service.export_to_tcx(plan, args.lang)
+    reference = export_to_tcx_minidom(plan, args.lang)
+    if streamed != reference:
+        print("Sortie différente de l'export minidom", file=sys.stderr)
+        return 1
+
+    print(f"Plan: {args.weeks} semaines, {len(plan.sessions)} séances, TCX {len(streamed) / 1024:.1f} Ko")
+    results = {
+        "minidom": measure(lambda: export_to_tcx_minidom(plan, args.lang), args.repeat),
+        "XmlWriter": measure(lambda: service.export_to_tcx(plan, args.lang), args.repeat),
+    }
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:>10}: {elapsed:8.2f} ms, pic mémoire {peak:6.2f} Mo")
+
+    speedup = results["minidom"][0] / results["XmlWriter"][0]
+    print(f"Accélération: x{speedup:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
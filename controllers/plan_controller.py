@@ -1,22 +1,44 @@
+import io
+import uuid
+import weakref
+import zipfile
 from datetime import date
-from typing import Dict, Any, Optional, Union, BinaryIO, List
+from typing import Dict, Any, Iterable, Iterator, Optional, Union, BinaryIO, List
 
 from models.plan import TrainingPlan
+from models.plan_history import PlanDiff, PlanHistory
 from models.user_data import UserData
-from services.export_service import ExportService
+from services.export_service import EXPORT_FORMATS, ExportService, ics_options, ics_plan_id
+from services.ics_feed import IcsFeed
 from services.import_service import ImportService
 from services.plan_generator import PlanGenerator
 from utils.storage import storage_manager
 
+# Nom des fichiers de chaque format dans l'archive de PlanController.export_all
+EXPORT_FILENAMES = {
+    "ics": "training_plan.ics",
+    "tcx": "training_plan_garmin.tcx",
+    "pdf": "training_plan.pdf",
+    "json": "training_plan.json",
+}
+
 
 class PlanController:
     """Contrôleur responsable de la gestion, génération, manipulation et export des plans d'entraînement"""
 
     def __init__(self):
         self.plan_generator = PlanGenerator()
-        self.export_service = ExportService()
+        # Exports mis en cache pour le compte de ce contrôleur (une session de l'application)
+        owner = uuid.uuid4().hex
+        self.export_service = ExportService(owner=owner)
+        # Fin de session: le contrôleur est libéré avec l'état de la session,
+        # ses exports sont alors retirés du cache
+        if self.export_service.cache is not None:
+            weakref.finalize(self, self.export_service.cache.release, owner)
         self.import_service = ImportService()
         self.current_plan: Optional[TrainingPlan] = None
+        self.history = PlanHistory()
+        self.ics_feed: Optional[IcsFeed] = None
 
     def generate_plan(self, user_data: UserData) -> TrainingPlan:
         """
@@ -28,61 +50,14 @@ class PlanController:
         Returns:
             Un plan d'entraînement complet adapté aux besoins de l'utilisateur
         """
-        # Vérifier si les données ont changé par rapport au plan existant
-        force_regenerate = True
-        if self.current_plan and hasattr(self.current_plan, 'user_data'):
-            force_regenerate = not self._compare_user_data(self.current_plan.user_data, user_data)
-        
         # Générer un nouveau plan d'entraînement
         self.current_plan = self.plan_generator.generate_plan(user_data)
 
         # Persistance des données
-        self._save_current_plan()
+        self._save_current_plan("génération")
 
         return self.current_plan
         
-    def _compare_user_data(self, old_data: UserData, new_data: UserData) -> bool:
-        """
-        Compare deux objets UserData pour détecter des changements significatifs
-        
-        Args:
-            old_data: Données utilisateur précédentes
-            new_data: Nouvelles données utilisateur
-            
-        Returns:
-            True si les données sont essentiellement identiques, False si des changements
-            nécessitent une régénération du plan
-        """
-        # Comparaison des dates et paramètres principaux
-        if old_data.start_date != new_data.start_date:
-            return False
-        if old_data.main_race.race_date != new_data.main_race.race_date:
-            return False
-        if old_data.main_race.race_type != new_data.main_race.race_type:
-            return False
-        if old_data.sessions_per_week != new_data.sessions_per_week:
-            return False
-        if old_data.min_volume != new_data.min_volume:
-            return False
-        if old_data.max_volume != new_data.max_volume:
-            return False
-        
-        # Comparaison des allures de référence
-        if old_data.pace_5k != new_data.pace_5k:
-            return False
-        if old_data.pace_10k != new_data.pace_10k:
-            return False
-        if old_data.pace_half_marathon != new_data.pace_half_marathon:
-            return False
-        if old_data.pace_marathon != new_data.pace_marathon:
-            return False
-            
-        # Vérification des courses intermédiaires
-        if len(old_data.intermediate_races) != len(new_data.intermediate_races):
-            return False
-        
-        return True
-
     def load_plan(self) -> Optional[TrainingPlan]:
         """
         Charge le plan d'entraînement depuis le stockage persistant
@@ -121,6 +96,84 @@ class PlanController:
 
         return self.export_service.export_to_ics(self.current_plan, lang, options)
 
+    def export_ics_delta(self, since: Optional[int] = None, lang: str = "fr",
+                         options: dict = None) -> Optional[bytes]:
+        """
+        Exporte uniquement les événements modifiés depuis un export précédent
+
+        Le plan courant est publié dans le flux ICS du contrôleur (créé au
+        premier appel, voir publish_ics_feed).
+
+        Args:
+            since: Révision du flux déjà importée dans le calendrier (None = aucune)
+            lang: Code de langue
+            options: Options de personnalisation de l'export (voir export_to_ics)
+
+        Returns:
+            Contenu ICS des différences ou None si aucun plan n'est disponible
+        """
+        feed = self.publish_ics_feed(lang, options)
+        if feed is None:
+            return None
+
+        return feed.delta(since)
+
+    def publish_ics_feed(self, lang: str = "fr", options: dict = None) -> Optional[IcsFeed]:
+        """
+        Publie le plan courant dans le flux ICS incrémental
+
+        Une fois le flux créé, chaque modification du plan y est publiée
+        automatiquement (voir _save_current_plan). Un changement de langue
+        ou d'options reconfigure le flux existant; un nouveau flux n'est créé
+        que pour un autre plan (autres UID). Les numéros de révision (SEQUENCE)
+        publiés sont sauvegardés et repris par le flux suivant du même plan,
+        y compris après un redémarrage.
+
+        Args:
+            lang: Code de langue
+            options: Options de personnalisation de l'export (voir export_to_ics)
+
+        Returns:
+            Flux ICS ou None si aucun plan n'est disponible
+        """
+        if self.current_plan is None:
+            return None
+
+        return self._publish_ics_feed(lang, options)
+
+    def _publish_ics_feed(self, lang: str, options: Optional[dict], message: str = "") -> IcsFeed:
+        """Publie le plan courant dans le flux ICS et sauvegarde les numéros de révision"""
+        plan_id = ics_options(options)["plan_id"] or ics_plan_id(self.current_plan)
+
+        feed = self.ics_feed
+        if feed is None or feed.plan_id != plan_id:
+            feed = IcsFeed(lang, options, self.export_service, storage_manager.load_ics_sequences(plan_id))
+            self.ics_feed = feed
+        else:
+            feed.configure(lang, options)
+
+        feed.publish(self.current_plan, message)
+        storage_manager.save_ics_sequences(plan_id, feed.sequences)
+        return feed
+
+    def serve_ics_feed(self, port: int = 8765, lang: str = "fr", options: dict = None):
+        """
+        Sert le flux ICS du plan courant en local, pour un abonnement de calendrier
+
+        Args:
+            port: Port d'écoute
+            lang: Code de langue
+            options: Options de personnalisation de l'export (voir export_to_ics)
+
+        Returns:
+            Serveur HTTP démarré (voir IcsFeed.serve) ou None si aucun plan n'est disponible
+        """
+        feed = self.publish_ics_feed(lang, options)
+        if feed is None:
+            return None
+
+        return feed.serve(port=port)
+
     def export_to_pdf(self, lang: str = "fr", options: dict = None) -> Optional[bytes]:
         """
         Exporte le plan courant au format PDF pour impression ou partage
@@ -168,9 +221,112 @@ class PlanController:
 
         return self.export_service.export_to_tcx(self.current_plan, lang)
 
+    def iter_tcx(self, lang: str = "fr") -> Optional[Iterator[bytes]]:
+        """
+        Exporte le plan courant au format TCX par morceaux, pour un
+        téléchargement HTTP en transfert par blocs
+
+        Args:
+            lang: Code de langue pour la localisation des descriptions d'entraînement
+
+        Returns:
+            Itérateur sur les morceaux du fichier TCX ou None si aucun plan n'est disponible
+        """
+        if self.current_plan is None:
+            return None
+
+        return self.export_service.iter_tcx(self.current_plan, lang)
+
+    def export_all(self, formats: Iterable[str] = EXPORT_FORMATS, lang: str = "fr",
+                   options: Optional[Dict[str, dict]] = None,
+                   as_zip: bool = False) -> Optional[Union[Dict[str, bytes], bytes]]:
+        """
+        Exporte le plan courant dans plusieurs formats à la fois
+
+        Les formats sont produits en parallèle (voir ExportService.export_all).
+
+        Args:
+            formats: Formats à produire (ics, tcx, pdf, json)
+            lang: Code de langue
+            options: Options de chaque format (ex: {"ics": {...}, "pdf": {...}})
+            as_zip: Si True, renvoie une archive ZIP contenant un fichier par format
+
+        Returns:
+            Contenu de chaque format, archive ZIP si as_zip, ou None si aucun
+            plan n'est disponible
+        """
+        if self.current_plan is None:
+            return None
+
+        exports = self.export_service.export_all(self.current_plan, formats, lang, options)
+        if not as_zip:
+            return exports
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for export_format, content in exports.items():
+                archive.writestr(EXPORT_FILENAMES[export_format], content)
+        return buffer.getvalue()
+
+    def export_plans_to_bundle(self, plan_ids: Optional[List[int]] = None,
+                               target: Optional[Union[str, BinaryIO]] = None) -> Optional[bytes]:
+        """
+        Exporte des plans sauvegardés dans une archive compressée, pour les
+        transférer vers une autre instance
+
+        Les plans sont chargés et écrits un à un.
+
+        Args:
+            plan_ids: Identifiants des plans à exporter (None = tous les plans sauvegardés)
+            target: Chemin ou fichier ouvert en écriture binaire (None = en mémoire)
+
+        Returns:
+            Contenu de l'archive si target est None, None sinon
+        """
+        return self.export_service.export_to_bundle(self._iter_saved_plans(plan_ids), target)
+
+    def _iter_saved_plans(self, plan_ids: Optional[List[int]]) -> Iterator[TrainingPlan]:
+        """Charge un à un les plans sauvegardés"""
+        if plan_ids is None:
+            saved_plans = storage_manager.list_saved_plans()
+            if saved_plans and "id" not in saved_plans[0]:
+                # Avec st.session_state, seul le plan courant est disponible
+                yield from (saved["plan"] for saved in saved_plans)
+                return
+            plan_ids = [saved["id"] for saved in saved_plans]
+
+        for plan_id in plan_ids:
+            plan = storage_manager.load_plan_by_id(plan_id)
+            if plan is not None:
+                yield plan
+
+    def import_plans_from_bundle(self, bundle_data: Union[str, bytes, BinaryIO]) -> Optional[Dict[str, Any]]:
+        """
+        Importe les plans d'une archive compressée dans le stockage
+
+        Les plans importés sont sauvegardés sans remplacer le plan courant.
+        Un plan corrompu est ignoré et signalé dans le bilan.
+
+        Args:
+            bundle_data: Chemin, contenu de l'archive ou fichier ouvert en lecture binaire
+
+        Returns:
+            Bilan de l'import (imported, failed, errors, plan_ids) ou None si
+            les données ne sont pas une archive valide
+        """
+        try:
+            plans = self.import_service.iter_plans_from_bundle(bundle_data)
+            plan_ids = [storage_manager.save_plan(plan, make_current=False) for plan in plans]
+        except Exception as e:
+            print(f"Erreur lors de l'importation de l'archive de plans: {e}")
+            return None
+
+        return {**plans.stats, "errors": plans.errors, "plan_ids": plan_ids}
+
     def import_from_json(self, json_data: Union[str, BinaryIO]) -> Optional[TrainingPlan]:
         """
-        Importe un plan d'entraînement depuis des données JSON
+        Importe un plan d'entraînement depuis des données JSON (ou binaires,
+        le format étant détecté d'après l'en-tête)
 
         Args:
             json_data: Données JSON sous forme de chaîne ou de fichier ouvert
@@ -179,13 +335,30 @@ class PlanController:
             Le plan importé ou None en cas d'échec de l'importation
         """
         try:
-            self.current_plan = self.import_service.import_from_json(json_data)
-            self._save_current_plan()
+            self.current_plan = self.import_service.import_plan(json_data)
+            self._save_current_plan("import")
             return self.current_plan
         except Exception as e:
             print(f"Erreur lors de l'importation du plan: {e}")
             return None
 
+    def keep_simulation(self, simulated_plan: TrainingPlan) -> TrainingPlan:
+        """
+        Remplace le plan courant par un plan simulé (voir SimulationController)
+
+        Le plan est enregistré comme une révision de l'historique et publié
+        dans le flux ICS, comme toute autre modification du plan courant.
+
+        Args:
+            simulated_plan: Plan simulé à conserver
+
+        Returns:
+            Le nouveau plan courant
+        """
+        self.current_plan = simulated_plan
+        self._save_current_plan("simulation conservée")
+        return self.current_plan
+
     def adjust_to_current_date(self, current_date: Optional[date] = None) -> Optional[TrainingPlan]:
         """
         Ajuste le plan d'entraînement en fonction de la date actuelle
@@ -207,7 +380,7 @@ class PlanController:
         try:
             adjusted_plan = self.plan_generator.adjust_plan(self.current_plan, current_date)
             self.current_plan = adjusted_plan
-            self._save_current_plan()
+            self._save_current_plan(f"ajustement au {current_date.isoformat()}")
             return self.current_plan
         except Exception as e:
             print(f"Erreur lors de l'ajustement du plan: {e}")
@@ -269,13 +442,11 @@ class PlanController:
         if self.current_plan is None:
             return []
 
-        sessions_by_week = self.current_plan.get_sessions_by_week()
-        if week_num not in sessions_by_week:
+        # Séances de la semaine, déjà triées par date (donc par jour de la semaine)
+        sorted_sessions = self.current_plan.get_week_sessions(week_num)
+        if not sorted_sessions:
             return []
 
-        # Trier les séances par jour de la semaine
-        sorted_sessions = sorted(sessions_by_week[week_num], key=lambda s: s.session_date.weekday())
-
         # Convertir les séances en dictionnaires
         session_dicts = []
         for session in sorted_sessions:
@@ -351,10 +522,57 @@ class PlanController:
             "session_types": session_types
         }
 
-    def _save_current_plan(self) -> None:
+    def get_plan_history(self) -> List[Dict[str, Any]]:
         """
-        Sauvegarde le plan courant dans le stockage persistant
+        Liste les révisions successives du plan courant
+
+        Returns:
+            Liste des révisions (voir PlanHistory.log)
+        """
+        return self.history.log()
+
+    def checkout_revision(self, rev: int) -> Optional[TrainingPlan]:
+        """
+        Restaure une révision antérieure du plan comme plan courant
+
+        Args:
+            rev: Numéro de révision
+
+        Returns:
+            Plan restauré ou None si la révision n'existe pas
+        """
+        try:
+            self.current_plan = self.history.checkout(rev)
+        except IndexError as e:
+            print(f"Erreur lors de la restauration de la révision: {e}")
+            return None
+
+        self._save_current_plan(f"restauration de la révision {rev}")
+        return self.current_plan
+
+    def diff_revisions(self, rev_a: int, rev_b: int) -> PlanDiff:
+        """
+        Compare deux révisions du plan
+
+        Args:
+            rev_a: Première révision
+            rev_b: Seconde révision
+
+        Returns:
+            Différences de rev_a à rev_b
+        """
+        return self.history.diff(rev_a, rev_b)
+
+    def _save_current_plan(self, message: str = "") -> None:
+        """
+        Sauvegarde le plan courant dans le stockage persistant et l'ajoute à l'historique
         Cette méthode privée est appelée automatiquement après chaque modification du plan
+
+        Args:
+            message: Description de la modification, conservée dans l'historique
         """
         if self.current_plan:
+            self.history.commit(self.current_plan, message)
+            if self.ics_feed is not None:
+                self._publish_ics_feed(self.ics_feed.lang, self.ics_feed.options, message)
             storage_manager.save_plan(self.current_plan)
\ No newline at end of file
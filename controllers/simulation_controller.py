@@ -36,8 +36,14 @@ class SimulationController:
         # Appliquer les modifications demandées aux données utilisateur
         modified_user_data = self._apply_simulation_params(user_data, simulation_params)
 
-        # Générer le plan avec les paramètres modifiés
-        self.current_simulation = self.plan_generator.generate_plan(modified_user_data)
+        # Générer le plan avec les paramètres modifiés, en ne recalculant que ce
+        # qui diffère de la simulation précédente
+        if self.current_simulation is None:
+            self.current_simulation = self.plan_generator.generate_plan(modified_user_data)
+        else:
+            self.current_simulation = self.plan_generator.regenerate_plan(
+                self.current_simulation, modified_user_data
+            )
 
         return self.current_simulation
 
@@ -55,7 +61,8 @@ class SimulationController:
         """
         comparison = {}
 
-        # Analyse comparative des volumes totaux
+        # Analyse comparative des volumes totaux (agrégats calculés sur la vue
+        # en colonnes de chaque plan, sans parcourir les séances)
         original_volume = original_plan.get_total_volume()
         simulated_volume = simulated_plan.get_total_volume()
         volume_diff = simulated_volume - original_volume
@@ -71,22 +78,17 @@ class SimulationController:
         # Analyse comparative des durées d'entraînement
         original_duration = original_plan.get_total_duration()
         simulated_duration = simulated_plan.get_total_duration()
-        duration_diff = simulated_duration - original_duration
-        duration_diff_seconds = duration_diff.total_seconds()
 
         comparison["duration"] = {
             "original": original_duration,
             "simulated": simulated_duration,
-            "difference": duration_diff
+            "difference": simulated_duration - original_duration
         }
 
         # Analyse comparative de la distribution des types de séances
-        original_types = self._count_session_types(original_plan)
-        simulated_types = self._count_session_types(simulated_plan)
-
         comparison["session_types"] = {
-            "original": original_types,
-            "simulated": simulated_types
+            "original": self._count_session_types(original_plan),
+            "simulated": self._count_session_types(simulated_plan)
         }
 
         # Analyse comparative des volumes hebdomadaires
@@ -309,10 +311,11 @@ class SimulationController:
         Returns:
             Dictionnaire comptabilisant chaque type de séance
         """
-        type_counts = {}
-
-        for session in plan.sessions.values():
-            session_type = session.session_type.value
-            type_counts[session_type] = type_counts.get(session_type, 0) + 1
+        # Groupes de l'index des séances par type (tenu à jour par le plan)
+        type_counts = {
+            session_type.value: len(sessions)
+            for session_type, sessions in plan.get_sessions_by_type().items()
+            if sessions
+        }
 
         return type_counts
\ No newline at end of file
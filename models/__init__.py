@@ -1,11 +1,20 @@
 from .course import Course, RaceType
 from .user_data import UserData
-from .session import Session, SessionType, TrainingPhase, SessionBlock
+from .session import Session, SessionType, TrainingPhase, SessionBlock, BlockRepeat
+from .phase_schedule import PhaseSchedule
+from .plan_frame import PlanFrame
 from .plan import TrainingPlan
+from .plan_history import PlanDiff, PlanHistory
+from .lazy_plan import LazyTrainingPlan
+from .mapped_plan import MappedTrainingPlan
 
 __all__ = [
     'Course', 'RaceType',
     'UserData',
-    'Session', 'SessionType', 'TrainingPhase', 'SessionBlock',
-    'TrainingPlan'
+    'Session', 'SessionType', 'TrainingPhase', 'SessionBlock', 'BlockRepeat',
+    'PhaseSchedule',
+    'PlanFrame',
+    'TrainingPlan',
+    'PlanDiff', 'PlanHistory',
+    'LazyTrainingPlan', 'MappedTrainingPlan'
 ]
\ No newline at end of file
@@ -74,14 +74,34 @@ class Course:
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Course':
-        """Crée un objet Course à partir d'un dictionnaire"""
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'Course':
+        """
+        Crée un objet Course à partir d'un dictionnaire
+
+        Args:
+            data: Dictionnaire représentant la course
+            trusted: Si True, les données proviennent d'une course déjà validée
+                     (stockage local): l'objet est construit sans __post_init__,
+                     avec l'allure cible enregistrée telle quelle
+        """
         # Conversion des types
         race_date = date.fromisoformat(data["race_date"])
         race_type = RaceType(data["race_type"])
         target_time = timedelta(seconds=data["target_time"]) if data.get("target_time") else None
         target_pace = timedelta(seconds=data["target_pace"]) if data.get("target_pace") else None
 
+        if trusted:
+            course = cls.__new__(cls)
+            course.__dict__.update(
+                race_date=race_date,
+                race_type=race_type,
+                distance=data.get("distance"),
+                target_time=target_time,
+                target_pace=target_pace,
+                is_main_race=data.get("is_main_race", False)
+            )
+            return course
+
         return cls(
             race_date=race_date,
             race_type=race_type,
@@ -0,0 +1,115 @@
+from datetime import date
+from typing import Callable, Dict, List, Mapping, Optional, Set
+
+from .user_data import UserData
+from .session import Session, TrainingPhase
+from .plan import TrainingPlan
+
+# Fonction de chargement: {date: clé de la séance} -> {date: séance}
+SessionLoader = Callable[[Dict[date, str]], Dict[date, Session]]
+
+
+class LazyTrainingPlan(TrainingPlan):
+    """
+    Plan d'entraînement dont les séances sont chargées à la demande, semaine par semaine
+
+    Les données utilisateur, les phases et les volumes hebdomadaires sont
+    disponibles immédiatement. Les accès limités à une semaine (get_session,
+    get_week_sessions, get_week_stats, get_weekly_volume, get_weekly_duration)
+    ne chargent que la semaine concernée; tout accès à sessions ou aux vues de
+    l'ensemble du plan charge les semaines restantes, après quoi le plan se
+    comporte comme un TrainingPlan ordinaire.
+    """
+
+    def __init__(self, user_data: UserData, phase_dates: Mapping[TrainingPhase, List[date]],
+                 weekly_volumes: Dict[int, float], session_index: Mapping[date, str],
+                 load_sessions: SessionLoader, version: str = "1.0.0"):
+        """
+        Initialise le plan sans charger ses séances
+
+        Args:
+            user_data: Données utilisateur
+            phase_dates: Planning des phases
+            weekly_volumes: Volumes par semaine
+            session_index: Clé de chaque séance (ex: empreinte), par date
+            load_sessions: Fonction de chargement des séances à partir de leurs clés
+            version: Version du format de données du plan
+        """
+        self._pending: Dict[int, Dict[date, str]] = {}
+        super().__init__(user_data=user_data, sessions={}, phase_dates=phase_dates,
+                         weekly_volumes=weekly_volumes, version=version)
+
+        self._load_sessions = load_sessions
+        for session_date, key in session_index.items():
+            week_num = (session_date - user_data.start_date).days // 7
+            self._pending.setdefault(week_num, {})[session_date] = key
+
+    @property
+    def sessions(self) -> Dict[date, Session]:
+        """Séances du plan par date (charge toutes les semaines restantes)"""
+        if self._pending:
+            self.load_weeks(list(self._pending))
+        return self._sessions
+
+    @sessions.setter
+    def sessions(self, sessions: Dict[date, Session]) -> None:
+        # Remplacer les séances annule les chargements en attente
+        self._pending = {}
+        self._sessions = sessions
+
+    @property
+    def pending_weeks(self) -> Set[int]:
+        """Semaines dont les séances ne sont pas encore chargées"""
+        return set(self._pending)
+
+    def load_weeks(self, weeks: List[int]) -> None:
+        """
+        Charge les séances de plusieurs semaines (en un seul appel au chargeur)
+
+        Args:
+            weeks: Numéros des semaines (0-indexed)
+        """
+        keys: Dict[date, str] = {}
+        for week_num in weeks:
+            keys.update(self._pending.pop(week_num, {}))
+
+        if keys:
+            self._sessions.update(self._load_sessions(keys))
+
+    def get_session(self, session_date: date) -> Optional[Session]:
+        """Récupère une séance par sa date (en ne chargeant que sa semaine)"""
+        self.load_weeks([(session_date - self.user_data.start_date).days // 7])
+        return self._sessions.get(session_date)
+
+    def get_week_sessions(self, week_num: int) -> List[Session]:
+        """
+        Récupère les séances d'une semaine (en ne chargeant que cette semaine)
+
+        Args:
+            week_num: Numéro de la semaine (0-indexed)
+
+        Returns:
+            Liste des séances de la semaine triées par date
+        """
+        if not self._pending:
+            return super().get_week_sessions(week_num)
+
+        self.load_weeks([week_num])
+        start, end = self.get_week_dates(week_num)
+        return [session for session_date, session in sorted(self._sessions.items())
+                if start <= session_date <= end]
+
+    def get_week_stats(self, week_num: int) -> Dict[str, float]:
+        """
+        Calcule les agrégats d'une semaine (en ne chargeant que cette semaine)
+
+        Args:
+            week_num: Numéro de la semaine (0-indexed)
+
+        Returns:
+            Agrégats de la semaine (voir TrainingPlan.get_week_stats)
+        """
+        if not self._pending:
+            return super().get_week_stats(week_num)
+
+        return self._compute_week_stats(self.get_week_sessions(week_num))
@@ -0,0 +1,133 @@
+from datetime import date
+from typing import Dict, List, Union
+
+import numpy as np
+
+from .session import Session
+from .lazy_plan import LazyTrainingPlan
+from .plan import sessions_revision
+from .plan_binary import BLOCK_RECORD, SESSION_RECORD, decode_sessions, read_layout
+from .plan_frame import PlanFrame
+
+# Enregistrement SESSION_RECORD vu comme un type structuré NumPy (mêmes positions, sans alignement)
+SESSION_DTYPE = np.dtype({
+    "names": ["date", "type", "phase", "is_intermediate_race", "description", "blocks",
+              "distance", "duration", "difficulty"],
+    "formats": ["<i4", "u1", "u1", "u1", "<u4", "<u4", "<f8", "<f8", "<f8"],
+    "offsets": [0, 4, 5, 6, 7, 11, 15, 23, 31],
+    "itemsize": SESSION_RECORD.size
+})
+
+
+class MappedTrainingPlan(LazyTrainingPlan):
+    """
+    Plan d'entraînement lu directement dans un plan binaire en mémoire
+    (typiquement un fichier projeté en mémoire, voir utils.plan_catalog)
+
+    Seul l'en-tête (données utilisateur, phases, volumes, textes) est décodé
+    à l'ouverture. Tant que le plan n'est pas modifié, la vue en colonnes
+    (frame) et les agrégats qui en dépendent (volume et durée totaux,
+    statistiques par phase) lisent les enregistrements des séances dans le
+    tampon, sans copie: les processus qui projettent le même fichier
+    partagent ces données. Les séances ne sont construites qu'à l'accès, par
+    semaine (voir LazyTrainingPlan).
+
+    Le tampon doit rester valide pendant toute la durée de vie du plan.
+    """
+
+    def __init__(self, data: Union[bytes, memoryview], trusted: bool = True, verify: bool = True):
+        """
+        Ouvre un plan binaire sans décoder ses séances
+
+        Args:
+            data: Plan sérialisé (voir TrainingPlan.to_bytes)
+            trusted: Si True, les données utilisateur ne sont pas revalidées et
+                     les agrégats enregistrés des séances sont repris (sinon
+                     ils sont recalculés et la vue en colonnes n'est pas lue
+                     dans le tampon)
+            verify: Si False, la somme de contrôle n'est pas recalculée (données
+                    déjà vérifiées)
+
+        Raises:
+            ValueError: Si les données ne sont pas un plan binaire valide
+        """
+        buffer = memoryview(data)
+        layout = read_layout(buffer, trusted=trusted, verify=verify)
+        records = np.frombuffer(buffer, SESSION_DTYPE, count=layout.session_count,
+                                offset=layout.sessions_offset)
+
+        self._buffer = buffer
+        self._trusted = trusted
+        self._layout = layout
+        self._records = records
+        # Position du premier enregistrement de blocs de chaque séance
+        self._block_starts = np.concatenate(([0], np.cumsum(records["blocks"], dtype=np.int64)))
+        self._mapped_frame = None
+
+        super().__init__(
+            user_data=layout.user_data,
+            phase_dates=layout.phase_schedule,
+            weekly_volumes=layout.weekly_volumes,
+            session_index={date.fromordinal(int(day)): row for row, day in enumerate(records["date"])},
+            load_sessions=self._decode_rows,
+            version=layout.version
+        )
+
+        self._mapped_store = self._sessions
+        self._mapped_version = self._sessions.version
+
+    def _decode_rows(self, rows: Dict[date, int]) -> Dict[date, Session]:
+        """Construit les séances des enregistrements indiqués"""
+        layout = self._layout
+        sessions: Dict[date, Session] = {}
+        for row in rows.values():
+            record = SESSION_RECORD.unpack_from(self._buffer, layout.sessions_offset + row * SESSION_RECORD.size)
+            start = layout.blocks_offset + int(self._block_starts[row]) * BLOCK_RECORD.size
+            end = layout.blocks_offset + int(self._block_starts[row + 1]) * BLOCK_RECORD.size
+            blocks = list(BLOCK_RECORD.iter_unpack(self._buffer[start:end]))
+            sessions.update(decode_sessions([record], blocks, layout.texts, self._trusted))
+        return sessions
+
+    def _is_mapped(self) -> bool:
+        """Indique si les séances du plan sont toujours celles du tampon (plan non modifié)"""
+        return (self._trusted and self._sessions is self._mapped_store and self._sessions.version == self._mapped_version
+                and sessions_revision(self._sessions.values()) == 0)
+
+    def load_weeks(self, weeks: List[int]) -> None:
+        mapped = self._is_mapped()
+        super().load_weeks(weeks)
+        if mapped:
+            self._mapped_version = self._sessions.version
+
+    def frame(self) -> PlanFrame:
+        """
+        Vue en colonnes des séances, triées par date (voir TrainingPlan.frame)
+
+        Tant que le plan n'est pas modifié, les colonnes date, type, phase,
+        distance, duration, difficulty et is_intermediate_race sont des vues
+        sur le tampon; seule la colonne week est calculée.
+
+        Returns:
+            Vue des séances
+        """
+        if not self._is_mapped():
+            return super().frame()
+
+        if self._mapped_frame is None:
+            records = self._records
+            if len(records) > 1 and not np.all(records["date"][1:] > records["date"][:-1]):
+                # Enregistrements non triés par date: vue triée (copie)
+                records = records[np.argsort(records["date"], kind="stable")]
+
+            self._mapped_frame = PlanFrame({
+                "date": records["date"],
+                "week": (records["date"].astype(np.int64) - self.user_data.start_date.toordinal()) // 7,
+                "type": records["type"],
+                "phase": records["phase"],
+                "distance": records["distance"],
+                "duration": records["duration"],
+                "difficulty": records["difficulty"],
+                "is_intermediate_race": records["is_intermediate_race"].view(np.bool_)
+            })
+
+        return self._mapped_frame
@@ -0,0 +1,208 @@
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .session import TrainingPhase
+
+
+class PhaseSchedule(Mapping[TrainingPhase, List[date]]):
+    """
+    Représentation compacte des phases d'entraînement sous forme de plages.
+
+    Chaque phase est stockée par sa date de début, sa date de fin et la plage
+    de semaines correspondante, ce qui permet de retrouver la phase d'une date
+    ou d'une semaine en temps constant. L'objet se comporte également comme
+    l'ancien dictionnaire {phase: [dates]} : les listes de dates ne sont
+    construites qu'à la demande puis conservées.
+
+    Attributes:
+        start_date: Date de référence du plan (lundi de la semaine 0)
+        ranges: Dictionnaire des phases avec leurs dates (début, fin)
+    """
+
+    def __init__(self, start_date: date, ranges: Dict[TrainingPhase, Tuple[date, date]]):
+        self.start_date = start_date
+        self.ranges = dict(ranges)
+        self._date_lists: Dict[TrainingPhase, List[date]] = {}
+
+        # Précalcul de la phase prédominante de chaque semaine du plan
+        last_week = self.week_index(self.last_date) if self.ranges else -1
+        self._week_phases = [
+            self._compute_week_phase(self.start_date + timedelta(days=week_idx * 7))
+            for week_idx in range(last_week + 1)
+        ]
+
+    @classmethod
+    def from_date_lists(cls, phases: Mapping[TrainingPhase, List[date]],
+                        start_date: Optional[date] = None) -> 'PhaseSchedule':
+        """
+        Construit un planning de phases à partir de listes de dates par phase
+
+        Args:
+            phases: Dictionnaire des phases et leurs dates (ou planning existant)
+            start_date: Date de début du plan (par défaut, le lundi de la première date)
+
+        Returns:
+            Planning de phases équivalent
+        """
+        if isinstance(phases, PhaseSchedule):
+            return phases
+
+        ranges = {
+            phase: (min(dates), max(dates))
+            for phase, dates in phases.items()
+            if dates
+        }
+
+        if start_date is None:
+            if ranges:
+                first_date = min(start for start, _ in ranges.values())
+                start_date = first_date - timedelta(days=first_date.weekday())
+            else:
+                start_date = date.today()
+
+        return cls(start_date, ranges)
+
+    # Interface Mapping: vue de compatibilité {phase: [dates]}
+
+    def __getitem__(self, phase: TrainingPhase) -> List[date]:
+        if phase not in self.ranges:
+            raise KeyError(phase)
+
+        if phase not in self._date_lists:
+            start, end = self.ranges[phase]
+            self._date_lists[phase] = [
+                start + timedelta(days=offset)
+                for offset in range((end - start).days + 1)
+            ]
+
+        return self._date_lists[phase]
+
+    def __iter__(self) -> Iterator[TrainingPhase]:
+        return iter(self.ranges)
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def __repr__(self) -> str:
+        ranges = ", ".join(
+            f"{phase.name}: {start.isoformat()} → {end.isoformat()}"
+            for phase, (start, end) in self.ranges.items()
+        )
+        return f"PhaseSchedule({ranges})"
+
+    # Requêtes en temps constant
+
+    @property
+    def first_date(self) -> Optional[date]:
+        """Première date couverte par une phase"""
+        if not self.ranges:
+            return None
+        return min(start for start, _ in self.ranges.values())
+
+    @property
+    def last_date(self) -> Optional[date]:
+        """Dernière date couverte par une phase"""
+        if not self.ranges:
+            return None
+        return max(end for _, end in self.ranges.values())
+
+    @property
+    def num_weeks(self) -> int:
+        """Nombre de semaines couvertes par le planning"""
+        return len(self._week_phases)
+
+    def week_index(self, target_date: date) -> int:
+        """
+        Calcule l'indice de semaine (0-indexed) d'une date
+
+        Args:
+            target_date: Date à convertir
+
+        Returns:
+            Indice de la semaine par rapport à start_date
+        """
+        return (target_date - self.start_date).days // 7
+
+    def phase_for_date(self, target_date: date) -> Optional[TrainingPhase]:
+        """
+        Détermine la phase d'une date
+
+        Args:
+            target_date: Date à vérifier
+
+        Returns:
+            Phase contenant la date ou None si la date n'est dans aucune phase
+        """
+        for phase, (start, end) in self.ranges.items():
+            if start <= target_date <= end:
+                return phase
+        return None
+
+    def phase_for_week(self, week_idx: int) -> TrainingPhase:
+        """
+        Détermine la phase prédominante d'une semaine
+
+        Args:
+            week_idx: Indice de la semaine (0-indexed)
+
+        Returns:
+            Phase ayant le plus de jours dans la semaine
+        """
+        if 0 <= week_idx < len(self._week_phases):
+            return self._week_phases[week_idx]
+        return self._compute_week_phase(self.start_date + timedelta(days=week_idx * 7))
+
+    def predominant_phase(self, week_start: date) -> TrainingPhase:
+        """
+        Détermine la phase prédominante de la semaine commençant à week_start
+
+        Args:
+            week_start: Date de début de la semaine
+
+        Returns:
+            Phase ayant le plus de jours dans la semaine
+        """
+        week_idx, remainder = divmod((week_start - self.start_date).days, 7)
+        if remainder == 0:
+            return self.phase_for_week(week_idx)
+        return self._compute_week_phase(week_start)
+
+    def weeks(self, phase: TrainingPhase) -> range:
+        """
+        Retourne la plage des indices de semaine couverts par une phase
+
+        Args:
+            phase: Phase d'entraînement
+
+        Returns:
+            Plage d'indices de semaine (vide si la phase est absente)
+        """
+        if phase not in self.ranges:
+            return range(0)
+        start, end = self.ranges[phase]
+        return range(self.week_index(start), self.week_index(end) + 1)
+
+    def boundaries(self) -> Dict[TrainingPhase, Tuple[date, date]]:
+        """Retourne les dates (début, fin) de chaque phase"""
+        return dict(self.ranges)
+
+    def _compute_week_phase(self, week_start: date) -> TrainingPhase:
+        """
+        Calcule la phase prédominante d'une semaine par intersection des plages
+
+        Args:
+            week_start: Date de début de la semaine
+
+        Returns:
+            Phase avec le plus de jours dans la semaine (développement par défaut)
+        """
+        week_end = week_start + timedelta(days=6)
+
+        # Compter le nombre de jours de chaque phase, dans l'ordre des phases
+        phase_counts = {phase: 0 for phase in TrainingPhase}
+        for phase, (start, end) in self.ranges.items():
+            overlap = (min(end, week_end) - max(start, week_start)).days + 1
+            if overlap > 0:
+                phase_counts[phase] += overlap
+
+        return max(phase_counts.items(), key=lambda x: x[1])[0]
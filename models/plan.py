@@ -1,11 +1,177 @@
 from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Mapping, Optional, Tuple
+import hashlib
 import json
+import re
+import zlib
+from bisect import insort
 from collections import defaultdict
 
+import numpy as np
+
 from .user_data import UserData
 from .session import Session, TrainingPhase, SessionType
+from .phase_schedule import PhaseSchedule
+from .plan_binary import decode_plan, encode_plan
+from .plan_frame import (PlanFrame, SESSION_TYPES, TRAINING_PHASES, PHASE_CODES,
+                         build_blocks_frame, build_sessions_frame)
+
+# Versions du format de données des plans acceptées en chargement de confiance
+SUPPORTED_PLAN_VERSIONS = ("1.0.0",)
+
+# Somme de contrôle placée en dernière clé par TrainingPlan.to_json(checksum=True)
+CHECKSUM_SUFFIX = re.compile(r',"checksum":"([0-9a-f]{8})"\}\s*$')
+
+
+def plan_checksum(data: Dict[str, Any]) -> str:
+    """
+    Calcule la somme de contrôle d'un plan sérialisé en dictionnaire
+
+    La somme porte sur la forme JSON compacte du dictionnaire, dans l'ordre
+    de ses clés, hors clé "checksum": c'est exactement le texte écrit par
+    to_json(checksum=True), qui peut ainsi être vérifié sans réencodage.
+
+    Args:
+        data: Dictionnaire représentant le plan (format de TrainingPlan.to_dict)
+
+    Returns:
+        CRC32 (hexadécimal) de la forme JSON compacte du dictionnaire
+    """
+    content = {key: value for key, value in data.items() if key != "checksum"}
+    return _text_checksum(json.dumps(content, separators=(",", ":")))
+
+
+def _text_checksum(text: str) -> str:
+    """CRC32 (hexadécimal) d'un texte JSON"""
+    return format(zlib.crc32(text.encode("utf-8")), "08x")
+
+
+def has_plan_checksum(json_str: str) -> bool:
+    """
+    Indique si un plan JSON a été écrit avec sa somme de contrôle (to_json(checksum=True))
+
+    Args:
+        json_str: Chaîne JSON représentant le plan
+
+    Returns:
+        True si le plan peut être chargé en mode de confiance
+    """
+    return CHECKSUM_SUFFIX.search(json_str, max(0, len(json_str) - 64)) is not None
+
+
+class SessionStore(dict):
+    """
+    Dictionnaire des séances indexées par date qui compte ses modifications
+
+    Le compteur version permet à TrainingPlan de savoir si ses index
+    secondaires sont encore à jour après une modification directe du dictionnaire.
+    """
+
+    version = 0
+
+    def __setitem__(self, key: date, value: Session) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: date) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self.version += 1
+        return self
+
+    def setdefault(self, key: date, default: Optional[Session] = None) -> Session:
+        self.version += 1
+        return super().setdefault(key, default)
+
+
+def sessions_revision(sessions: Iterable[Session]) -> int:
+    """
+    Somme des révisions de séances: elle change dès que l'une d'elles est modifiée
+
+    Args:
+        sessions: Séances
+
+    Returns:
+        Révision de l'ensemble
+    """
+    return sum(session.revision for session in sessions)
+
+
+class _SessionIndex:
+    """
+    Index secondaires des séances d'un plan (par semaine, type et phase),
+    avec les agrégats hebdomadaires et vues en colonnes calculés à la demande
+
+    Les agrégats et vues sont conservés avec la révision des séances dont ils
+    sont issus (voir sessions_revision), et recalculés lorsqu'une séance a été
+    modifiée depuis.
+    """
+
+    def __init__(self, start_date: date, sessions: SessionStore):
+        self.start_date = start_date
+        self.source = sessions
+        self.version = sessions.version
+        self.by_week: Dict[int, List[Session]] = defaultdict(list)
+        self.by_type: Dict[SessionType, List[Session]] = defaultdict(list)
+        self.by_phase: Dict[TrainingPhase, List[Session]] = defaultdict(list)
+        self.week_stats: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        self.frame: Optional[Tuple[int, PlanFrame]] = None
+        self.blocks_frame: Optional[Tuple[int, PlanFrame]] = None
+
+        for session_date, session in sorted(sessions.items(), key=lambda item: item[0]):
+            session.mark_indexed()
+            self.by_week[self.week_of(session_date)].append(session)
+            self.by_type[session.session_type].append(session)
+            self.by_phase[session.phase].append(session)
+
+    def week_of(self, session_date: date) -> int:
+        """Numéro de semaine (0-indexed) d'une date"""
+        return (session_date - self.start_date).days // 7
+
+    def add(self, session_date: date, session: Session) -> None:
+        """Ajoute une séance aux index et invalide les agrégats de sa semaine"""
+        session.mark_indexed()
+        week_num = self.week_of(session_date)
+        insort(self.by_week[week_num], session, key=lambda s: s.session_date)
+        self.by_type[session.session_type].append(session)
+        self.by_phase[session.phase].append(session)
+        self.week_stats.pop(week_num, None)
+        self.frame = self.blocks_frame = None
+
+    def remove(self, session_date: date, session: Session) -> None:
+        """Retire une séance des index et invalide les agrégats de sa semaine"""
+        week_num = self.week_of(session_date)
+        for group in (self.by_week[week_num], self.by_type[session.session_type], self.by_phase[session.phase]):
+            for i, indexed in enumerate(group):
+                if indexed is session:
+                    del group[i]
+                    break
+        self.week_stats.pop(week_num, None)
+        self.frame = self.blocks_frame = None
+
+    def sorted_sessions(self) -> List[Session]:
+        """Séances triées par date"""
+        return [session for week_num in sorted(self.by_week) for session in self.by_week[week_num]]
 
 
 @dataclass
@@ -13,22 +179,79 @@ class TrainingPlan:
     """
     Représente un plan d'entraînement complet.
 
+    Les séances sont indexées par semaine, type et phase; les index et les
+    agrégats hebdomadaires sont maintenus par add_session et reconstruits à la
+    demande après une modification directe de sessions ou le remplacement des
+    blocs d'une séance.
+
     Attributes:
         user_data: Données utilisateur ayant servi à générer le plan
         sessions: Dictionnaire des séances indexées par date
-        phase_dates: Dictionnaire des plages de dates pour chaque phase
+        phase_dates: Planning des phases (PhaseSchedule), consultable comme un
+                     dictionnaire {phase: [dates]} dont les listes sont construites à la demande
         weekly_volumes: Dictionnaire des volumes par semaine
         version: Version du format de données du plan
     """
     user_data: UserData
     sessions: Dict[date, Session] = field(default_factory=dict)
-    phase_dates: Dict[TrainingPhase, List[date]] = field(default_factory=dict)
+    phase_dates: Mapping[TrainingPhase, List[date]] = field(default_factory=dict)
     weekly_volumes: Dict[int, float] = field(default_factory=dict)
     version: str = "1.0.0"
+    _index: Optional[_SessionIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Convertit les listes de dates par phase en planning de phases"""
+        self.phase_dates = PhaseSchedule.from_date_lists(self.phase_dates, self.user_data.start_date)
+        self.sessions = SessionStore(self.sessions)
+
+    @property
+    def phase_schedule(self) -> PhaseSchedule:
+        """Planning des phases sous forme de plages (recherche en temps constant)"""
+        return self.phase_dates
+
+    def _get_index(self) -> _SessionIndex:
+        """
+        Retourne les index des séances, reconstruits si sessions a été modifié directement
+
+        Returns:
+            Index des séances à jour
+        """
+        if not isinstance(self.sessions, SessionStore):
+            self.sessions = SessionStore(self.sessions)
+
+        index = self._index
+        if index is None or index.source is not self.sessions or index.version != self.sessions.version:
+            index = _SessionIndex(self.user_data.start_date, self.sessions)
+            self._index = index
+
+        return index
 
     def add_session(self, session: Session) -> None:
-        """Ajoute une séance au plan"""
-        self.sessions[session.session_date] = session
+        """Ajoute une séance au plan (en remplaçant la séance existante à cette date)"""
+        index = self._get_index()
+        session_date = session.session_date
+
+        previous = self.sessions.get(session_date)
+        if previous is not None:
+            index.remove(session_date, previous)
+
+        self.sessions[session_date] = session
+        index.add(session_date, session)
+        index.version = self.sessions.version
+
+    def recompute_aggregates(self) -> None:
+        """
+        Recalcule en une passe la distance, la durée et la difficulté de toutes
+        les séances, puis les agrégats hebdomadaires et vues en colonnes
+
+        À appeler après la construction ou le chargement d'un plan; les
+        lectures suivantes ne coûtent plus qu'un accès d'attribut.
+        """
+        for session in self.sessions.values():
+            session.refresh_aggregates()
+
+        self._index = None
+        self._get_index()
 
     def get_session(self, session_date: date) -> Optional[Session]:
         """Récupère une séance par sa date"""
@@ -39,16 +262,26 @@ class TrainingPlan:
         Regroupe les séances par semaine
 
         Returns:
-            Dictionnaire avec la semaine (0-indexed) comme clé et une liste de séances comme valeur
+            Dictionnaire avec la semaine (0-indexed) comme clé et la liste des séances
+            triées par date comme valeur
         """
-        sessions_by_week = defaultdict(list)
+        return {
+            week_num: list(sessions)
+            for week_num, sessions in sorted(self._get_index().by_week.items())
+            if sessions
+        }
 
-        for session_date, session in self.sessions.items():
-            # Calculer le numéro de semaine (0-indexed)
-            week_num = (session_date - self.user_data.start_date).days // 7
-            sessions_by_week[week_num].append(session)
+    def get_week_sessions(self, week_num: int) -> List[Session]:
+        """
+        Récupère les séances d'une semaine
+
+        Args:
+            week_num: Numéro de la semaine (0-indexed)
 
-        return dict(sessions_by_week)
+        Returns:
+            Liste des séances de la semaine triées par date
+        """
+        return list(self._get_index().by_week.get(week_num, []))
 
     def get_sessions_by_type(self) -> Dict[SessionType, List[Session]]:
         """
@@ -57,12 +290,11 @@ class TrainingPlan:
         Returns:
             Dictionnaire avec le type de séance comme clé et une liste de séances comme valeur
         """
-        sessions_by_type = defaultdict(list)
-
-        for session in self.sessions.values():
-            sessions_by_type[session.session_type].append(session)
-
-        return dict(sessions_by_type)
+        return {
+            session_type: list(sessions)
+            for session_type, sessions in self._get_index().by_type.items()
+            if sessions
+        }
 
     def get_sessions_by_phase(self) -> Dict[TrainingPhase, List[Session]]:
         """
@@ -71,12 +303,82 @@ class TrainingPlan:
         Returns:
             Dictionnaire avec la phase comme clé et une liste de séances comme valeur
         """
-        sessions_by_phase = defaultdict(list)
+        return {
+            phase: list(sessions)
+            for phase, sessions in self._get_index().by_phase.items()
+            if sessions
+        }
 
-        for session in self.sessions.values():
-            sessions_by_phase[session.phase].append(session)
+    def get_week_stats(self, week_num: int) -> Dict[str, Any]:
+        """
+        Calcule (une seule fois) les agrégats d'une semaine
+
+        Args:
+            week_num: Numéro de la semaine (0-indexed)
+
+        Returns:
+            Dictionnaire avec la distance (km), la durée (secondes), la somme des
+            scores de difficulté et l'intensité moyenne pondérée par la distance
+        """
+        index = self._get_index()
+        week_sessions = index.by_week.get(week_num, [])
+        revision = sessions_revision(week_sessions)
+        cached = index.week_stats.get(week_num)
+
+        if cached is None or cached[0] != revision:
+            cached = (revision, self._compute_week_stats(week_sessions))
+            index.week_stats[week_num] = cached
+
+        return cached[1]
+
+    @staticmethod
+    def _compute_week_stats(week_sessions: List[Session]) -> Dict[str, Any]:
+        """Calcule les agrégats d'une semaine à partir de ses séances (voir get_week_stats)"""
+        distance = sum(session.total_distance for session in week_sessions)
+        intensity = 0.0
+        if distance > 0:
+            intensity = sum(session.get_difficulty_score() * (session.total_distance / distance)
+                            for session in week_sessions if session.total_distance > 0)
+
+        return {
+            "distance": distance,
+            "duration_seconds": sum(session.total_duration.total_seconds() for session in week_sessions),
+            "difficulty": sum(session.get_difficulty_score() for session in week_sessions),
+            "intensity": intensity
+        }
+
+    def frame(self) -> PlanFrame:
+        """
+        Vue en colonnes des séances, triées par date (construite une fois par état du plan)
+
+        Colonnes: date (ordinal), week, type (code), phase (code), distance (km),
+        duration (secondes), difficulty, is_intermediate_race. Les codes de type
+        et de phase sont les positions dans SessionType et TrainingPhase.
+
+        Returns:
+            Vue des séances
+        """
+        index = self._get_index()
+        revision = sessions_revision(index.source.values())
+        if index.frame is None or index.frame[0] != revision:
+            index.frame = (revision, build_sessions_frame(index.sorted_sessions(), self.user_data.start_date))
+        return index.frame[1]
+
+    def blocks_frame(self) -> PlanFrame:
+        """
+        Vue en colonnes des blocs de toutes les séances
 
-        return dict(sessions_by_phase)
+        Colonnes: session (ligne dans frame()), date (ordinal), week, type (code),
+        phase (code), distance (km), pace (secondes/km), duration (secondes).
+
+        Returns:
+            Vue des blocs
+        """
+        index = self._get_index()
+        revision = sessions_revision(index.source.values())
+        if index.blocks_frame is None or index.blocks_frame[0] != revision:
+            index.blocks_frame = (revision, build_blocks_frame(index.sorted_sessions(), self.user_data.start_date))
+        return index.blocks_frame[1]
 
     def get_weekly_volume(self, week_num: int) -> float:
         """
@@ -91,15 +393,8 @@ class TrainingPlan:
         if week_num in self.weekly_volumes:
             return self.weekly_volumes[week_num]
 
-        total = 0.0
-        sessions_by_week = self.get_sessions_by_week()
-
-        if week_num in sessions_by_week:
-            for session in sessions_by_week[week_num]:
-                total += session.total_distance
-
         # Arrondir au dixième
-        return round(total, 1)
+        return round(self.get_week_stats(week_num)["distance"], 1)
 
     def get_weekly_duration(self, week_num: int) -> timedelta:
         """
@@ -111,14 +406,7 @@ class TrainingPlan:
         Returns:
             Durée totale en timedelta
         """
-        total_seconds = 0
-        sessions_by_week = self.get_sessions_by_week()
-
-        if week_num in sessions_by_week:
-            for session in sessions_by_week[week_num]:
-                total_seconds += session.total_duration.total_seconds()
-
-        return timedelta(seconds=total_seconds)
+        return timedelta(seconds=self.get_week_stats(week_num)["duration_seconds"])
 
     def get_total_volume(self) -> float:
         """
@@ -127,7 +415,7 @@ class TrainingPlan:
         Returns:
             Volume total en km, arrondi au dixième
         """
-        total = sum(session.total_distance for session in self.sessions.values())
+        total = float(self.frame()["distance"].sum())
         return round(total, 1)
 
     def get_total_duration(self) -> timedelta:
@@ -137,7 +425,7 @@ class TrainingPlan:
         Returns:
             Durée totale en timedelta
         """
-        total_seconds = sum(session.total_duration.total_seconds() for session in self.sessions.values())
+        total_seconds = float(self.frame()["duration"].sum())
         return timedelta(seconds=total_seconds)
 
     def get_phase_for_date(self, date_to_check: date) -> Optional[TrainingPhase]:
@@ -150,10 +438,7 @@ class TrainingPlan:
         Returns:
             Phase d'entraînement ou None si la date n'est pas dans le plan
         """
-        for phase, dates in self.phase_dates.items():
-            if date_to_check in dates:
-                return phase
-        return None
+        return self.phase_schedule.phase_for_date(date_to_check)
 
     def get_week_number(self, date_to_check: date) -> Optional[int]:
         """
@@ -193,53 +478,67 @@ class TrainingPlan:
         """
         stats = {}
 
-        for phase in TrainingPhase:
-            phase_sessions = [s for s in self.sessions.values() if s.phase == phase]
+        frame = self.frame()
+        if not len(frame):
+            return stats
+
+        # Agrégats par phase calculés en une passe sur les colonnes
+        phase_count = len(TRAINING_PHASES)
+        counts = frame.group_count("phase", phase_count)
+        volumes = frame.group_sum("phase", "distance", phase_count)
+        durations = frame.group_sum("phase", "duration", phase_count)
+        type_counts = np.zeros((phase_count, len(SESSION_TYPES)), dtype=np.int64)
+        np.add.at(type_counts, (frame["phase"], frame["type"]), 1)
 
-            if not phase_sessions:
+        for phase in TrainingPhase:
+            code = PHASE_CODES[phase]
+            if not counts[code]:
                 continue
 
             # Dates de début et fin de la phase
-            phase_dates = sorted([s.session_date for s in phase_sessions])
-            start_date = min(phase_dates)
-            end_date = max(phase_dates)
+            phase_dates = frame["date"][frame["phase"] == code]
+            start_date = date.fromordinal(int(phase_dates.min()))
+            end_date = date.fromordinal(int(phase_dates.max()))
 
-            # Calcul des statistiques
-            total_volume = sum(s.total_distance for s in phase_sessions)
-            total_seconds = sum(s.total_duration.total_seconds() for s in phase_sessions)
+            total_volume = float(volumes[code])
 
             # Nombre de semaines
             num_weeks = (end_date - start_date).days // 7 + 1
 
             # Répartition des types de séances
-            session_types = {}
-            for type_enum in SessionType:
-                count = len([s for s in phase_sessions if s.session_type == type_enum])
-                if count > 0:
-                    session_types[type_enum.value] = count
+            session_types = {
+                session_type.value: int(type_counts[code, type_code])
+                for type_code, session_type in enumerate(SESSION_TYPES)
+                if type_counts[code, type_code] > 0
+            }
 
             stats[phase] = {
                 "start_date": start_date,
                 "end_date": end_date,
                 "num_weeks": num_weeks,
                 "total_volume": round(total_volume, 1),
-                "total_duration": timedelta(seconds=total_seconds),
+                "total_duration": timedelta(seconds=float(durations[code])),
                 "avg_weekly_volume": round(total_volume / num_weeks, 1),
                 "session_types": session_types
             }
 
         return stats
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, checksum: bool = False, aggregates: bool = False) -> Dict[str, Any]:
         """
         Convertit le plan en dictionnaire pour sérialisation JSON
 
+        Args:
+            checksum: Si True, ajoute les agrégats des séances et la somme de
+                      contrôle (clé "checksum") nécessaires au chargement de confiance
+            aggregates: Si True, ajoute les agrégats des séances (sans somme de contrôle)
+
         Returns:
             Dictionnaire représentant le plan
         """
-        # Conversion des sessions
+        # Conversion des sessions (avec leurs agrégats si le plan est destiné au stockage)
         sessions_dict = {
-            session_date.isoformat(): session.to_dict()
+            session_date.isoformat(): session.to_dict(aggregates=checksum or aggregates)
             for session_date, session in self.sessions.items()
         }
 
@@ -249,7 +548,7 @@ class TrainingPlan:
             for phase, dates in self.phase_dates.items()
         }
 
-        return {
+        data = {
             "version": self.version,
             "user_data": self.user_data.to_dict(),
             "sessions": sessions_dict,
@@ -257,65 +556,209 @@ class TrainingPlan:
             "weekly_volumes": {str(week): volume for week, volume in self.weekly_volumes.items()}
         }
 
-    def to_json(self) -> str:
+        if checksum:
+            data["checksum"] = plan_checksum(data)
+
+        return data
+
+    def to_json(self, checksum: bool = False) -> str:
         """
         Serialise le plan au format JSON
 
+        Args:
+            checksum: Si True, écrit le plan en JSON compact avec ses agrégats et
+                      sa somme de contrôle en dernière clé (format du stockage local)
+
         Returns:
             Chaîne JSON
         """
+        if checksum:
+            return json.dumps(self.to_dict(checksum=True), separators=(",", ":"))
+
         return json.dumps(self.to_dict(), indent=2)
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'TrainingPlan':
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'TrainingPlan':
         """
         Crée un objet TrainingPlan à partir d'un dictionnaire
 
+        En chargement de confiance, les données utilisateur et les courses ne
+        sont pas revalidées et les agrégats des séances sont repris tels quels;
+        seules la version du format et la somme de contrôle sont vérifiées.
+
         Args:
             data: Dictionnaire représentant le plan
+            trusted: Si True, le plan provient du stockage local et a été
+                     validé à sa création (to_dict(checksum=True))
 
         Returns:
             Objet TrainingPlan
+
+        Raises:
+            ValueError: En chargement de confiance, si la version n'est pas prise
+                        en charge ou si la somme de contrôle est absente ou invalide
         """
+        if trusted:
+            cls._check_trusted(data, plan_checksum(data) if "checksum" in data else None)
+
+        return cls._from_dict(data, trusted)
+
+    @staticmethod
+    def _check_trusted(data: Dict[str, Any], checksum: Optional[str]) -> None:
+        """
+        Vérifie la version et la somme de contrôle d'un plan chargé en mode de confiance
+
+        Args:
+            data: Dictionnaire représentant le plan
+            checksum: Somme de contrôle recalculée (None si le plan n'en a pas)
+        """
+        version = data.get("version", "1.0.0")
+        if version not in SUPPORTED_PLAN_VERSIONS:
+            raise ValueError(f"Version du format de plan non prise en charge: {version}")
+        if checksum is None or "checksum" not in data:
+            raise ValueError("Somme de contrôle absente: chargement de confiance impossible")
+        if checksum != data["checksum"]:
+            raise ValueError("Données de plan corrompues (somme de contrôle invalide)")
+
+    @classmethod
+    def from_verified_dict(cls, data: Dict[str, Any]) -> 'TrainingPlan':
+        """
+        Crée un plan en chargement de confiance à partir d'un dictionnaire dont
+        l'intégrité a déjà été vérifiée par l'appelant (ex: stockage adressé par
+        contenu, où chaque partie est vérifiée par son empreinte)
+
+        Args:
+            data: Dictionnaire représentant le plan, avec les agrégats des séances
+
+        Returns:
+            Objet TrainingPlan
+
+        Raises:
+            ValueError: Si la version du format n'est pas prise en charge
+        """
+        version = data.get("version", "1.0.0")
+        if version not in SUPPORTED_PLAN_VERSIONS:
+            raise ValueError(f"Version du format de plan non prise en charge: {version}")
+
+        return cls._from_dict(data, trusted=True)
+
+    @classmethod
+    def _from_dict(cls, data: Dict[str, Any], trusted: bool) -> 'TrainingPlan':
+        """Construit le plan à partir d'un dictionnaire déjà vérifié"""
         # Conversion des données utilisateur
-        user_data = UserData.from_dict(data["user_data"])
+        user_data = UserData.from_dict(data["user_data"], trusted=trusted)
+
+        # Conversion des phases (seules les bornes de chaque plage sont nécessaires)
+        phase_ranges = {}
+        for phase_str, dates_str in data.get("phase_dates", {}).items():
+            if dates_str:
+                phase = TrainingPhase(phase_str)
+                phase_ranges[phase] = (date.fromisoformat(min(dates_str)), date.fromisoformat(max(dates_str)))
 
         # Création du plan
         plan = cls(
             user_data=user_data,
+            phase_dates=PhaseSchedule(user_data.start_date, phase_ranges),
             version=data.get("version", "1.0.0")
         )
 
         # Conversion des sessions
         for session_date_str, session_data in data.get("sessions", {}).items():
             session_date = date.fromisoformat(session_date_str)
-            session = Session.from_dict(session_data)
+            session = Session.from_dict(session_data, trusted=trusted)
             plan.sessions[session_date] = session
 
-        # Conversion des phases
-        for phase_str, dates_str in data.get("phase_dates", {}).items():
-            phase = TrainingPhase(phase_str)
-            plan.phase_dates[phase] = [date.fromisoformat(d) for d in dates_str]
-
         # Conversion des volumes hebdomadaires
         for week_str, volume in data.get("weekly_volumes", {}).items():
             plan.weekly_volumes[int(week_str)] = float(volume)
 
+        # En chargement de confiance, les agrégats des séances ont été repris tels quels
+        if not trusted:
+            plan.recompute_aggregates()
+
+        return plan
+
+    def to_bytes(self) -> bytes:
+        """
+        Sérialise le plan au format binaire compact (voir models.plan_binary)
+
+        Le format JSON reste celui des échanges; le format binaire est destiné
+        au stockage local.
+
+        Returns:
+            Plan sérialisé
+        """
+        return encode_plan(self)
+
+    def fingerprint(self) -> str:
+        """
+        Calcule une empreinte du contenu du plan
+
+        Returns:
+            Empreinte SHA-256 (hexadécimale) de la sérialisation binaire
+        """
+        return hashlib.sha256(self.to_bytes()).hexdigest()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, trusted: bool = False) -> 'TrainingPlan':
+        """
+        Crée un objet TrainingPlan à partir du format binaire
+
+        Args:
+            data: Plan sérialisé par to_bytes
+            trusted: Si True, les données utilisateur ne sont pas revalidées et
+                     les agrégats des séances sont repris sans être recalculés
+                     (l'en-tête, la version et la somme de contrôle sont
+                     toujours vérifiés)
+
+        Returns:
+            Plan d'entraînement
+
+        Raises:
+            ValueError: Si les données ne sont pas un plan binaire valide
+        """
+        user_data, sessions, phase_schedule, weekly_volumes, version = decode_plan(data, trusted=trusted)
+
+        plan = cls(
+            user_data=user_data,
+            sessions=sessions,
+            phase_dates=phase_schedule,
+            weekly_volumes=weekly_volumes,
+            version=version
+        )
+
+        # Hors chargement de confiance, les agrégats enregistrés sont ignorés
+        if not trusted:
+            plan.recompute_aggregates()
+
         return plan
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'TrainingPlan':
+    def from_json(cls, json_str: str, trusted: bool = False) -> 'TrainingPlan':
         """
         Crée un objet TrainingPlan à partir d'une chaîne JSON
 
         Args:
             json_str: Chaîne JSON représentant le plan
+            trusted: Chargement de confiance (voir from_dict); la somme de
+                     contrôle d'un texte écrit par to_json(checksum=True) est
+                     vérifiée directement sur le texte
 
         Returns:
             Objet TrainingPlan
         """
         data = json.loads(json_str)
-        return cls.from_dict(data)
+        if not trusted:
+            return cls.from_dict(data)
+
+        match = CHECKSUM_SUFFIX.search(json_str, max(0, len(json_str) - 64))
+        if match is not None:
+            checksum = _text_checksum(json_str[:match.start()] + "}")
+        else:
+            checksum = plan_checksum(data) if "checksum" in data else None
+
+        cls._check_trusted(data, checksum)
+        return cls._from_dict(data, trusted=True)
 
     def adjust_to_current_date(self, current_date: date) -> 'TrainingPlan':
         """
@@ -0,0 +1,358 @@
+import json
+import struct
+import zlib
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from .phase_schedule import PhaseSchedule
+from .plan_frame import PHASE_CODES, SESSION_TYPE_CODES, SESSION_TYPES, TRAINING_PHASES
+from .session import BlockRepeat, Session, SessionBlock
+from .user_data import UserData
+
+# Format binaire des plans (petit-boutiste):
+#   en-tête     MAGIC, version du format (u16), réservé (u16)
+#   version     version du plan (u16 + UTF-8)
+#   user_data   données utilisateur en JSON compact (u32 + UTF-8)
+#   phases      date de référence (i32), nombre (u8), puis (phase u8, début i32, fin i32)
+#   volumes     nombre (u32), puis (semaine i32, volume f64)
+#   textes      nombre (u32), puis (u32 + UTF-8): descriptions et libellés dédupliqués
+#   séances     nombre (u32), puis enregistrements SESSION_RECORD
+#   blocs       nombre (u32), puis enregistrements BLOCK_RECORD
+#   CRC32 (u32) de tout ce qui précède
+# Les dates sont des ordinaux (date.toordinal) et les allures des microsecondes.
+
+MAGIC = b"AIRP"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHH")
+U8 = struct.Struct("<B")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+I32 = struct.Struct("<i")
+PHASE_RECORD = struct.Struct("<Bii")
+VOLUME_RECORD = struct.Struct("<id")
+# date, type, phase, course intermédiaire, description, nombre d'enregistrements de blocs,
+# distance totale, durée totale (secondes), score de difficulté
+SESSION_RECORD = struct.Struct("<iBBBIIddd")
+# genre (bloc/répétition), libellé, répétitions, taille du motif, distance, allure, texte
+BLOCK_RECORD = struct.Struct("<BBHHdqI")
+
+BLOCK = 0
+REPEAT = 1
+
+PlanParts = Tuple[UserData, Dict[date, Session], PhaseSchedule, Dict[int, float], str]
+
+
+def is_binary_plan(data: Union[bytes, bytearray, memoryview]) -> bool:
+    """
+    Indique si des données commencent par l'en-tête du format binaire
+
+    Args:
+        data: Données (ou leurs premiers octets)
+
+    Returns:
+        True si les données sont un plan au format binaire
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+class _Writer:
+    """Tampon d'écriture avec table de textes dédupliqués"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.texts: Dict[str, int] = {}
+
+    def pack(self, record: struct.Struct, *values: Any) -> None:
+        self.parts.append(record.pack(*values))
+
+    def string(self, value: str, length: struct.Struct = U16) -> None:
+        encoded = value.encode("utf-8")
+        self.parts.append(length.pack(len(encoded)))
+        self.parts.append(encoded)
+
+    def text_index(self, value: str) -> int:
+        return self.texts.setdefault(value, len(self.texts))
+
+
+def _pack_block(writer: _Writer, records: List[bytes], block: SessionBlock) -> None:
+    """Ajoute l'enregistrement d'un bloc"""
+    label = block.label
+    records.append(BLOCK_RECORD.pack(
+        BLOCK, label is not None, 0, 0,
+        block.distance, block.pace // timedelta(microseconds=1),
+        writer.text_index(block.description if label is None else label)
+    ))
+
+
+def encode_plan(plan) -> bytes:
+    """
+    Sérialise un plan au format binaire
+
+    Args:
+        plan: Plan d'entraînement (TrainingPlan)
+
+    Returns:
+        Plan sérialisé
+    """
+    writer = _Writer()
+    writer.pack(HEADER, MAGIC, FORMAT_VERSION, 0)
+    writer.string(plan.version)
+    writer.string(json.dumps(plan.user_data.to_dict(), separators=(",", ":")), U32)
+
+    schedule = plan.phase_schedule
+    writer.pack(I32, schedule.start_date.toordinal())
+    writer.pack(U8, len(schedule.ranges))
+    for phase, (start, end) in schedule.ranges.items():
+        writer.pack(PHASE_RECORD, PHASE_CODES[phase], start.toordinal(), end.toordinal())
+
+    writer.pack(U32, len(plan.weekly_volumes))
+    for week, volume in plan.weekly_volumes.items():
+        writer.pack(VOLUME_RECORD, week, volume)
+
+    session_records: List[bytes] = []
+    block_records: List[bytes] = []
+    for session in plan.sessions.values():
+        first_block = len(block_records)
+        for block in session.compact_blocks:
+            if isinstance(block, BlockRepeat):
+                block_records.append(BLOCK_RECORD.pack(REPEAT, 0, block.count, len(block.pattern), 0.0, 0, 0))
+                for pattern_block in block.pattern:
+                    _pack_block(writer, block_records, pattern_block)
+            else:
+                _pack_block(writer, block_records, block)
+
+        session_records.append(SESSION_RECORD.pack(
+            session.session_date.toordinal(),
+            SESSION_TYPE_CODES[session.session_type],
+            PHASE_CODES[session.phase],
+            session.is_intermediate_race,
+            writer.text_index(session.description),
+            len(block_records) - first_block,
+            session.total_distance,
+            session.total_duration.total_seconds(),
+            session.get_difficulty_score()
+        ))
+
+    texts = list(writer.texts)
+    writer.pack(U32, len(texts))
+    for text in texts:
+        writer.string(text, U32)
+
+    writer.pack(U32, len(session_records))
+    writer.parts.extend(session_records)
+    writer.pack(U32, len(block_records))
+    writer.parts.extend(block_records)
+
+    payload = b"".join(writer.parts)
+    return payload + U32.pack(zlib.crc32(payload))
+
+
+class _Reader:
+    """Lecture séquentielle d'un tampon binaire"""
+
+    def __init__(self, data: memoryview):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, record: struct.Struct) -> Tuple:
+        values = record.unpack_from(self.data, self.offset)
+        self.offset += record.size
+        return values
+
+    def value(self, record: struct.Struct) -> Any:
+        return self.unpack(record)[0]
+
+    def string(self, length: struct.Struct = U16) -> str:
+        size = self.value(length)
+        value = str(self.data[self.offset:self.offset + size], "utf-8")
+        self.offset += size
+        return value
+
+    def records(self, record: struct.Struct, count: int):
+        end = self.offset + record.size * count
+        values = record.iter_unpack(self.data[self.offset:end])
+        self.offset = end
+        return values
+
+
+def _check(data: Union[bytes, bytearray, memoryview]) -> memoryview:
+    """
+    Vérifie l'en-tête, la version et la somme de contrôle d'un plan binaire
+
+    Returns:
+        Vue sur les données sans la somme de contrôle
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size + U32.size or not is_binary_plan(view):
+        raise ValueError("Données de plan binaire invalides: en-tête absent")
+
+    _, format_version, _ = HEADER.unpack_from(view, 0)
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Version du format de plan binaire non prise en charge: {format_version}")
+
+    payload = view[:-U32.size]
+    checksum, = U32.unpack_from(view, len(view) - U32.size)
+    if zlib.crc32(payload) != checksum:
+        raise ValueError("Données de plan binaire corrompues (somme de contrôle invalide)")
+
+    return payload
+
+
+def read_user_data(data: Union[bytes, bytearray, memoryview]) -> Dict[str, Any]:
+    """
+    Lit uniquement les données utilisateur d'un plan binaire (métadonnées)
+
+    Args:
+        data: Plan sérialisé
+
+    Returns:
+        Dictionnaire des données utilisateur (format de UserData.to_dict)
+    """
+    reader = _Reader(_check(data))
+    reader.offset = HEADER.size
+    reader.string()
+    return json.loads(reader.string(U32))
+
+
+class PlanLayout(NamedTuple):
+    """En-tête décodé d'un plan binaire et position de ses tables d'enregistrements"""
+    version: str
+    user_data: UserData
+    phase_schedule: PhaseSchedule
+    weekly_volumes: Dict[int, float]
+    texts: List[str]
+    sessions_offset: int
+    session_count: int
+    blocks_offset: int
+    block_count: int
+
+
+def read_layout(data: Union[bytes, bytearray, memoryview], trusted: bool = False,
+                verify: bool = True) -> PlanLayout:
+    """
+    Décode l'en-tête d'un plan binaire sans décoder ses séances
+
+    Les tables de séances (SESSION_RECORD) et de blocs (BLOCK_RECORD) sont
+    de taille fixe: elles peuvent être lues directement dans le tampon à
+    partir des positions renvoyées.
+
+    Args:
+        data: Plan sérialisé
+        trusted: Si True, les données utilisateur ne sont pas revalidées
+        verify: Si False, la somme de contrôle n'est pas recalculée (données
+                déjà vérifiées)
+
+    Returns:
+        Disposition du plan
+
+    Raises:
+        ValueError: Si l'en-tête, la version ou la somme de contrôle sont invalides
+    """
+    reader = _Reader(_check(data) if verify else memoryview(data)[:-U32.size])
+    reader.offset = HEADER.size
+
+    version = reader.string()
+    user_data = UserData.from_dict(json.loads(reader.string(U32)), trusted=trusted)
+
+    schedule_start = date.fromordinal(reader.value(I32))
+    ranges = {
+        TRAINING_PHASES[phase]: (date.fromordinal(start), date.fromordinal(end))
+        for phase, start, end in reader.records(PHASE_RECORD, reader.value(U8))
+    }
+    phase_schedule = PhaseSchedule(schedule_start, ranges)
+
+    weekly_volumes = dict(reader.records(VOLUME_RECORD, reader.value(U32)))
+
+    texts = [reader.string(U32) for _ in range(reader.value(U32))]
+
+    session_count = reader.value(U32)
+    sessions_offset = reader.offset
+    reader.offset += SESSION_RECORD.size * session_count
+    block_count = reader.value(U32)
+
+    return PlanLayout(version, user_data, phase_schedule, weekly_volumes, texts,
+                      sessions_offset, session_count, reader.offset, block_count)
+
+
+def decode_sessions(session_records: Iterable[Tuple], block_records: List[Tuple],
+                    texts: List[str], trusted: bool = True) -> Dict[date, Session]:
+    """
+    Construit les séances à partir de leurs enregistrements
+
+    Args:
+        session_records: Enregistrements SESSION_RECORD décodés
+        block_records: Enregistrements BLOCK_RECORD décodés de ces séances, dans l'ordre
+        texts: Table des textes du plan
+        trusted: Si True, les agrégats enregistrés (distance, durée, difficulté)
+                 sont repris; sinon ils sont recalculés à partir des blocs
+
+    Returns:
+        Dictionnaire des séances par date
+    """
+    def make_block(record: Tuple) -> SessionBlock:
+        _, is_label, _, _, distance, pace, text = record
+        if is_label:
+            return SessionBlock(distance, timedelta(microseconds=pace), label=texts[text])
+        return SessionBlock(distance, timedelta(microseconds=pace), texts[text])
+
+    sessions: Dict[date, Session] = {}
+    position = 0
+    for (session_date, session_type, phase, is_race, description, block_count,
+         total_distance, total_seconds, difficulty) in session_records:
+        end = position + block_count
+        blocks: List[Union[SessionBlock, BlockRepeat]] = []
+        while position < end:
+            record = block_records[position]
+            if record[0] == REPEAT:
+                pattern_size = record[3]
+                pattern = [make_block(r) for r in block_records[position + 1:position + 1 + pattern_size]]
+                blocks.append(BlockRepeat(record[2], pattern))
+                position += 1 + pattern_size
+            else:
+                blocks.append(make_block(record))
+                position += 1
+
+        session_date = date.fromordinal(session_date)
+        session = Session(
+            session_date=session_date,
+            session_type=SESSION_TYPES[session_type],
+            phase=TRAINING_PHASES[phase],
+            blocks=blocks,
+            description=texts[description],
+            is_intermediate_race=bool(is_race)
+        )
+        if trusted:
+            session.restore_aggregates(total_distance, timedelta(seconds=total_seconds), difficulty)
+        sessions[session_date] = session
+
+    return sessions
+
+
+def decode_plan(data: Union[bytes, bytearray, memoryview], trusted: bool = False) -> PlanParts:
+    """
+    Désérialise un plan au format binaire
+
+    Args:
+        data: Plan sérialisé
+        trusted: Si True, les données utilisateur ne sont pas revalidées et les
+                 agrégats des séances sont repris tels quels
+
+    Returns:
+        Tuple (user_data, sessions, planning des phases, volumes hebdomadaires, version)
+
+    Raises:
+        ValueError: Si l'en-tête, la version ou la somme de contrôle sont invalides
+    """
+    view = memoryview(data)
+    layout = read_layout(view, trusted=trusted)
+
+    session_records = SESSION_RECORD.iter_unpack(
+        view[layout.sessions_offset:layout.sessions_offset + SESSION_RECORD.size * layout.session_count]
+    )
+    block_records = list(BLOCK_RECORD.iter_unpack(
+        view[layout.blocks_offset:layout.blocks_offset + BLOCK_RECORD.size * layout.block_count]
+    ))
+    sessions = decode_sessions(session_records, block_records, layout.texts, trusted)
+
+    return layout.user_data, sessions, layout.phase_schedule, layout.weekly_volumes, layout.version
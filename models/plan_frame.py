@@ -0,0 +1,199 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .session import Session, SessionType, TrainingPhase
+
+# Codes numériques des énumérations (position dans l'énumération)
+SESSION_TYPES: Tuple[SessionType, ...] = tuple(SessionType)
+TRAINING_PHASES: Tuple[TrainingPhase, ...] = tuple(TrainingPhase)
+SESSION_TYPE_CODES: Dict[SessionType, int] = {session_type: code for code, session_type in enumerate(SESSION_TYPES)}
+PHASE_CODES: Dict[TrainingPhase, int] = {phase: code for code, phase in enumerate(TRAINING_PHASES)}
+
+
+class PlanFrame:
+    """
+    Vue en colonnes (tableaux NumPy de même longueur) des séances ou des blocs d'un plan
+
+    Les colonnes sont en lecture seule: la vue est construite une fois par
+    état du plan et partagée entre les consommateurs.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Initialise la vue
+
+        Args:
+            columns: Dictionnaire {nom de colonne: tableau}
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Les colonnes doivent avoir la même longueur")
+
+        for values in columns.values():
+            values.flags.writeable = False
+
+        self._columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    @property
+    def columns(self) -> List[str]:
+        """Noms des colonnes"""
+        return list(self._columns)
+
+    def select(self, mask: np.ndarray) -> 'PlanFrame':
+        """
+        Filtre les lignes de la vue
+
+        Args:
+            mask: Masque booléen (ou indices) des lignes à conserver
+
+        Returns:
+            Nouvelle vue restreinte aux lignes sélectionnées
+        """
+        return PlanFrame({name: values[mask] for name, values in self._columns.items()})
+
+    def group_sum(self, by: str, column: str, size: Optional[int] = None) -> np.ndarray:
+        """
+        Somme une colonne par valeur d'une colonne de codes entiers
+
+        Args:
+            by: Colonne de regroupement (codes entiers positifs: semaine, type, phase...)
+            column: Colonne à sommer
+            size: Nombre minimal de groupes du résultat
+
+        Returns:
+            Tableau des sommes indexé par code
+        """
+        return np.bincount(self[by], weights=self[column], minlength=size or 0)
+
+    def group_count(self, by: str, size: Optional[int] = None) -> np.ndarray:
+        """
+        Compte les lignes par valeur d'une colonne de codes entiers
+
+        Args:
+            by: Colonne de regroupement
+            size: Nombre minimal de groupes du résultat
+
+        Returns:
+            Tableau des effectifs indexé par code
+        """
+        return np.bincount(self[by], minlength=size or 0)
+
+    def to_pandas(self):
+        """
+        Convertit la vue en DataFrame pandas (sans copie ligne par ligne)
+
+        Les colonnes "type" et "phase" sont converties en catégories portant
+        les valeurs des énumérations.
+
+        Returns:
+            DataFrame pandas
+        """
+        import pandas as pd
+
+        data = {}
+        for name, values in self._columns.items():
+            if name == "type":
+                data[name] = pd.Categorical.from_codes(values, [t.value for t in SESSION_TYPES])
+            elif name == "phase":
+                data[name] = pd.Categorical.from_codes(values, [p.value for p in TRAINING_PHASES])
+            else:
+                data[name] = values
+
+        return pd.DataFrame(data)
+
+
+def build_sessions_frame(sessions: Iterable[Session], start_date: date) -> PlanFrame:
+    """
+    Construit la vue en colonnes des séances (une ligne par séance)
+
+    Colonnes: date (ordinal), week, type (code), phase (code), distance (km),
+    duration (secondes), difficulty, is_intermediate_race.
+
+    Args:
+        sessions: Séances, dans l'ordre souhaité des lignes
+        start_date: Date de début du plan (pour le numéro de semaine)
+
+    Returns:
+        Vue des séances
+    """
+    rows = [
+        (
+            session.session_date.toordinal(),
+            SESSION_TYPE_CODES[session.session_type],
+            PHASE_CODES[session.phase],
+            session.total_distance,
+            session.total_duration.total_seconds(),
+            session.get_difficulty_score(),
+            session.is_intermediate_race
+        )
+        for session in sessions
+    ]
+    dates, types, phases, distances, durations, difficulties, races = zip(*rows) if rows else ((),) * 7
+
+    dates = np.array(dates, dtype=np.int64)
+    return PlanFrame({
+        "date": dates,
+        "week": (dates - start_date.toordinal()) // 7,
+        "type": np.array(types, dtype=np.int8),
+        "phase": np.array(phases, dtype=np.int8),
+        "distance": np.array(distances, dtype=float),
+        "duration": np.array(durations, dtype=float),
+        "difficulty": np.array(difficulties, dtype=float),
+        "is_intermediate_race": np.array(races, dtype=bool)
+    })
+
+
+def build_blocks_frame(sessions: Iterable[Session], start_date: date) -> PlanFrame:
+    """
+    Construit la vue en colonnes des blocs (une ligne par bloc)
+
+    Colonnes: session (ligne de la séance dans la vue des séances), date
+    (ordinal), week, type (code), phase (code), distance (km), pace
+    (secondes/km), duration (secondes).
+
+    Args:
+        sessions: Séances, dans le même ordre que pour build_sessions_frame
+        start_date: Date de début du plan
+
+    Returns:
+        Vue des blocs
+    """
+    rows = [
+        (
+            row,
+            session.session_date.toordinal(),
+            SESSION_TYPE_CODES[session.session_type],
+            PHASE_CODES[session.phase],
+            block.distance,
+            block.pace_seconds
+        )
+        for row, session in enumerate(sessions)
+        for block in session.iter_blocks()
+    ]
+    rows_idx, dates, types, phases, distances, paces = zip(*rows) if rows else ((),) * 6
+
+    dates = np.array(dates, dtype=np.int64)
+    distances = np.array(distances, dtype=float)
+    paces = np.array(paces, dtype=float)
+    return PlanFrame({
+        "session": np.array(rows_idx, dtype=np.int64),
+        "date": dates,
+        "week": (dates - start_date.toordinal()) // 7,
+        "type": np.array(types, dtype=np.int8),
+        "phase": np.array(phases, dtype=np.int8),
+        "distance": distances,
+        "pace": paces,
+        "duration": paces * distances
+    })
@@ -0,0 +1,383 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .user_data import UserData
+from .session import Session
+from .phase_schedule import PhaseSchedule
+from .plan import TrainingPlan
+
+# Une révision sur KEYFRAME_INTERVAL (en profondeur) conserve l'état complet du plan
+KEYFRAME_INTERVAL = 16
+
+
+@dataclass
+class PlanDiff:
+    """
+    Différences entre deux états d'un plan d'entraînement
+
+    Attributes:
+        added: Séances présentes uniquement dans le second plan, par date
+        removed: Séances présentes uniquement dans le premier plan, par date
+        changed: Séances modifiées, par date: (séance du premier plan, séance du second)
+        weekly_volumes: Volumes hebdomadaires modifiés, par semaine: (avant, après)
+        user_data_changed: Indique si les données utilisateur diffèrent
+        phases_changed: Indique si le planning des phases diffère
+    """
+    added: Dict[date, Session] = field(default_factory=dict)
+    removed: Dict[date, Session] = field(default_factory=dict)
+    changed: Dict[date, Tuple[Session, Session]] = field(default_factory=dict)
+    weekly_volumes: Dict[int, Tuple[Optional[float], Optional[float]]] = field(default_factory=dict)
+    user_data_changed: bool = False
+    phases_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        """Indique si les deux plans sont identiques"""
+        return not (self.added or self.removed or self.changed or self.weekly_volumes
+                    or self.user_data_changed or self.phases_changed)
+
+    def _before_after(self) -> Tuple[List[Session], List[Session]]:
+        """Séances concernées par la différence, avant et après"""
+        before = list(self.removed.values()) + [old for old, _ in self.changed.values()]
+        after = list(self.added.values()) + [new for _, new in self.changed.values()]
+        return before, after
+
+    @property
+    def volume_change(self) -> float:
+        """Variation du volume total (km), calculée sur les seules séances modifiées"""
+        before, after = self._before_after()
+        return sum(s.total_distance for s in after) - sum(s.total_distance for s in before)
+
+    @property
+    def duration_change(self) -> timedelta:
+        """Variation de la durée totale, calculée sur les seules séances modifiées"""
+        before, after = self._before_after()
+        return sum((s.total_duration for s in after), timedelta(0)) - \
+            sum((s.total_duration for s in before), timedelta(0))
+
+    @property
+    def session_type_changes(self) -> Dict[str, int]:
+        """Variation du nombre de séances de chaque type (types inchangés omis)"""
+        before, after = self._before_after()
+        changes: Dict[str, int] = {}
+        for session in after:
+            changes[session.session_type.value] = changes.get(session.session_type.value, 0) + 1
+        for session in before:
+            changes[session.session_type.value] = changes.get(session.session_type.value, 0) - 1
+        return {session_type: count for session_type, count in changes.items() if count}
+
+
+def diff_plans(plan_a: TrainingPlan, plan_b: TrainingPlan,
+               dates: Optional[Iterable[date]] = None,
+               weeks: Optional[Iterable[int]] = None) -> PlanDiff:
+    """
+    Compare deux plans
+
+    Les séances partagées par les deux plans (même objet) sont considérées
+    comme identiques sans être comparées.
+
+    Args:
+        plan_a: Premier plan
+        plan_b: Second plan
+        dates: Dates à comparer (None = toutes les dates des deux plans)
+        weeks: Semaines dont comparer le volume (None = toutes)
+
+    Returns:
+        Différences de plan_a à plan_b
+    """
+    diff = PlanDiff(
+        user_data_changed=plan_a.user_data != plan_b.user_data,
+        phases_changed=not _same_schedule(plan_a.phase_schedule, plan_b.phase_schedule)
+    )
+
+    if dates is None:
+        dates = plan_a.sessions.keys() | plan_b.sessions.keys()
+    for session_date in dates:
+        old = plan_a.sessions.get(session_date)
+        new = plan_b.sessions.get(session_date)
+        if old is new:
+            continue
+        if old is None:
+            diff.added[session_date] = new
+        elif new is None:
+            diff.removed[session_date] = old
+        elif old != new:
+            diff.changed[session_date] = (old, new)
+
+    if weeks is None:
+        weeks = plan_a.weekly_volumes.keys() | plan_b.weekly_volumes.keys()
+    for week in weeks:
+        old_volume = plan_a.weekly_volumes.get(week)
+        new_volume = plan_b.weekly_volumes.get(week)
+        if old_volume != new_volume:
+            diff.weekly_volumes[week] = (old_volume, new_volume)
+
+    return diff
+
+
+def _same_schedule(schedule_a: PhaseSchedule, schedule_b: PhaseSchedule) -> bool:
+    """Compare deux plannings de phases d'après leurs bornes"""
+    return schedule_a is schedule_b or (
+        schedule_a.start_date == schedule_b.start_date and schedule_a.ranges == schedule_b.ranges
+    )
+
+
+@dataclass
+class _Revision:
+    """
+    Révision d'un plan, stockée sous forme de différence avec sa révision parente
+
+    Les séances et volumes à None ont été supprimés. user_data et phases ne
+    sont renseignés que s'ils ont changé. Les révisions clés conservent en
+    plus l'état complet du plan (snapshot).
+    """
+    parent: Optional[int]
+    depth: int
+    sessions: Dict[date, Optional[Session]]
+    weekly_volumes: Dict[int, Optional[float]]
+    user_data: Optional[UserData]
+    phases: Optional[PhaseSchedule]
+    version: str
+    message: str
+    created_at: datetime
+    snapshot: Optional[TrainingPlan] = None
+
+
+class PlanHistory:
+    """
+    Historique des révisions d'un plan d'entraînement
+
+    Chaque révision n'enregistre que les séances, volumes hebdomadaires,
+    données utilisateur et phases qui diffèrent de sa révision parente: le
+    coût d'une révision est proportionnel à ce qui a changé. Une révision sur
+    KEYFRAME_INTERVAL conserve l'état complet, de sorte que l'extraction d'une
+    révision rejoue au plus KEYFRAME_INTERVAL différences.
+
+    Les séances sont partagées entre les révisions et les plans extraits:
+    elles ne doivent pas être modifiées en place.
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """
+        Initialise un historique vide
+
+        Args:
+            keyframe_interval: Intervalle (en profondeur) entre deux révisions complètes
+        """
+        self.keyframe_interval = keyframe_interval
+        self._revisions: List[_Revision] = []
+        self.head: Optional[int] = None
+        self._head_plan: Optional[TrainingPlan] = None
+
+    def __len__(self) -> int:
+        return len(self._revisions)
+
+    def commit(self, plan: TrainingPlan, message: str = "", parent: Optional[int] = None) -> int:
+        """
+        Enregistre un plan comme nouvelle révision
+
+        Args:
+            plan: Plan à enregistrer
+            message: Description de la révision (ex: "ajustement à la date du jour")
+            parent: Révision parente (None = révision courante)
+
+        Returns:
+            Numéro de la nouvelle révision, qui devient la révision courante
+        """
+        if parent is None:
+            parent = self.head
+
+        if parent is None:
+            base_sessions: Dict[date, Session] = {}
+            base_volumes: Dict[int, float] = {}
+            user_data, phases = plan.user_data, plan.phase_schedule
+            depth = 0
+        else:
+            base = self.checkout(parent)
+            base_sessions, base_volumes = base.sessions, base.weekly_volumes
+            user_data = plan.user_data if plan.user_data != base.user_data else None
+            phases = None if _same_schedule(base.phase_schedule, plan.phase_schedule) else plan.phase_schedule
+            depth = self._revisions[parent].depth + 1
+
+        sessions: Dict[date, Optional[Session]] = {}
+        for session_date in base_sessions.keys() | plan.sessions.keys():
+            old = base_sessions.get(session_date)
+            new = plan.sessions.get(session_date)
+            if old is not new and old != new:
+                sessions[session_date] = new
+
+        weekly_volumes: Dict[int, Optional[float]] = {}
+        for week in base_volumes.keys() | plan.weekly_volumes.keys():
+            if base_volumes.get(week) != plan.weekly_volumes.get(week):
+                weekly_volumes[week] = plan.weekly_volumes.get(week)
+
+        revision = _Revision(
+            parent=parent,
+            depth=depth,
+            sessions=sessions,
+            weekly_volumes=weekly_volumes,
+            user_data=user_data,
+            phases=phases,
+            version=plan.version,
+            message=message,
+            created_at=datetime.now()
+        )
+
+        rev = len(self._revisions)
+        self._revisions.append(revision)
+
+        materialized = self._materialize(plan)
+        if depth % self.keyframe_interval == 0:
+            revision.snapshot = materialized
+
+        self.head = rev
+        self._head_plan = materialized
+        return rev
+
+    def checkout(self, rev: int) -> TrainingPlan:
+        """
+        Reconstitue le plan d'une révision
+
+        Args:
+            rev: Numéro de révision
+
+        Returns:
+            Plan de la révision (nouvel objet; les séances sont partagées)
+
+        Raises:
+            IndexError: Si la révision n'existe pas
+        """
+        if not 0 <= rev < len(self._revisions):
+            raise IndexError(f"Révision inconnue: {rev}")
+
+        if rev == self.head and self._head_plan is not None:
+            return self._materialize(self._head_plan)
+
+        # Remonter jusqu'à la révision clé la plus proche
+        chain = []
+        current = rev
+        while self._revisions[current].snapshot is None:
+            chain.append(self._revisions[current])
+            current = self._revisions[current].parent
+
+        snapshot = self._revisions[current].snapshot
+        sessions = dict(snapshot.sessions)
+        weekly_volumes = dict(snapshot.weekly_volumes)
+        user_data, phases = snapshot.user_data, snapshot.phase_schedule
+
+        for revision in reversed(chain):
+            for session_date, session in revision.sessions.items():
+                if session is None:
+                    sessions.pop(session_date, None)
+                else:
+                    sessions[session_date] = session
+            for week, volume in revision.weekly_volumes.items():
+                if volume is None:
+                    weekly_volumes.pop(week, None)
+                else:
+                    weekly_volumes[week] = volume
+            if revision.user_data is not None:
+                user_data = revision.user_data
+            if revision.phases is not None:
+                phases = revision.phases
+
+        return TrainingPlan(
+            user_data=user_data,
+            sessions=sessions,
+            phase_dates=phases,
+            weekly_volumes=weekly_volumes,
+            version=self._revisions[rev].version
+        )
+
+    def diff(self, rev_a: int, rev_b: int) -> PlanDiff:
+        """
+        Compare deux révisions
+
+        Seules les dates et semaines modifiées par les révisions qui séparent
+        rev_a et rev_b (jusqu'à leur ancêtre commun) sont comparées.
+
+        Args:
+            rev_a: Première révision
+            rev_b: Seconde révision
+
+        Returns:
+            Différences de rev_a à rev_b
+        """
+        dates: Set[date] = set()
+        weeks: Set[int] = set()
+        for revision in self._path(rev_a, rev_b):
+            dates.update(revision.sessions)
+            weeks.update(revision.weekly_volumes)
+
+        return diff_plans(self.checkout(rev_a), self.checkout(rev_b), dates, weeks)
+
+    def change_counts(self, rev: Optional[int] = None) -> Dict[date, int]:
+        """
+        Compte, pour chaque date, les révisions qui ont modifié sa séance
+
+        Seules les révisions ancêtres de rev (rev incluse) sont comptées; la
+        révision qui crée une séance compte pour une modification.
+
+        Args:
+            rev: Révision (None = révision courante)
+
+        Returns:
+            Nombre de modifications de chaque date (dates jamais modifiées omises)
+        """
+        counts: Dict[date, int] = {}
+        current = self.head if rev is None else rev
+        while current is not None:
+            revision = self._revisions[current]
+            for session_date in revision.sessions:
+                counts[session_date] = counts.get(session_date, 0) + 1
+            current = revision.parent
+        return counts
+
+    def log(self) -> List[Dict[str, object]]:
+        """
+        Liste les révisions, de la plus ancienne à la plus récente
+
+        Returns:
+            Liste de dictionnaires (rev, parent, message, created_at, nombre de séances modifiées)
+        """
+        return [
+            {
+                "rev": rev,
+                "parent": revision.parent,
+                "message": revision.message,
+                "created_at": revision.created_at,
+                "changed_sessions": len(revision.sessions)
+            }
+            for rev, revision in enumerate(self._revisions)
+        ]
+
+    def _path(self, rev_a: int, rev_b: int) -> List[_Revision]:
+        """Révisions situées entre rev_a et rev_b, ancêtre commun exclu"""
+        for rev in (rev_a, rev_b):
+            if not 0 <= rev < len(self._revisions):
+                raise IndexError(f"Révision inconnue: {rev}")
+
+        path = []
+        while rev_a != rev_b:
+            # Remonter la branche la plus profonde (ou les deux à profondeur égale)
+            depth_a = self._revisions[rev_a].depth
+            depth_b = self._revisions[rev_b].depth
+            if depth_a >= depth_b:
+                path.append(self._revisions[rev_a])
+                rev_a = self._revisions[rev_a].parent
+            if depth_b >= depth_a:
+                path.append(self._revisions[rev_b])
+                rev_b = self._revisions[rev_b].parent
+        return path
+
+    @staticmethod
+    def _materialize(plan: TrainingPlan) -> TrainingPlan:
+        """Copie superficielle d'un plan (séances partagées)"""
+        return TrainingPlan(
+            user_data=plan.user_data,
+            sessions=dict(plan.sessions),
+            phase_dates=plan.phase_schedule,
+            weekly_volumes=dict(plan.weekly_volumes),
+            version=plan.version
+        )
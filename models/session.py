@@ -1,7 +1,6 @@
-from dataclasses import dataclass, field
 from datetime import date, timedelta
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 
 from utils import format_timedelta, format_pace
 
@@ -22,28 +21,130 @@ class TrainingPhase(Enum):
     TAPER = "Affûtage"
 
 
+# Libellés des blocs, rendus à la demande ({pace}: allure, {rep}/{count}: répétition)
+EF_BLOCK_LABEL = "Endurance continue à {pace}"
+WARMUP_LABEL = "Échauffement à {pace}"
+MAIN_BLOCK_LABEL = "Bloc principal à {pace}"
+COOLDOWN_LABEL = "Retour au calme à {pace}"
+THRESHOLD_WARMUP_LABEL = "Échauffement à {pace}/km"
+INTERVAL_LABEL = "Intervalle {rep}/{count} à {pace}/km"
+RECOVERY_LABEL = "Récupération {rep}/{count} à {pace}/km"
+THRESHOLD_COOLDOWN_LABEL = "Retour au calme à {pace}/km"
+RACE_BLOCK_LABEL = "Course à {pace}"
+
+# Facteurs de pondération du score de difficulté par type de séance
+DIFFICULTY_TYPE_FACTORS = {
+    SessionType.EF: 1.0,
+    SessionType.LONG_RUN: 1.5,
+    SessionType.THRESHOLD: 2.0,
+    SessionType.RACE: 2.5
+}
+
+# Nombre de microsecondes par seconde (résolution de timedelta)
+MICROSECONDS = 1_000_000
+
+
 class SessionBlock:
     """
     Représente un bloc d'entraînement au sein d'une séance
     (ex: échauffement, bloc actif, retour au calme)
+
+    L'allure est conservée en microsecondes entières (résolution exacte de
+    timedelta) et la description peut être un libellé rendu à la demande.
+    Un bloc est immuable: les agrégats des séances qui le contiennent restent
+    valides tant que leurs blocs ne sont pas remplacés.
     """
 
-    def __init__(self, distance: float, pace: timedelta, description: str = ""):
-        self.distance = distance
-        self.pace = pace
-        self.description = description
+    __slots__ = ("_distance", "_pace", "_description", "_label", "_repetition")
+
+    def __init__(self, distance: float, pace: timedelta, description: str = "",
+                 label: Optional[str] = None):
+        """
+        Initialise le bloc
+
+        Args:
+            distance: Distance du bloc en km
+            pace: Allure du bloc
+            description: Description du bloc
+            label: Libellé utilisé à la place de la description, formaté à la
+                   demande avec {pace}, {rep} et {count}
+        """
+        self._distance = distance
+        self._pace = pace // timedelta(microseconds=1)
+        self._description = description
+        self._label = label
+        self._repetition: Optional[Tuple[int, int]] = None
+
+    @property
+    def distance(self) -> float:
+        """Distance du bloc en km"""
+        return self._distance
+
+    @property
+    def pace(self) -> timedelta:
+        """Allure du bloc"""
+        return timedelta(microseconds=self._pace)
+
+    @property
+    def pace_seconds(self) -> float:
+        """Allure du bloc en secondes par km"""
+        return self._pace / MICROSECONDS
+
+    @property
+    def description(self) -> str:
+        """Description du bloc (le libellé éventuel est rendu à chaque accès)"""
+        if self._label is None:
+            return self._description
+
+        rep, count = self._repetition or (1, 1)
+        return self._label.format(pace=self.pace, rep=rep, count=count)
+
+    @property
+    def label(self) -> Optional[str]:
+        """Libellé rendu à la demande (None si la description est un texte fixe)"""
+        return self._label
 
     @property
     def duration(self) -> timedelta:
         """Calcule la durée du bloc en fonction de la distance et de l'allure"""
-        seconds = self.pace.total_seconds() * self.distance
+        seconds = self.pace_seconds * self.distance
         return timedelta(seconds=seconds)
 
+    def repetition(self, rep: int, count: int) -> 'SessionBlock':
+        """
+        Crée l'occurrence d'un bloc répété
+
+        Args:
+            rep: Numéro de la répétition (à partir de 1)
+            count: Nombre total de répétitions
+
+        Returns:
+            Bloc partageant la distance, l'allure et le libellé de ce bloc
+        """
+        block = SessionBlock.__new__(SessionBlock)
+        block._distance = self._distance
+        block._pace = self._pace
+        block._description = self._description
+        block._label = self._label
+        block._repetition = (rep, count)
+        return block
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SessionBlock):
+            return NotImplemented
+        return (self.distance == other.distance and self._pace == other._pace
+                and self.description == other.description)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SessionBlock(distance={self.distance!r}, pace={self.pace!r}, description={self.description!r})"
+
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'objet en dictionnaire pour sérialisation JSON"""
         return {
             "distance": self.distance,
-            "pace": self.pace.total_seconds(),
+            "pace": self.pace_seconds,
             "description": self.description
         }
 
@@ -57,7 +158,104 @@ class SessionBlock:
         )
 
 
-@dataclass
+class BlockRepeat:
+    """
+    Répétition N× d'une suite de blocs (ex: intervalle / récupération)
+
+    Les blocs ne sont conservés qu'une fois; leurs occurrences sont créées à
+    l'itération, dans l'ordre (bloc 1, bloc 2, ..., bloc 1, bloc 2, ...).
+    """
+
+    __slots__ = ("_count", "_pattern")
+
+    def __init__(self, count: int, pattern: Sequence[SessionBlock]):
+        """
+        Initialise la répétition (immuable, comme ses blocs)
+
+        Args:
+            count: Nombre de répétitions
+            pattern: Blocs d'une répétition
+        """
+        self._count = count
+        self._pattern = tuple(pattern)
+
+    @property
+    def count(self) -> int:
+        """Nombre de répétitions"""
+        return self._count
+
+    @property
+    def pattern(self) -> Tuple[SessionBlock, ...]:
+        """Blocs d'une répétition"""
+        return self._pattern
+
+    def __iter__(self) -> Iterator[SessionBlock]:
+        for rep in range(1, self.count + 1):
+            for block in self.pattern:
+                yield block.repetition(rep, self.count)
+
+    def __len__(self) -> int:
+        return self.count * len(self.pattern)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, BlockRepeat):
+            return NotImplemented
+        return self.count == other.count and self.pattern == other.pattern
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"BlockRepeat(count={self.count!r}, pattern={list(self.pattern)!r})"
+
+    @classmethod
+    def compact(cls, blocks: Sequence[SessionBlock],
+                labels: Tuple[str, str] = (INTERVAL_LABEL, RECOVERY_LABEL)) -> List[Union[SessionBlock, 'BlockRepeat']]:
+        """
+        Regroupe les paires de blocs répétées (ex: blocs chargés depuis JSON)
+
+        Une suite de paires identiques n'est regroupée que si les descriptions
+        correspondent exactement aux libellés rendus, afin que l'itération
+        restitue les mêmes blocs.
+
+        Args:
+            blocks: Blocs développés
+            labels: Libellés des deux blocs d'une répétition
+
+        Returns:
+            Liste de blocs où les répétitions sont remplacées par des BlockRepeat
+        """
+        compacted: List[Union[SessionBlock, BlockRepeat]] = []
+        i = 0
+
+        while i < len(blocks):
+            first = blocks[i]
+            second = blocks[i + 1] if i + 1 < len(blocks) else None
+
+            # Nombre de paires consécutives de mêmes distances et allures
+            count = 0
+            if second is not None:
+                while i + 2 * count + 1 < len(blocks) and all(
+                        block.distance == reference.distance and block._pace == reference._pace
+                        for block, reference in zip(blocks[i + 2 * count:i + 2 * count + 2], (first, second))):
+                    count += 1
+
+            if count > 1:
+                pattern = (
+                    SessionBlock(first.distance, first.pace, label=labels[0]),
+                    SessionBlock(second.distance, second.pace, label=labels[1])
+                )
+                repeat = cls(count, pattern)
+                if list(repeat) == list(blocks[i:i + 2 * count]):
+                    compacted.append(repeat)
+                    i += 2 * count
+                    continue
+
+            compacted.append(first)
+            i += 1
+
+        return compacted
+
+
 class Session:
     """
     Représente une séance d'entraînement.
@@ -66,35 +264,182 @@ class Session:
         session_date: Date de la séance
         session_type: Type de séance (SL, Seuil, EF, Repos, Course)
         phase: Phase d'entraînement (développement, spécifique, affûtage)
-        blocks: Liste des blocs d'activité composant la séance
+        blocks: Blocs d'activité composant la séance (les répétitions
+                BlockRepeat sont développées à la lecture)
         description: Description textuelle de la séance
         is_intermediate_race: Indique s'il s'agit d'une course intermédiaire
+
+    La distance, la durée et le score de difficulté sont calculés une seule
+    fois puis conservés; ils sont invalidés lorsque les blocs ou le type de
+    séance sont remplacés. Les blocs sont immuables: pour modifier une
+    séance, affecter une nouvelle suite de blocs à blocks, ce qui incrémente
+    revision (les plans qui contiennent la séance recalculent alors leurs
+    agrégats).
+
+    Le type et la phase servent de clés aux index d'un plan: ils ne peuvent
+    plus être modifiés une fois la séance indexée (remplacer alors la séance
+    avec TrainingPlan.add_session).
     """
-    session_date: date
-    session_type: SessionType
-    phase: TrainingPhase
-    blocks: List[SessionBlock] = field(default_factory=list)
-    description: str = ""
-    is_intermediate_race: bool = False
+
+    __slots__ = ("session_date", "_session_type", "_phase", "_blocks", "description", "is_intermediate_race",
+                 "_total_distance", "_total_duration", "_difficulty", "_indexed", "_revision")
+
+    def __init__(self, session_date: date, session_type: SessionType, phase: TrainingPhase,
+                 blocks: Optional[Sequence[Union[SessionBlock, BlockRepeat]]] = None,
+                 description: str = "", is_intermediate_race: bool = False):
+        self.session_date = session_date
+        self._indexed = False
+        self._session_type = session_type
+        self._phase = phase
+        self._blocks = tuple(blocks or ())
+        self._revision = 0
+        self.invalidate_aggregates()
+        self.description = description
+        self.is_intermediate_race = is_intermediate_race
+
+    @property
+    def session_type(self) -> SessionType:
+        """Type de séance"""
+        return self._session_type
+
+    @session_type.setter
+    def session_type(self, session_type: SessionType) -> None:
+        self._check_not_indexed("session_type")
+        self._session_type = session_type
+        self._difficulty = None
+        self._revision += 1
+
+    @property
+    def phase(self) -> TrainingPhase:
+        """Phase d'entraînement"""
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase: TrainingPhase) -> None:
+        self._check_not_indexed("phase")
+        self._phase = phase
+
+    def mark_indexed(self) -> None:
+        """Fige le type et la phase de la séance (appelé à son ajout aux index d'un plan)"""
+        self._indexed = True
+
+    def _check_not_indexed(self, attribute: str) -> None:
+        """
+        Refuse la modification d'une clé d'index d'une séance déjà indexée
+
+        Raises:
+            AttributeError: Si la séance appartient aux index d'un plan
+        """
+        if self._indexed:
+            raise AttributeError(
+                f"{attribute} ne peut plus être modifié une fois la séance ajoutée à un plan: "
+                f"créer une nouvelle séance et la remplacer avec TrainingPlan.add_session"
+            )
+
+    @property
+    def blocks(self) -> Tuple[SessionBlock, ...]:
+        """Blocs de la séance, répétitions développées (lecture seule: utiliser le setter)"""
+        return tuple(self.iter_blocks())
+
+    @blocks.setter
+    def blocks(self, blocks: Sequence[Union[SessionBlock, BlockRepeat]]) -> None:
+        self._blocks = tuple(blocks)
+        self.invalidate_aggregates()
+        self._revision += 1
+
+    @property
+    def revision(self) -> int:
+        """Nombre de modifications de la séance depuis sa création (blocs ou type remplacés)"""
+        return self._revision
+
+    @property
+    def compact_blocks(self) -> Tuple[Union[SessionBlock, BlockRepeat], ...]:
+        """Blocs de la séance tels que stockés (répétitions non développées)"""
+        return self._blocks
+
+    def iter_blocks(self) -> Iterator[SessionBlock]:
+        """Itère sur les blocs de la séance en développant les répétitions"""
+        for block in self._blocks:
+            if isinstance(block, BlockRepeat):
+                yield from block
+            else:
+                yield block
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Session):
+            return NotImplemented
+        return (self.session_date == other.session_date
+                and self.session_type == other.session_type
+                and self.phase == other.phase
+                and self.blocks == other.blocks
+                and self.description == other.description
+                and self.is_intermediate_race == other.is_intermediate_race)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Session(session_date={self.session_date!r}, session_type={self.session_type!r}, "
+                f"phase={self.phase!r}, blocks={self.blocks!r}, description={self.description!r}, "
+                f"is_intermediate_race={self.is_intermediate_race!r})")
+
+    def invalidate_aggregates(self) -> None:
+        """Oublie la distance, la durée et le score de difficulté calculés"""
+        self._total_distance = None
+        self._total_duration = None
+        self._difficulty = None
+
+    def refresh_aggregates(self) -> None:
+        """Recalcule immédiatement la distance, la durée et le score de difficulté"""
+        self.invalidate_aggregates()
+        self.get_difficulty_score()
+        self.total_duration
+
+    def restore_aggregates(self, total_distance: float, total_duration: timedelta, difficulty: float) -> None:
+        """
+        Reprend des agrégats déjà calculés (ex: lus depuis un plan sérialisé)
+
+        Args:
+            total_distance: Distance totale en km
+            total_duration: Durée totale
+            difficulty: Score de difficulté
+        """
+        self._total_distance = total_distance
+        self._total_duration = total_duration
+        self._difficulty = difficulty
 
     @property
     def total_distance(self) -> float:
-        """Calcule la distance totale de la séance, arrondie au dixième de km"""
-        if not self.blocks:
-            return 0.0
-        total = sum(block.distance for block in self.blocks)
-        return round(total, 1)  # Arrondi au dixième
+        """Distance totale de la séance, arrondie au dixième de km"""
+        if self._total_distance is None:
+            if not self._blocks:
+                self._total_distance = 0.0
+            else:
+                total = sum(block.distance for block in self.iter_blocks())
+                self._total_distance = round(total, 1)  # Arrondi au dixième
+        return self._total_distance
 
     @property
     def total_duration(self) -> timedelta:
-        """Calcule la durée totale de la séance, arrondie à la seconde"""
-        if not self.blocks:
-            return timedelta(0)
-        total_seconds = sum(block.duration.total_seconds()
-                            for block in self.blocks)
-        return timedelta(seconds=round(total_seconds))  # Arrondi à la seconde
+        """Durée totale de la séance, arrondie à la seconde"""
+        if self._total_duration is None:
+            if not self._blocks:
+                self._total_duration = timedelta(0)
+            else:
+                total_seconds = sum(block.duration.total_seconds()
+                                    for block in self.iter_blocks())
+                self._total_duration = timedelta(seconds=round(total_seconds))  # Arrondi à la seconde
+        return self._total_duration
 
     def get_difficulty_score(self) -> float:
+        """
+        Score de difficulté de la séance (calculé une seule fois)
+        Plus le score est élevé, plus la séance est difficile
+        """
+        if self._difficulty is None:
+            self._difficulty = self._compute_difficulty_score()
+        return self._difficulty
+
+    def _compute_difficulty_score(self) -> float:
         """
         Calcule un score de difficulté pour la séance
         Plus le score est élevé, plus la séance est difficile
@@ -102,26 +447,18 @@ class Session:
         if self.session_type == SessionType.REST:
             return 0.0
 
-        # Facteurs de pondération par type de séance
-        type_factors = {
-            SessionType.EF: 1.0,
-            SessionType.LONG_RUN: 1.5,
-            SessionType.THRESHOLD: 2.0,
-            SessionType.RACE: 2.5
-        }
-
         # Score de base: distance * facteur de type
         base_score = self.total_distance * \
-            type_factors.get(self.session_type, 1.0)
+            DIFFICULTY_TYPE_FACTORS.get(self.session_type, 1.0)
 
         # Ajustement en fonction de l'intensité (allure moyenne)
-        if self.blocks:
+        if self._blocks:
             # Calcul de l'allure moyenne pondérée par la distance
             total_distance = self.total_distance
             if total_distance > 0:
                 weighted_pace = sum(
-                    block.pace.total_seconds() * (block.distance / total_distance)
-                    for block in self.blocks
+                    block.pace_seconds * (block.distance / total_distance)
+                    for block in self.iter_blocks()
                 )
                 # Plus l'allure est rapide (seconds/km petit), plus le score augmente
                 intensity_factor = 360 / weighted_pace  # Facteur arbitraire pour normaliser
@@ -129,27 +466,49 @@ class Session:
 
         return base_score
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convertit l'objet en dictionnaire pour sérialisation JSON"""
-        return {
+    def to_dict(self, aggregates: bool = False) -> Dict[str, Any]:
+        """
+        Convertit l'objet en dictionnaire pour sérialisation JSON
+
+        Args:
+            aggregates: Si True, ajoute la distance, la durée et le score de
+                        difficulté calculés (repris tels quels en chargement de confiance)
+        """
+        data = {
             "session_date": self.session_date.isoformat(),
             "session_type": self.session_type.value,
             "phase": self.phase.value,
-            "blocks": [block.to_dict() for block in self.blocks],
+            "blocks": [block.to_dict() for block in self.iter_blocks()],
             "description": self.description,
             "is_intermediate_race": self.is_intermediate_race
         }
 
+        if aggregates:
+            data["aggregates"] = {
+                "total_distance": self.total_distance,
+                "total_duration": self.total_duration.total_seconds(),
+                "difficulty": self.get_difficulty_score()
+            }
+
+        return data
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Session':
-        """Crée un objet Session à partir d'un dictionnaire"""
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'Session':
+        """
+        Crée un objet Session à partir d'un dictionnaire
+
+        Args:
+            data: Dictionnaire représentant la séance
+            trusted: Si True, les agrégats enregistrés (clé "aggregates") sont
+                     repris sans être recalculés
+        """
         session_date = date.fromisoformat(data["session_date"])
         session_type = SessionType(data["session_type"])
         phase = TrainingPhase(data["phase"])
-        blocks = [SessionBlock.from_dict(block)
-                  for block in data.get("blocks", [])]
+        blocks = BlockRepeat.compact([SessionBlock.from_dict(block)
+                                      for block in data.get("blocks", [])])
 
-        return cls(
+        session = cls(
             session_date=session_date,
             session_type=session_type,
             phase=phase,
@@ -158,6 +517,14 @@ class Session:
             is_intermediate_race=data.get("is_intermediate_race", False)
         )
 
+        aggregates = data.get("aggregates")
+        if trusted and aggregates is not None:
+            session.restore_aggregates(aggregates["total_distance"],
+                                       timedelta(seconds=aggregates["total_duration"]),
+                                       aggregates["difficulty"])
+
+        return session
+
     @classmethod
     def create_ef_session(cls, session_date: date, phase: TrainingPhase,
                           distance: float, ef_pace: timedelta,
@@ -182,7 +549,7 @@ class Session:
         block = SessionBlock(
             distance=distance,
             pace=ef_pace,
-            description=f"Endurance continue à {ef_pace}"
+            label=EF_BLOCK_LABEL
         )
 
         return cls(
@@ -229,17 +596,17 @@ class Session:
                 SessionBlock(
                     distance=warmup_distance,
                     pace=ef_pace,
-                    description=f"Échauffement à {ef_pace}"
+                    label=WARMUP_LABEL
                 ),
                 SessionBlock(
                     distance=active_distance,
                     pace=specific_pace,
-                    description=f"Bloc principal à {specific_pace}"
+                    label=MAIN_BLOCK_LABEL
                 ),
                 SessionBlock(
                     distance=cooldown_distance,
                     pace=ef_pace,
-                    description=f"Retour au calme à {ef_pace}"
+                    label=COOLDOWN_LABEL
                 )
             ]
 
@@ -250,7 +617,7 @@ class Session:
                 SessionBlock(
                     distance=total_distance,
                     pace=ef_pace,
-                    description=f"Endurance continue à {ef_pace}"
+                    label=EF_BLOCK_LABEL
                 )
             ]
 
@@ -318,33 +685,32 @@ class Session:
             SessionBlock(
                 distance=warmup_distance,
                 pace=ef_pace,
-                description=f"Échauffement à {ef_pace}/km"
+                label=THRESHOLD_WARMUP_LABEL
             )
         ]
 
-        # Ajouter les répétitions
-        for i in range(num_reps):
-            blocks.append(
+        # Ajouter les répétitions (un seul bloc "N×" développé à la lecture)
+        blocks.append(
+            BlockRepeat(num_reps, [
                 SessionBlock(
                     distance=threshold_distance_per_rep,
                     pace=threshold_pace,
-                    description=f"Intervalle {i+1}/{num_reps} à {threshold_pace}/km"
-                )
-            )
-            blocks.append(
+                    label=INTERVAL_LABEL
+                ),
                 SessionBlock(
                     distance=ef_distance_per_rep,
                     pace=ef_pace,
-                    description=f"Récupération {i+1}/{num_reps} à {ef_pace}/km"
+                    label=RECOVERY_LABEL
                 )
-            )
+            ])
+        )
 
         # Ajouter le retour au calme
         blocks.append(
             SessionBlock(
                 distance=cooldown_distance,
                 pace=ef_pace,
-                description=f"Retour au calme à {ef_pace}/km"
+                label=THRESHOLD_COOLDOWN_LABEL
             )
         )
 
@@ -415,7 +781,7 @@ class Session:
         block = SessionBlock(
             distance=race_distance,
             pace=race_pace,
-            description=f"Course à {race_pace}"
+            label=RACE_BLOCK_LABEL
         )
 
         desc = description or f"Course de {race_distance} km à {race_pace}"
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from dataclasses import dataclass, field
 from datetime import date, timedelta
 from typing import List, Dict, Any
@@ -106,16 +108,41 @@ class UserData:
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'UserData':
-        """Crée un objet UserData à partir d'un dictionnaire"""
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'UserData':
+        """
+        Crée un objet UserData à partir d'un dictionnaire
+
+        Args:
+            data: Dictionnaire représentant les données utilisateur
+            trusted: Si True, les données ont déjà été validées à la création du
+                     plan (stockage local): les règles de __post_init__ ne sont
+                     pas réévaluées
+        """
         # Conversion des types
         start_date = date.fromisoformat(data["start_date"])
-        main_race = Course.from_dict(data["main_race"])
+        main_race = Course.from_dict(data["main_race"], trusted=trusted)
         pace_5k = timedelta(seconds=data["pace_5k"])
         pace_10k = timedelta(seconds=data["pace_10k"])
         pace_half_marathon = timedelta(seconds=data["pace_half_marathon"])
         pace_marathon = timedelta(seconds=data["pace_marathon"])
-        intermediate_races = [Course.from_dict(race) for race in data.get("intermediate_races", [])]
+        intermediate_races = [Course.from_dict(race, trusted=trusted)
+                              for race in data.get("intermediate_races", [])]
+
+        if trusted:
+            user_data = cls.__new__(cls)
+            user_data.__dict__.update(
+                start_date=start_date,
+                main_race=main_race,
+                pace_5k=pace_5k,
+                pace_10k=pace_10k,
+                pace_half_marathon=pace_half_marathon,
+                pace_marathon=pace_marathon,
+                sessions_per_week=data["sessions_per_week"],
+                min_volume=data["min_volume"],
+                max_volume=data["max_volume"],
+                intermediate_races=intermediate_races
+            )
+            return user_data
 
         return cls(
             start_date=start_date,
@@ -130,6 +157,16 @@ class UserData:
             intermediate_races=intermediate_races
         )
 
+    def fingerprint(self) -> str:
+        """
+        Calcule une empreinte stable du contenu des données utilisateur
+
+        Returns:
+            Empreinte SHA-256 (hexadécimale) de la forme canonique de to_dict()
+        """
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
     @property
     def total_weeks(self) -> int:
         """Calcule le nombre total de semaines du plan"""
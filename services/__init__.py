@@ -1,15 +1,21 @@
 from .phase_calculator import PhaseCalculator
 from .volume_calculator import VolumeCalculator
 from .session_distributor import SessionDistributor
+from .plan_cache import PlanCache
 from .plan_generator import PlanGenerator
+from .export_cache import ExportCache
 from .export_service import ExportService
 from .import_service import ImportService
+from .ics_feed import IcsFeed
 
 __all__ = [
     'PhaseCalculator',
     'VolumeCalculator',
     'SessionDistributor',
+    'PlanCache',
     'PlanGenerator',
+    'ExportCache',
     'ExportService',
-    'ImportService'
+    'ImportService',
+    'IcsFeed'
 ]
\ No newline at end of file
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# Version des exports: à incrémenter lorsque le contenu produit par
+# ExportService change, afin d'invalider les exports mis en cache sur disque
+EXPORT_CACHE_VERSION = "2"
+
+
+class ExportCache:
+    """
+    Cache LRU des fichiers exportés (PDF, ICS, TCX), indexé par l'empreinte du
+    contenu du plan, le format, la langue et les options d'export
+
+    Les exports ne dépendent que du contenu du plan: deux utilisateurs dont
+    les plans sont identiques partagent les mêmes entrées. Chaque
+    propriétaire (une session de l'application) déclare l'empreinte de son
+    plan à l'export; lorsqu'elle change (plan modifié), les exports de
+    l'ancienne empreinte sont supprimés si plus aucun propriétaire ne
+    l'utilise.
+
+    Le cache est borné en nombre d'entrées et en taille (octets). Il peut être
+    adossé à un répertoire, lui aussi borné en taille, pour conserver les
+    exports entre deux redémarrages du serveur.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: Optional[str] = None, max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialise le cache
+
+        Args:
+            max_entries: Nombre maximal d'exports conservés en mémoire
+            max_bytes: Taille maximale (octets) des exports conservés en mémoire
+            cache_dir: Répertoire de persistance des exports (None = mémoire
+                       uniquement), créé à la première écriture
+            max_disk_bytes: Taille maximale (octets) des exports persistés; les
+                            plus anciens sont supprimés au-delà
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        # Empreinte du plan exporté en dernier par chaque propriétaire
+        self._owners: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(plan_hash: str, export_format: str, lang: str,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Calcule la clé de cache d'un export
+
+        Args:
+            plan_hash: Empreinte du contenu du plan (voir TrainingPlan.fingerprint)
+            export_format: Format d'export (pdf, ics, tcx...)
+            lang: Code de langue
+            options: Options d'export
+
+        Returns:
+            Clé composée de la version du cache, de l'empreinte du plan, du
+            format, de la langue et de l'empreinte des options
+        """
+        canonical = json.dumps(options or {}, sort_keys=True, separators=(",", ":"), default=str)
+        options_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        return f"v{EXPORT_CACHE_VERSION}-{plan_hash}-{export_format}-{lang}-{options_hash}"
+
+    def get_or_export(self, plan_hash: str, export_format: str, lang: str,
+                      options: Optional[Dict[str, Any]], export: Callable[[], bytes],
+                      owner: Optional[str] = None) -> bytes:
+        """
+        Récupère un export en cache ou le produit puis le met en cache
+
+        Args:
+            plan_hash: Empreinte du contenu du plan
+            export_format: Format d'export
+            lang: Code de langue
+            options: Options d'export
+            export: Fonction d'export appelée en cas d'absence
+            owner: Propriétaire du plan (None = pas de suivi des versions du plan)
+
+        Returns:
+            Contenu exporté
+        """
+        if owner is not None:
+            self._set_owner_hash(owner, plan_hash)
+
+        key = self.make_key(plan_hash, export_format, lang, options)
+        content = self.get(key)
+        if content is None:
+            content = export()
+            self._store(key, content, persist=True)
+        return content
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Récupère un export
+
+        Args:
+            key: Clé de cache (voir make_key)
+
+        Returns:
+            Contenu en cache ou None si absent
+        """
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return content
+
+        content = self._load_from_disk(key)
+
+        with self._lock:
+            if content is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+
+        self._store(key, content, persist=False)
+        return content
+
+    def invalidate(self, plan_hash: str) -> int:
+        """
+        Supprime les exports d'une version d'un plan, en mémoire et sur disque
+
+        Args:
+            plan_hash: Empreinte du contenu du plan
+
+        Returns:
+            Nombre d'exports supprimés en mémoire
+        """
+        prefix = f"v{EXPORT_CACHE_VERSION}-{plan_hash}-"
+
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._size -= len(self._entries.pop(key))
+            self.invalidations += len(keys)
+
+        if self.cache_dir and os.path.exists(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(".export") and filename.startswith(prefix):
+                    self._remove_file(filename)
+
+        return len(keys)
+
+    def release(self, owner: str) -> None:
+        """
+        Retire un propriétaire (fin de session); les exports de son plan sont
+        supprimés si plus aucun autre propriétaire ne l'utilise
+
+        Args:
+            owner: Propriétaire
+        """
+        with self._lock:
+            plan_hash = self._owners.pop(owner, None)
+            stale = plan_hash is not None and plan_hash not in self._owners.values()
+
+        if stale:
+            self.invalidate(plan_hash)
+
+    def clear(self, include_disk: bool = False) -> None:
+        """
+        Vide le cache
+
+        Args:
+            include_disk: Si True, supprime également les exports persistés
+        """
+        with self._lock:
+            self._entries.clear()
+            self._owners.clear()
+            self._size = 0
+
+        if include_disk and self.cache_dir and os.path.exists(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(".export"):
+                    self._remove_file(filename)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques d'utilisation du cache
+
+        Returns:
+            Dictionnaire avec les succès, échecs, évictions, invalidations, le
+            taux de succès, le nombre d'entrées et la taille occupée en mémoire
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size
+            }
+
+    def _set_owner_hash(self, owner: str, plan_hash: str) -> None:
+        """
+        Enregistre l'empreinte courante du plan d'un propriétaire et supprime
+        les exports de l'empreinte précédente si plus personne ne l'utilise
+
+        Args:
+            owner: Propriétaire
+            plan_hash: Empreinte courante du contenu de son plan
+        """
+        with self._lock:
+            previous = self._owners.get(owner)
+            if previous == plan_hash:
+                return
+            self._owners[owner] = plan_hash
+            stale = previous is not None and previous not in self._owners.values()
+
+        if stale:
+            self.invalidate(previous)
+
+    def _store(self, key: str, content: bytes, persist: bool) -> None:
+        """
+        Insère un export en mémoire (et sur disque si demandé) puis applique les limites
+
+        Args:
+            key: Clé de cache
+            content: Contenu exporté
+            persist: Si True, écrit également l'export dans le répertoire du cache
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            # Un export plus grand que le cache entier n'est conservé que sur disque
+            if len(content) <= self.max_bytes:
+                self._entries[key] = content
+                self._size += len(content)
+
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+        if persist:
+            self._save_to_disk(key, content)
+
+    def _save_to_disk(self, key: str, content: bytes) -> None:
+        """
+        Écrit un export dans le répertoire du cache (écriture atomique) puis
+        applique la limite de taille du répertoire
+
+        Args:
+            key: Clé de cache
+            content: Contenu exporté
+        """
+        if not self.cache_dir:
+            return
+
+        filepath = os.path.join(self.cache_dir, f"{key}.export")
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, filepath)
+        except IOError as e:
+            print(f"Erreur lors de la mise en cache de l'export: {e}")
+            return
+
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Supprime les exports persistés les plus anciens au-delà de max_disk_bytes"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".export"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.name))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, filename in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_file(filename)
+            total -= size
+
+    def _remove_file(self, filename: str) -> None:
+        """Supprime un export persisté"""
+        try:
+            os.remove(os.path.join(self.cache_dir, filename))
+        except OSError as e:
+            print(f"Erreur lors de la suppression de l'export en cache {filename}: {e}")
+
+    def _load_from_disk(self, key: str) -> Optional[bytes]:
+        """
+        Charge un export depuis le répertoire du cache
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Contenu chargé ou None s'il n'est pas persisté
+        """
+        if not self.cache_dir:
+            return None
+
+        filepath = os.path.join(self.cache_dir, f"{key}.export")
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            with open(filepath, 'rb') as f:
+                return f.read()
+        except IOError as e:
+            print(f"Erreur lors du chargement de l'export en cache {key}: {e}")
+            return None
+
+
+# Cache partagé par les services d'export de l'application (répertoire de
+# persistance configuré au démarrage, voir app.configure_caches)
+export_cache = ExportCache()
@@ -1,12 +1,9 @@
+import hashlib
 import io
-import uuid
-from datetime import datetime, timedelta
-from xml.dom import minidom
-from xml.etree import ElementTree as ET
-
-from ics import Calendar, Event
-from ics.alarm import DisplayAlarm
-from ics.grammar.parse import ContentLine
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -19,18 +16,228 @@ from config.languages import (
     PHASE_TRANSLATIONS
 )
 from models.plan import TrainingPlan
-from models.session import SessionType, TrainingPhase
+from models.plan_history import diff_plans
+from models.session import Session, SessionType, TrainingPhase
 from utils.date_utils import format_date
+from utils.ics_writer import IcsWriter, format_datetime_utc, format_duration
+from utils.plan_bundle import PlanBundleWriter
+from utils.xml_writer import XmlWriter
 from utils.time_converter import format_timedelta, format_pace
+from .export_cache import ExportCache, export_cache
+
+# Taille minimale des morceaux produits par ExportService.iter_tcx
+TCX_CHUNK_SIZE = 64 * 1024
+
+# Formats produits par ExportService.export_all
+EXPORT_FORMATS = ("ics", "tcx", "pdf", "json")
+
+# DTSTAMP des calendriers ICS mis en cache, remplacé par l'horodatage de
+# l'export à chaque lecture (même longueur: le pliage des lignes est inchangé)
+ICS_DTSTAMP_PLACEHOLDER = "00000000T000000Z"
+
+
+def ics_options(options: Optional[dict]) -> dict:
+    """
+    Complète des options d'export ICS avec leurs valeurs par défaut
+
+    Args:
+        options: Options fournies (non modifiées)
+
+    Returns:
+        Nouvelles options complètes
+    """
+    default_options = {
+        "include_rest_days": False,
+        "reminder_time": 30,
+        "start_time": 18,
+        "ics_calendar_name": "Training Plan",
+        "plan_id": None
+    }
+    return {**default_options, **(options or {})}
+
+
+def ics_plan_id(plan: TrainingPlan) -> str:
+    """
+    Identifiant stable d'un plan dans les UID des événements ICS
+
+    Il ne dépend que de la date de début et de la course principale: il est
+    conservé quand le plan est ajusté ou régénéré pour le même objectif.
+
+    Args:
+        plan: Plan d'entraînement
+
+    Returns:
+        Identifiant hexadécimal (16 caractères)
+    """
+    user_data = plan.user_data
+    key = f"{user_data.start_date.isoformat()}:{user_data.main_race.race_type.value}:" \
+          f"{user_data.main_race.race_date.isoformat()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def ics_changes(previous: Optional[TrainingPlan], plan: TrainingPlan, include_rest_days: bool,
+                dates: Optional[Iterable[date]] = None) -> Tuple[Dict[date, Session], Dict[date, Session]]:
+    """
+    Détermine les événements ICS à publier et à annuler entre deux états d'un plan
+
+    Args:
+        previous: Plan exporté précédemment (None = aucun)
+        plan: Nouvel état du plan
+        include_rest_days: Les jours de repos sont-ils exportés
+        dates: Dates à comparer (None = toutes)
+
+    Returns:
+        Tuple (séances à publier, séances annulées: état précédent), par date
+    """
+    def exported(session: Optional[Session]) -> bool:
+        return session is not None and (include_rest_days or session.session_type != SessionType.REST)
+
+    published: Dict[date, Session] = {}
+    cancelled: Dict[date, Session] = {}
+
+    if previous is None:
+        candidates = plan.sessions.keys() if dates is None else dates
+        for session_date in candidates:
+            session = plan.sessions.get(session_date)
+            if exported(session):
+                published[session_date] = session
+        return published, cancelled
+
+    diff = diff_plans(previous, plan, dates, weeks=())
+    for session_date in diff.added.keys() | diff.removed.keys() | diff.changed.keys():
+        old = previous.sessions.get(session_date)
+        new = plan.sessions.get(session_date)
+        if exported(new):
+            published[session_date] = new
+        elif exported(old):
+            cancelled[session_date] = old
+
+    return published, cancelled
+
+
+def ics_uid(plan_id: str, session_date: date) -> str:
+    """
+    UID de l'événement ICS d'une séance (une séance par date)
+
+    Args:
+        plan_id: Identifiant du plan (voir ics_plan_id)
+        session_date: Date de la séance
+
+    Returns:
+        UID de l'événement
+    """
+    return f"{plan_id}-{session_date.strftime('%Y%m%d')}@all-in-run"
+
+
+class SessionTexts:
+    """
+    Textes des séances communs aux formats d'export (noms traduits, dates,
+    durées et allures formatées)
+
+    Chaque texte est calculé à la première demande puis réutilisé: une même
+    instance peut être partagée par plusieurs exports d'un plan, y compris
+    depuis plusieurs threads (voir ExportService.export_all).
+    """
+
+    def __init__(self, lang: str = "fr"):
+        """
+        Args:
+            lang: Code de langue
+        """
+        self.lang = lang
+        self._type_names = SESSION_TYPE_TRANSLATIONS.get(lang, {})
+        self._day_names = DAYS_TRANSLATIONS.get(lang, {})
+        self._cache: Dict[Tuple[str, Any], str] = {}
+
+    def _memo(self, kind: str, key: Any, compute: Callable[[], str]) -> str:
+        value = self._cache.get((kind, key))
+        if value is None:
+            value = self._cache[(kind, key)] = compute()
+        return value
+
+    def prepare(self, plan: TrainingPlan) -> None:
+        """
+        Calcule à l'avance les textes de toutes les séances d'un plan
+
+        Args:
+            plan: Plan d'entraînement
+        """
+        for session in plan.sessions.values():
+            self.date_label(session.session_date)
+            self.duration(session.total_duration)
+            self.duration(session.total_duration, "hms")
+            for block in session.blocks:
+                self.pace(block.pace)
+
+    def type_name(self, session_type: SessionType) -> str:
+        """Nom traduit d'un type de séance"""
+        return self._type_names.get(session_type.value, session_type.value)
+
+    def day_name(self, day: date) -> str:
+        """Nom traduit du jour de la semaine"""
+        return self._day_names.get(day.weekday()) or day.strftime("%A")
+
+    def date_label(self, day: date) -> str:
+        """Date formatée sans le nom du jour (ex: 12 janvier 2025)"""
+        return self._memo("date", day, lambda: format_date(day, self.lang, False))
+
+    def duration(self, value: timedelta, style: str = "hms_text") -> str:
+        """Durée formatée (voir format_timedelta)"""
+        return self._memo(style, value, lambda: format_timedelta(value, style))
+
+    def pace(self, value: timedelta) -> str:
+        """Allure formatée (ex: 05:10/km)"""
+        return self._memo("pace", value, lambda: format_pace(value))
 
 
 class ExportService:
     """Service d'exportation du plan d'entraînement"""
 
-    def export_to_ics(self, plan: TrainingPlan, lang: str = "fr", options: dict = None) -> bytes:
+    def __init__(self, cache: Optional[ExportCache] = export_cache, owner: Optional[str] = None):
+        """
+        Initialise le service
+
+        Args:
+            cache: Cache des exports PDF, ICS et TCX en mémoire (cache partagé
+                   par défaut, None pour le désactiver)
+            owner: Propriétaire des plans exportés (une session de
+                   l'application): les exports des versions précédentes de
+                   son plan sont retirés du cache (voir ExportCache)
+        """
+        self.cache = cache
+        self.owner = owner
+
+    def _cached(self, plan: TrainingPlan, export_format: str, lang: str, options: Optional[dict],
+                export: Callable[[], bytes]) -> bytes:
+        """
+        Renvoie un export depuis le cache, ou le produit puis le met en cache
+
+        Args:
+            plan: Plan d'entraînement exporté
+            export_format: Format d'export
+            lang: Code de langue
+            options: Options d'export (complètes)
+            export: Fonction d'export appelée en cas d'absence
+
+        Returns:
+            Contenu exporté
+        """
+        if self.cache is None:
+            return export()
+        return self.cache.get_or_export(plan.fingerprint(), export_format, lang, options, export, self.owner)
+
+    def export_to_ics(self, plan: TrainingPlan, lang: str = "fr", options: dict = None,
+                      target: Optional[BinaryIO] = None, sequences: Optional[Dict[date, int]] = None,
+                      texts: Optional[SessionTexts] = None) -> Optional[bytes]:
         """
         Exporte le plan d'entraînement au format ICS (calendrier)
 
+        Les événements sont écrits directement au format iCalendar, dans
+        l'ordre des dates. Leurs UID sont dérivés du plan et de la date de la
+        séance: réimporter un plan ajusté met à jour les événements existants
+        au lieu de les dupliquer. Le DTSTAMP des événements est l'heure de
+        l'appel, y compris lorsque le calendrier provient du cache.
+
         Args:
             plan: Plan d'entraînement à exporter
             lang: Code de langue
@@ -39,113 +246,196 @@ class ExportService:
                 - reminder_time: Minutes avant la séance pour le rappel (int)
                 - start_time: Heure de début par défaut (int)
                 - ics_calendar_name: Nom du calendrier (str)
+                - plan_id: Identifiant du plan dans les UID (str, par défaut
+                  dérivé de la date de début et de la course principale)
+            target: Fichier ouvert en écriture binaire (None = en mémoire)
+            sequences: Numéro de révision (SEQUENCE) de l'événement de chaque
+                       date, pour un calendrier déjà publié (voir IcsFeed)
+            texts: Textes des séances partagés avec d'autres exports
 
         Returns:
-            Contenu du fichier ICS en bytes
+            Contenu du fichier ICS en bytes si target est None, None sinon
         """
-        # Valeurs par défaut des options
-        default_options = {
-            "include_rest_days": False,
-            "reminder_time": 30,
-            "start_time": 18,
-            "ics_calendar_name": "Training Plan"
-        }
-        
-        # Fusionner avec les options fournies
-        if options is None:
-            options = {}
-        
-        for key, default_value in default_options.items():
-            if key not in options:
-                options[key] = default_value
+        options = ics_options(options)
+        dtstamp = format_datetime_utc(datetime.utcnow())
+        if target is None and sequences is None:
+            # Le cache conserve le calendrier sans horodatage réel
+            content = self._cached(plan, "ics", lang, options,
+                                   lambda: self._write_ics(plan, lang, options, io.BytesIO(), {}, texts,
+                                                           ICS_DTSTAMP_PLACEHOLDER).getvalue())
+            return content.replace(f"DTSTAMP:{ICS_DTSTAMP_PLACEHOLDER}".encode("ascii"),
+                                   f"DTSTAMP:{dtstamp}".encode("ascii"))
+
+        sink = self._write_ics(plan, lang, options, io.BytesIO() if target is None else target, sequences, texts,
+                               dtstamp)
+        return sink.getvalue() if target is None else None
+
+    def _write_ics(self, plan: TrainingPlan, lang: str, options: dict, sink: BinaryIO,
+                   sequences: Optional[Dict[date, int]], texts: Optional[SessionTexts],
+                   dtstamp: str) -> BinaryIO:
+        """
+        Écrit le calendrier complet d'un plan (voir export_to_ics)
+
+        Returns:
+            Destination sink
+        """
+        writer = IcsWriter(sink)
+
+        self._begin_ics_calendar(writer, options)
 
-        # Créer un nouveau calendrier avec les métadonnées requises
-        calendar = Calendar()
-        calendar.scale = 'GREGORIAN'
-        calendar.method = 'PUBLISH'
-        calendar.name = options["ics_calendar_name"]
-        calendar.creator = 'All-in-Run Training Plan Generator'
+        plan_id = options["plan_id"] or ics_plan_id(plan)
+        texts = texts or SessionTexts(lang)
+        sequences = sequences or {}
 
         # Ajouter chaque séance comme un événement du calendrier
-        for session_date, session in plan.sessions.items():
+        for session_date, session in sorted(plan.sessions.items()):
             if session.session_type == SessionType.REST and not options["include_rest_days"]:
                 # Ignorer les jours de repos si l'option est désactivée
                 continue
 
-            # Créer un événement pour la séance
-            event = Event()
-
-            # ID unique - crucial pour iOS
-            event.uid = str(uuid.uuid4())
+            self._write_ics_event(writer, session, ics_uid(plan_id, session_date), dtstamp, options,
+                                  texts, sequences.get(session_date, 0))
 
-            # Déterminer le titre de l'événement
-            session_type_name = SESSION_TYPE_TRANSLATIONS.get(lang, {}).get(
-                session.session_type.value,
-                session.session_type.value
-            )
+        writer.end("VCALENDAR")
+        writer.flush()
 
-            event.name = f"🏃 {session_type_name}"
+        return sink
 
-            # Description détaillée
-            description = []
-            description.append(session.description)
-            description.append("")
-
-            if session.session_type != SessionType.REST:
-                description.append(f"Distance: {session.total_distance} km")
-                description.append(f"Durée estimée: {format_timedelta(session.total_duration, 'hms_text')}")
-
-            # Ajouter les détails des blocs (si présents)
-            if session.blocks:
-                description.append("")
-                description.append("Détail de la séance:")
-                for i, block in enumerate(session.blocks, 1):
-                    description.append(f"- Bloc {i}: {block.distance} km @ {format_pace(block.pace)} ({block.description})")
-
-            event.description = "\n".join(description)
-
-            # Date et heure (utiliser l'heure de début définie dans les options)
-            start_time = datetime.combine(session_date, datetime.min.time().replace(hour=options["start_time"]))
-
-            # La durée de l'événement doit être un timedelta pour ics
-            duration = timedelta(minutes=max(30, int(session.total_duration.total_seconds() / 60)))
-
-            event.begin = start_time
-            event.duration = duration
-
-            # Ajouter une alarme (rappel) avec le temps défini dans les options
-            reminder_time = options["reminder_time"]
-            alarm = DisplayAlarm(trigger=timedelta(minutes=-reminder_time))
-            event.alarms.append(alarm)
+    def export_ics_delta(self, previous: Optional[TrainingPlan], plan: TrainingPlan, lang: str = "fr",
+                         options: dict = None, sequences: Optional[Dict[date, int]] = None,
+                         weeks: Optional[Iterable[int]] = None, texts: Optional[SessionTexts] = None) -> bytes:
+        """
+        Exporte uniquement les événements ICS qui diffèrent entre deux états d'un plan
 
-            # Catégorie pour faciliter le filtrage
-            event.categories = ['Training', 'Running']
+        Le résultat contient un calendrier METHOD:PUBLISH avec les événements
+        nouveaux ou modifiés et/ou un calendrier METHOD:CANCEL avec les
+        événements supprimés (séance retirée, ou devenue un jour de
+        repos non exporté). Les UID sont ceux de export_to_ics: un calendrier
+        qui a importé l'état précédent met à jour ses événements.
 
-            # Emplacement (optionnel, mais peut améliorer l'expérience)
-            event.location = "Course à pied"
+        Args:
+            previous: Plan exporté précédemment (None = aucun, tout est nouveau)
+            plan: Plan à exporter
+            lang: Code de langue
+            options: Options d'export (voir export_to_ics)
+            sequences: Numéro de révision (SEQUENCE) de l'événement de chaque date
+            weeks: Semaines du plan à exporter (None = toutes)
+            texts: Textes des séances partagés avec d'autres exports
 
-            # Ajouter l'événement au calendrier
-            calendar.events.add(event)
+        Returns:
+            Contenu ICS en bytes
+        """
+        options = ics_options(options)
+        sequences = sequences or {}
+
+        dates = None
+        if weeks is not None:
+            dates = set()
+            for week in weeks:
+                week_start, _ = plan.get_week_dates(week)
+                dates.update(week_start + timedelta(days=day) for day in range(7))
+
+        published, cancelled = ics_changes(previous, plan, options["include_rest_days"], dates)
+
+        plan_id = options["plan_id"] or ics_plan_id(plan)
+        dtstamp = format_datetime_utc(datetime.utcnow())
+        texts = texts or SessionTexts(lang)
+
+        sink = io.BytesIO()
+        writer = IcsWriter(sink)
+
+        if published or not cancelled:
+            self._begin_ics_calendar(writer, options)
+            for session_date, session in sorted(published.items()):
+                self._write_ics_event(writer, session, ics_uid(plan_id, session_date), dtstamp, options,
+                                      texts, sequences.get(session_date, 0))
+            writer.end("VCALENDAR")
+
+        if cancelled:
+            self._begin_ics_calendar(writer, options, method="CANCEL")
+            for session_date, session in sorted(cancelled.items()):
+                self._write_ics_event(writer, session, ics_uid(plan_id, session_date), dtstamp, options,
+                                      texts, sequences.get(session_date, 0), status="CANCELLED")
+            writer.end("VCALENDAR")
+
+        writer.flush()
+        return sink.getvalue()
+
+    @staticmethod
+    def _begin_ics_calendar(writer: IcsWriter, options: dict, method: str = "PUBLISH") -> None:
+        """Écrit l'en-tête du calendrier et ses propriétés X-WR"""
+        writer.begin("VCALENDAR")
+        writer.property("VERSION", "2.0")
+        writer.text("PRODID", "All-in-Run Training Plan Generator")
+        writer.property("CALSCALE", "GREGORIAN")
+        writer.property("METHOD", method)
+        writer.text("X-WR-CALNAME", options["ics_calendar_name"])
+        writer.text("X-WR-CALDESC", "Plan d'entraînement running généré par All-in-Run")
+        writer.property("X-WR-TIMEZONE", "Europe/Paris")
+
+    @staticmethod
+    def _write_ics_event(writer: IcsWriter, session: Session, uid: str, dtstamp: str, options: dict,
+                         texts: SessionTexts, sequence: int = 0, status: Optional[str] = None) -> None:
+        """
+        Écrit l'événement (VEVENT) d'une séance
 
-        # Convertir le calendrier en chaîne ICS
+        Args:
+            writer: Écriture iCalendar
+            session: Séance
+            uid: UID de l'événement
+            dtstamp: Horodatage de l'export (format DATE-TIME UTC)
+            options: Options d'export complètes (voir ics_options)
+            texts: Textes des séances
+            sequence: Numéro de révision de l'événement
+            status: Statut de l'événement (ex: CANCELLED), omis si None
+        """
+        summary = f"🏃 {texts.type_name(session.session_type)}"
 
-        # Ajouter les propriétés spéciales X- au calendrier
-        calendar.extra.append(
-            ContentLine(name="X-WR-CALNAME", value=options['ics_calendar_name'])
-        )
-        calendar.extra.append(
-            ContentLine(name="X-WR-CALDESC", value="Plan d'entraînement running généré par All-in-Run")
-        )
-        calendar.extra.append(
-            ContentLine(name="X-WR-TIMEZONE", value="Europe/Paris")
-        )
-        
-        ics_content = calendar.serialize()
+        # Description détaillée
+        description = [session.description, ""]
 
-        # Convertir en bytes avec l'encodage UTF-8 explicite
-        return ics_content.encode("utf-8")
+        if session.session_type != SessionType.REST:
+            description.append(f"Distance: {session.total_distance} km")
+            description.append(f"Durée estimée: {texts.duration(session.total_duration)}")
 
-    def export_to_pdf(self, plan: TrainingPlan, lang: str = "fr", options: dict = None) -> bytes:
+        # Ajouter les détails des blocs (si présents)
+        if session.blocks:
+            description.append("")
+            description.append("Détail de la séance:")
+            for i, block in enumerate(session.blocks, 1):
+                description.append(f"- Bloc {i}: {block.distance} km @ {texts.pace(block.pace)} ({block.description})")
+
+        # Date et heure (utiliser l'heure de début définie dans les options)
+        start_time = datetime.combine(session.session_date, datetime.min.time().replace(hour=options["start_time"]))
+        duration = timedelta(minutes=max(30, int(session.total_duration.total_seconds() / 60)))
+
+        writer.begin("VEVENT")
+        writer.text("UID", uid)
+        writer.property("DTSTAMP", dtstamp)
+        writer.property("DTSTART", format_datetime_utc(start_time))
+        writer.property("DURATION", format_duration(duration))
+        if sequence:
+            writer.property("SEQUENCE", str(sequence))
+        if status is not None:
+            writer.property("STATUS", status)
+        writer.text("SUMMARY", summary)
+        writer.text("DESCRIPTION", "\n".join(description))
+        # Catégorie pour faciliter le filtrage
+        writer.property("CATEGORIES", "Training,Running")
+        # Emplacement (optionnel, mais peut améliorer l'expérience)
+        writer.text("LOCATION", "Course à pied")
+
+        # Ajouter une alarme (rappel) avec le temps défini dans les options
+        writer.begin("VALARM")
+        writer.property("ACTION", "DISPLAY")
+        writer.text("DESCRIPTION", summary)
+        writer.property("TRIGGER", format_duration(timedelta(minutes=-options["reminder_time"])))
+        writer.end("VALARM")
+
+        writer.end("VEVENT")
+
+    def export_to_pdf(self, plan: TrainingPlan, lang: str = "fr", options: dict = None,
+                      texts: Optional[SessionTexts] = None) -> bytes:
         """
         Exporte le plan d'entraînement au format PDF
 
@@ -157,10 +447,20 @@ class ExportService:
                 - include_details: Inclure les détails (bool)
                 - paper_size: Taille du papier (str: "A4", "Letter", "Legal")
                 - orientation: Orientation (str: "portrait", "landscape")
+            texts: Textes des séances partagés avec d'autres exports
 
         Returns:
             Contenu du fichier PDF en bytes
         """
+        options = dict(options or {})
+        return self._cached(plan, "pdf", lang, options,
+                            lambda: self._write_pdf(plan, lang, dict(options), texts))
+
+    def _write_pdf(self, plan: TrainingPlan, lang: str, options: dict,
+                   texts: Optional[SessionTexts]) -> bytes:
+        """Produit le document PDF d'un plan (voir export_to_pdf)"""
+        texts = texts or SessionTexts(lang)
+
         # Valeurs par défaut des options
         default_options = {
             "include_charts": True,
@@ -299,7 +599,7 @@ class ExportService:
                 )
 
                 # Titre de la semaine avec la phase
-                week_title = f"Semaine {week_num + 1} - {phase_name}: {format_date(week_start, lang, False)} - {format_date(week_end, lang, False)}"
+                week_title = f"Semaine {week_num + 1} - {phase_name}: {texts.date_label(week_start)} - {texts.date_label(week_end)}"
                 content.append(Paragraph(week_title, heading3_style))
 
                 # Informations sur la semaine
@@ -337,18 +637,8 @@ class ExportService:
                 )
 
                 for session in week_sessions:
-                    day_name = DAYS_TRANSLATIONS.get(lang, {}).get(
-                        session.session_date.weekday(),
-                        session.session_date.strftime("%A")
-                    )
-
-                    session_type_name = SESSION_TYPE_TRANSLATIONS.get(lang, {}).get(
-                        session.session_type.value,
-                        session.session_type.value
-                    )
-
                     # Préfixer avec le jour de la semaine
-                    full_type_name = f"{day_name}: {session_type_name}"
+                    full_type_name = f"{texts.day_name(session.session_date)}: {texts.type_name(session.session_type)}"
 
                     if session.session_type == SessionType.REST:
                         sessions_info.append([
@@ -362,7 +652,7 @@ class ExportService:
                         sessions_info.append([
                             Paragraph(full_type_name, normal_style),
                             Paragraph(f"{session.total_distance} km", normal_style),
-                            Paragraph(format_timedelta(session.total_duration, 'hms'), normal_style),
+                            Paragraph(texts.duration(session.total_duration, 'hms'), normal_style),
                             Paragraph(session.description, normal_style)
                         ])
 
@@ -398,139 +688,218 @@ class ExportService:
         """
         return plan.to_json()
 
-    def export_to_tcx(self, plan: TrainingPlan, lang: str = "fr") -> bytes:
+    def export_to_bundle(self, plans: Iterable[TrainingPlan],
+                         target: Optional[Union[str, BinaryIO]] = None) -> Optional[bytes]:
+        """
+        Exporte plusieurs plans dans une archive compressée (voir utils.plan_bundle)
+
+        Les plans sont écrits au fur et à mesure de l'itération: un générateur
+        permet d'exporter un grand nombre de plans sans les garder en mémoire.
+
+        Args:
+            plans: Plans d'entraînement à exporter
+            target: Chemin ou fichier ouvert en écriture binaire (None = en mémoire)
+
+        Returns:
+            Contenu de l'archive si target est None, None sinon
+        """
+        buffer = io.BytesIO() if target is None else None
+
+        with PlanBundleWriter(buffer if target is None else target) as writer:
+            for plan in plans:
+                writer.add(plan)
+
+        return buffer.getvalue() if buffer is not None else None
+
+    def export_to_tcx(self, plan: TrainingPlan, lang: str = "fr", target: Optional[BinaryIO] = None,
+                      texts: Optional[SessionTexts] = None) -> Optional[bytes]:
         """
         Exporte le plan d'entraînement au format TCX pour montres Garmin
 
+        Le document est écrit en flux, séance par séance, sans construire
+        d'arbre XML.
+
         Args:
             plan: Plan d'entraînement à exporter
             lang: Code de langue
+            target: Fichier ouvert en écriture binaire (None = en mémoire)
+            texts: Textes des séances partagés avec d'autres exports
 
         Returns:
-            Contenu du fichier TCX en bytes
+            Contenu du fichier TCX en bytes si target est None, None sinon
         """
+        if target is None:
+            return self._cached(plan, "tcx", lang, None, lambda: b"".join(self.iter_tcx(plan, lang, texts=texts)))
 
+        for _ in self._write_tcx(plan, texts or SessionTexts(lang), XmlWriter(target)):
+            pass
 
-        # Créer la structure XML de base
-        root = ET.Element("TrainingCenterDatabase")
-        root.set("xmlns", "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2")
-        root.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-        root.set("xsi:schemaLocation", "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2 http://www.garmin.com/xmlschemas/TrainingCenterDatabasev2.xsd")
+        return None
 
-        # Ajouter l'élément Workouts
-        workouts = ET.SubElement(root, "Workouts")
+    def iter_tcx(self, plan: TrainingPlan, lang: str = "fr", chunk_size: int = TCX_CHUNK_SIZE,
+                 texts: Optional[SessionTexts] = None) -> Iterator[bytes]:
+        """
+        Exporte le plan au format TCX par morceaux (téléchargement HTTP en
+        transfert par blocs)
 
-        # Traiter chaque séance comme un workout séparé
-        for session_date, session in plan.sessions.items():
-            if session.session_type == SessionType.REST:
-                # Ignorer les jours de repos
-                continue
+        Args:
+            plan: Plan d'entraînement à exporter
+            lang: Code de langue
+            chunk_size: Taille minimale d'un morceau en octets (sauf le dernier)
+            texts: Textes des séances partagés avec d'autres exports
 
-            # Créer l'entraînement
-            workout = ET.SubElement(workouts, "Workout")
-            workout.set("Sport", "Running")
+        Yields:
+            Morceaux successifs du fichier TCX
+        """
+        buffer = io.BytesIO()
 
-            # Nom de la séance
-            session_type_name = SESSION_TYPE_TRANSLATIONS.get(lang, {}).get(
-                session.session_type.value,
-                session.session_type.value
-            )
+        for _ in self._write_tcx(plan, texts or SessionTexts(lang), XmlWriter(buffer)):
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
 
-            name = ET.SubElement(workout, "Name")
-            name.text = f"{format_date(session_date, lang, False)} - {session_type_name}"
+        if buffer.tell():
+            yield buffer.getvalue()
 
-            # Optionnel: ajouter les notes/description
-            notes = ET.SubElement(workout, "Notes")
-            notes.text = session.description
+    def export_all(self, plan: TrainingPlan, formats: Iterable[str] = EXPORT_FORMATS, lang: str = "fr",
+                   options: Optional[Dict[str, dict]] = None,
+                   max_workers: Optional[int] = None) -> Dict[str, bytes]:
+        """
+        Exporte le plan dans plusieurs formats en parallèle
 
-            # Créer les étapes de l'entraînement
-            step_id = 1
+        Les textes des séances (noms traduits, dates, durées, allures) sont
+        calculés une seule fois puis partagés par tous les formats; chaque
+        format est ensuite écrit dans son propre thread.
 
-            # Si la séance a des blocs, les utiliser, sinon créer un bloc unique
-            if session.blocks:
-                for block in session.blocks:
-                    # Créer un bloc d'entraînement
-                    step = ET.SubElement(workout, "Step")
-                    step.set("xsi:type", "Step_t")
+        Args:
+            plan: Plan d'entraînement à exporter
+            formats: Formats à produire, parmi EXPORT_FORMATS
+            lang: Code de langue
+            options: Options de chaque format (ex: {"ics": {...}, "pdf": {...}})
+            max_workers: Nombre maximal de threads (None = un par format)
 
-                    # ID de l'étape
-                    id_elem = ET.SubElement(step, "StepId")
-                    id_elem.text = str(step_id)
-                    step_id += 1
+        Returns:
+            Contenu de chaque format en bytes, dans l'ordre demandé
 
-                    # Nom de l'étape
-                    name = ET.SubElement(step, "Name")
-                    name.text = block.description
+        Raises:
+            ValueError: Si un format n'est pas supporté
+        """
+        formats = list(dict.fromkeys(formats))
+        unsupported = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+        if unsupported:
+            raise ValueError(f"Format d'export non supporté: {', '.join(unsupported)}")
+        options = options or {}
+
+        # Textes calculés dans le thread appelant: les séances d'un plan chargé à
+        # la demande (LazyTrainingPlan) le sont aussi, avant la répartition
+        texts = SessionTexts(lang)
+        texts.prepare(plan)
+
+        writers = {
+            "ics": lambda: self.export_to_ics(plan, lang, options.get("ics"), texts=texts),
+            "tcx": lambda: self.export_to_tcx(plan, lang, texts=texts),
+            "pdf": lambda: self.export_to_pdf(plan, lang, options.get("pdf"), texts=texts),
+            "json": lambda: self.export_to_json(plan).encode("utf-8"),
+        }
 
-                    # Durée de l'étape (en distance)
-                    duration = ET.SubElement(step, "Duration")
-                    duration.set("xsi:type", "Distance_t")
+        if len(formats) <= 1:
+            return {export_format: writers[export_format]() for export_format in formats}
 
-                    meters = ET.SubElement(duration, "Meters")
-                    meters.text = str(int(block.distance * 1000))
+        with ThreadPoolExecutor(max_workers=max_workers or len(formats),
+                                thread_name_prefix="export") as executor:
+            futures = {export_format: executor.submit(writers[export_format]) for export_format in formats}
+            return {export_format: future.result() for export_format, future in futures.items()}
 
-                    # Intensité (Active ou Rest)
-                    intensity = ET.SubElement(step, "Intensity")
-                    intensity.text = "Active"
+    def _write_tcx(self, plan: TrainingPlan, texts: SessionTexts, writer: XmlWriter) -> Iterator[None]:
+        """
+        Écrit le document TCX
 
-                    # Allure cible
-                    target = ET.SubElement(step, "Target")
-                    target.set("xsi:type", "Speed_t")
+        Le contenu est transmis à la destination après chaque séance, où la
+        main est rendue à l'appelant.
 
-                    speed_zone = ET.SubElement(target, "SpeedZone")
+        Args:
+            plan: Plan d'entraînement à exporter
+            texts: Textes des séances
+            writer: Écriture XML vers la destination
+        """
+        # Créer la structure XML de base
+        writer.start("TrainingCenterDatabase", [
+            ("xmlns", "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"),
+            ("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance"),
+            ("xsi:schemaLocation", "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2 http://www.garmin.com/xmlschemas/TrainingCenterDatabasev2.xsd")
+        ])
 
-                    # Convertir l'allure (min/km) en vitesse (m/s)
-                    pace_seconds = block.pace.total_seconds()
-                    speed_mps = 1000 / pace_seconds  # mètres par seconde
+        # Ajouter l'élément Workouts
+        writer.start("Workouts")
 
-                    # Créer une plage d'allures (+/- 5%)
-                    low = ET.SubElement(speed_zone, "LowInMetersPerSecond")
-                    low.text = f"{speed_mps * 0.95:.2f}"
+        # Pour une séance sans blocs, l'allure marathon sert de référence (+/- 5%)
+        avg_speed = 1000 / plan.user_data.pace_marathon.total_seconds()
+        default_zone = (f"{avg_speed * 0.95:.2f}", f"{avg_speed * 1.05:.2f}")
 
-                    high = ET.SubElement(speed_zone, "HighInMetersPerSecond")
-                    high.text = f"{speed_mps * 1.05:.2f}"
-            else:
-                # Si pas de blocs, créer une étape unique pour la session complète
-                step = ET.SubElement(workout, "Step")
-                step.set("xsi:type", "Step_t")
+        # Traiter chaque séance comme un workout séparé
+        for session_date, session in plan.sessions.items():
+            if session.session_type == SessionType.REST:
+                # Ignorer les jours de repos
+                continue
 
-                id_elem = ET.SubElement(step, "StepId")
-                id_elem.text = "1"
+            writer.start("Workout", [("Sport", "Running")])
 
-                name = ET.SubElement(step, "Name")
-                name.text = session_type_name
+            # Nom de la séance
+            session_type_name = texts.type_name(session.session_type)
+            writer.element("Name", f"{texts.date_label(session_date)} - {session_type_name}")
 
-                duration = ET.SubElement(step, "Duration")
-                duration.set("xsi:type", "Distance_t")
+            # Optionnel: ajouter les notes/description
+            writer.element("Notes", session.description)
 
-                meters = ET.SubElement(duration, "Meters")
-                meters.text = str(int(session.total_distance * 1000))
+            # Si la séance a des blocs, une étape par bloc, sinon une étape unique
+            if session.blocks:
+                for step_id, block in enumerate(session.blocks, 1):
+                    # Convertir l'allure (min/km) en vitesse (m/s)
+                    speed_mps = 1000 / block.pace.total_seconds()
+                    self._write_tcx_step(writer, step_id, block.description, block.distance,
+                                         (f"{speed_mps * 0.95:.2f}", f"{speed_mps * 1.05:.2f}"))
+            else:
+                self._write_tcx_step(writer, 1, session_type_name, session.total_distance, default_zone)
 
-                intensity = ET.SubElement(step, "Intensity")
-                intensity.text = "Active"
+            # Élément ScheduledOn obligatoire - date de la séance
+            writer.element("ScheduledOn", session_date.strftime("%Y-%m-%d"))
+            writer.end()
 
-                # Pour une séance simple, utiliser l'allure EF comme référence
-                target = ET.SubElement(step, "Target")
-                target.set("xsi:type", "Speed_t")
+            writer.flush()
+            yield
 
-                speed_zone = ET.SubElement(target, "SpeedZone")
+        writer.close()
+        yield
 
-                # Estimer la vitesse moyenne
-                avg_speed = 1000 / plan.user_data.pace_marathon.total_seconds()
+    @staticmethod
+    def _write_tcx_step(writer: XmlWriter, step_id: int, name: str, distance: float,
+                        speed_zone: Tuple[str, str]) -> None:
+        """
+        Écrit une étape d'entraînement TCX (durée en distance, zone de vitesse cible)
 
-                low = ET.SubElement(speed_zone, "LowInMetersPerSecond")
-                low.text = f"{avg_speed * 0.95:.2f}"
+        Args:
+            writer: Écriture XML
+            step_id: Numéro de l'étape
+            name: Nom de l'étape
+            distance: Distance de l'étape en km
+            speed_zone: Vitesses basse et haute (m/s), déjà formatées
+        """
+        writer.start("Step", [("xsi:type", "Step_t")])
+        writer.element("StepId", str(step_id))
+        writer.element("Name", name)
 
-                high = ET.SubElement(speed_zone, "HighInMetersPerSecond")
-                high.text = f"{avg_speed * 1.05:.2f}"
+        writer.start("Duration", [("xsi:type", "Distance_t")])
+        writer.element("Meters", str(int(distance * 1000)))
+        writer.end()
 
-            # Élément ScheduledOn obligatoire - date de la séance
-            scheduled = ET.SubElement(workout, "ScheduledOn")
-            scheduled.text = session_date.strftime("%Y-%m-%d")
+        writer.element("Intensity", "Active")
 
-        # Convertir l'arbre ElementTree en chaîne XML bien formatée
-        rough_string = ET.tostring(root, 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ", encoding="utf-8")
+        writer.start("Target", [("xsi:type", "Speed_t")])
+        writer.start("SpeedZone")
+        writer.element("LowInMetersPerSecond", speed_zone[0])
+        writer.element("HighInMetersPerSecond", speed_zone[1])
+        writer.end()
+        writer.end()
 
-        return pretty_xml
\ No newline at end of file
+        writer.end()
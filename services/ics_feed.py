@@ -0,0 +1,261 @@
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from models.plan import TrainingPlan
+from models.plan_history import PlanHistory
+from .export_service import ExportService, ics_changes, ics_options, ics_plan_id
+
+# Chemin du flux servi par IcsFeed.serve
+FEED_PATH = "/plan.ics"
+
+
+class IcsFeed:
+    """
+    Flux ICS incrémental d'un plan d'entraînement
+
+    Chaque publication enregistre l'état exporté du plan comme une révision
+    (PlanHistory). Un client peut ensuite demander le calendrier complet ou
+    seulement les différences depuis la révision qu'il connaît.
+
+    Le numéro de révision (SEQUENCE) d'un événement est déduit de
+    l'historique: nombre de révisions qui ont modifié sa date, plus une
+    unité par changement des options d'export. Les numéros publiés par un
+    flux précédent pour les mêmes UID (base_sequences, par exemple relus
+    après un redémarrage) servent de plancher: un calendrier abonné ne voit
+    jamais un numéro redescendre.
+    """
+
+    def __init__(self, lang: str = "fr", options: Optional[dict] = None,
+                 export_service: Optional[ExportService] = None,
+                 base_sequences: Optional[Dict[date, int]] = None):
+        """
+        Initialise un flux vide
+
+        Args:
+            lang: Code de langue des événements
+            options: Options d'export ICS (voir ExportService.export_to_ics)
+            export_service: Service d'export utilisé (un nouveau par défaut)
+            base_sequences: Derniers numéros de révision publiés pour ces
+                            événements par un flux précédent
+        """
+        self.lang = lang
+        self.options = dict(options or {})
+        self.export_service = export_service or ExportService()
+        self.history = PlanHistory()
+        self.plan_id: Optional[str] = None
+        self._base_sequences = dict(base_sequences or {})
+        # Nombre de changements d'options et révision du dernier changement
+        self._options_changes = 0
+        self._options_revision: Optional[int] = None
+        self._lock = threading.RLock()
+
+    @property
+    def revision(self) -> Optional[int]:
+        """Dernière révision publiée (None si rien n'a été publié)"""
+        return self.history.head
+
+    @property
+    def sequences(self) -> Dict[date, int]:
+        """Numéro de révision (SEQUENCE) de l'événement de chaque date publiée"""
+        with self._lock:
+            sequences = {}
+            for session_date, changes in self.history.change_counts().items():
+                # Un événement repris d'un flux précédent a pu changer depuis: +1
+                base = self._base_sequences[session_date] + 1 if session_date in self._base_sequences else 0
+                sequences[session_date] = base + changes - 1 + self._options_changes
+            return sequences
+
+    def configure(self, lang: str, options: Optional[dict] = None) -> bool:
+        """
+        Change la langue ou les options d'export du flux
+
+        L'historique est conservé; tous les événements changent de contenu:
+        leur numéro de révision est incrémenté et une révision est ajoutée,
+        à partir de laquelle les différences sont à nouveau complètes.
+
+        Args:
+            lang: Code de langue des événements
+            options: Options d'export ICS
+
+        Returns:
+            True si la configuration a changé
+        """
+        options = dict(options or {})
+        with self._lock:
+            if lang == self.lang and options == self.options:
+                return False
+
+            self.lang = lang
+            self.options = options
+            if self.revision is not None:
+                self._options_changes += 1
+                self._options_revision = self.history.commit(self.history.checkout(self.revision),
+                                                             "Options d'export modifiées")
+            return True
+
+    def publish(self, plan: TrainingPlan, message: str = "") -> int:
+        """
+        Publie un nouvel état du plan
+
+        Aucune révision n'est créée si les événements exportés sont inchangés.
+
+        Args:
+            plan: Plan d'entraînement
+            message: Description de la révision
+
+        Returns:
+            Révision courante du flux
+        """
+        with self._lock:
+            options = ics_options(self.options)
+            previous = self.history.checkout(self.revision) if self.revision is not None else None
+            published, cancelled = ics_changes(previous, plan, options["include_rest_days"])
+            if previous is not None and not published and not cancelled:
+                return self.revision
+
+            self.plan_id = options["plan_id"] or ics_plan_id(plan)
+            return self.history.commit(plan, message)
+
+    def calendar(self) -> bytes:
+        """
+        Calendrier complet de la dernière révision
+
+        Returns:
+            Contenu ICS en bytes
+
+        Raises:
+            ValueError: Si rien n'a été publié
+        """
+        return self.render()[1]
+
+    def delta(self, since: Optional[int] = None, weeks: Optional[Iterable[int]] = None) -> bytes:
+        """
+        Événements modifiés, ajoutés ou annulés depuis une révision
+
+        Args:
+            since: Révision connue du client (None = aucune, tous les événements)
+            weeks: Semaines du plan à exporter (None = toutes)
+
+        Returns:
+            Contenu ICS en bytes (voir ExportService.export_ics_delta)
+
+        Raises:
+            ValueError: Si rien n'a été publié
+            IndexError: Si la révision since n'existe pas
+        """
+        return self.render(since, weeks, delta=True)[1]
+
+    def render(self, since: Optional[int] = None, weeks: Optional[Iterable[int]] = None,
+               delta: bool = False) -> Tuple[int, bytes]:
+        """
+        Calendrier complet ou différences, avec la révision qu'il représente
+
+        La révision et le contenu sont lus ensemble: une publication
+        concurrente ne peut pas s'intercaler entre les deux.
+
+        Args:
+            since: Révision connue du client (différences uniquement)
+            weeks: Semaines du plan à exporter (différences uniquement)
+            delta: Si False, renvoie le calendrier complet
+
+        Returns:
+            Révision courante et contenu ICS en bytes
+
+        Raises:
+            ValueError: Si rien n'a été publié
+            IndexError: Si la révision since n'existe pas
+        """
+        with self._lock:
+            if self.revision is None:
+                raise ValueError("Aucun plan publié dans le flux")
+            revision = self.revision
+            plan = self.history.checkout(revision)
+            sequences = self.sequences
+
+            if not delta:
+                return revision, self.export_service.export_to_ics(plan, self.lang, self.options,
+                                                                   sequences=sequences)
+
+            previous = self.history.checkout(since) if since is not None else None
+            if previous is not None and self._options_revision is not None and since < self._options_revision:
+                # Options modifiées depuis: tous les événements ont changé
+                previous = None
+            return revision, self.export_service.export_ics_delta(previous, plan, self.lang, self.options,
+                                                                  sequences, weeks)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+        """
+        Sert le flux en HTTP, dans un thread d'arrière-plan
+
+        GET /plan.ics renvoie le calendrier complet (à utiliser comme
+        abonnement); ?since=<révision> ne renvoie que les différences depuis
+        cette révision, et ?weeks=3,4 restreint la réponse à des semaines du
+        plan. La révision courante est indiquée par l'en-tête X-Feed-Revision
+        et sert d'ETag: un client à jour reçoit 304 sans contenu.
+
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute (0 = port libre choisi par le système)
+
+        Returns:
+            Serveur démarré (server.shutdown() pour l'arrêter)
+        """
+        server = ThreadingHTTPServer((host, port), _feed_handler(self))
+        thread = threading.Thread(target=server.serve_forever, name="ics-feed", daemon=True)
+        thread.start()
+        return server
+
+
+def _feed_handler(feed: IcsFeed) -> type:
+    """Crée le gestionnaire de requêtes HTTP d'un flux"""
+
+    class FeedRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            if url.path != FEED_PATH:
+                self.send_error(404)
+                return
+
+            query = parse_qs(url.query)
+            try:
+                since = int(query["since"][0]) if "since" in query else None
+                weeks = [int(week) for week in query["weeks"][0].split(",")] if "weeks" in query else None
+            except ValueError:
+                self.send_error(400, "Paramètre since ou weeks invalide")
+                return
+
+            revision = feed.revision
+            if revision is None:
+                self.send_error(404, "Aucun plan publié")
+                return
+
+            if self.headers.get("If-None-Match") == f'"{revision}-{url.query}"':
+                self.send_response(304)
+                self.send_header("ETag", f'"{revision}-{url.query}"')
+                self.end_headers()
+                return
+
+            try:
+                # Révision relue avec le contenu: une publication a pu avoir lieu entre-temps
+                revision, body = feed.render(since, weeks, delta=since is not None or weeks is not None)
+            except IndexError:
+                self.send_error(400, f"Révision inconnue: {since}")
+                return
+            etag = f'"{revision}-{url.query}"'
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/calendar; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("X-Feed-Revision", str(revision))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Pas de journalisation des requêtes sur la sortie d'erreur
+            pass
+
+    return FeedRequestHandler
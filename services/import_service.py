@@ -1,8 +1,74 @@
+import io
+import itertools
 import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
-from typing import Optional, Union, TextIO
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union, TextIO
 
 from models.plan import TrainingPlan
+from models.plan_binary import is_binary_plan
+from utils.plan_bundle import PlanBundleReader
+
+# Taille des blocs lus dans les fichiers importés en flux
+READ_CHUNK_SIZE = 64 * 1024
+
+# Taille maximale (caractères) d'un enregistrement d'un tableau JSON
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+# Erreurs levées par TrainingPlan.from_dict sur un enregistrement invalide
+RECORD_ERRORS = (KeyError, ValueError, TypeError, AttributeError)
+
+
+def _plan_from_record(record: Any) -> Tuple[Optional[TrainingPlan], Optional[str]]:
+    """
+    Convertit un enregistrement JSON en plan (exécutée dans les processus de travail)
+
+    Args:
+        record: Enregistrement décodé
+
+    Returns:
+        Tuple (plan, None) si l'enregistrement est valide, (None, message d'erreur) sinon
+    """
+    try:
+        return TrainingPlan.from_dict(record), None
+    except RECORD_ERRORS as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class PlanImport:
+    """
+    Flux de plans importés depuis un fichier multi-plans
+
+    Les plans sont produits au fur et à mesure de l'itération. Les
+    enregistrements invalides sont ignorés et consignés dans errors, sous la
+    forme {"record": numéro, "error": message}; le numéro est la ligne (JSON
+    lines) ou la position dans le tableau, à partir de 1.
+    """
+
+    def __init__(self, results: Iterator[Tuple[int, Optional[TrainingPlan], Optional[str]]]):
+        self._results = results
+        self.imported = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def __iter__(self) -> Iterator[TrainingPlan]:
+        for record, plan, error in self._results:
+            if error is not None:
+                self.errors.append({"record": record, "error": error})
+            else:
+                self.imported += 1
+                yield plan
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Bilan de l'import
+
+        Returns:
+            Dictionnaire avec le nombre de plans importés et d'enregistrements rejetés
+        """
+        return {"imported": self.imported, "failed": len(self.errors)}
 
 
 class ImportService:
@@ -27,6 +93,231 @@ class ImportService:
         # Créer le plan d'entraînement à partir du dictionnaire
         return TrainingPlan.from_dict(data)
 
+    def import_plan(self, plan_data: Union[bytes, str, BinaryIO, TextIO]) -> TrainingPlan:
+        """
+        Importe un plan d'entraînement au format JSON ou binaire
+
+        Le format est détecté d'après l'en-tête des données.
+
+        Args:
+            plan_data: Contenu du plan (octets ou chaîne) ou fichier ouvert en lecture
+
+        Returns:
+            Plan d'entraînement importé
+        """
+        if hasattr(plan_data, "read"):
+            plan_data = plan_data.read()
+
+        if isinstance(plan_data, (bytes, bytearray)):
+            if is_binary_plan(plan_data):
+                return TrainingPlan.from_bytes(plan_data)
+            plan_data = plan_data.decode("utf-8")
+
+        return self.import_from_json(plan_data)
+
+    def iter_plans_from_json(self, source: Union[str, TextIO, BinaryIO],
+                             workers: Optional[int] = None) -> PlanImport:
+        """
+        Importe en flux les plans d'un fichier JSON lines (un plan par ligne)
+        ou d'un tableau JSON de plans
+
+        Le fichier est lu par blocs: la mémoire utilisée ne dépend que de la
+        taille d'un enregistrement, pas du nombre de plans. Chaque plan est
+        validé à la conversion; un enregistrement invalide est signalé dans
+        PlanImport.errors sans interrompre l'import.
+
+        Args:
+            source: Chemin du fichier ou fichier ouvert en lecture (texte ou binaire)
+            workers: Nombre de processus pour la conversion des enregistrements
+                     (None = dans le processus courant)
+
+        Returns:
+            Flux des plans importés, avec les erreurs par enregistrement
+        """
+        records = self._iter_json_records(source)
+
+        if workers is None or workers == 1:
+            results = (
+                (index, *_plan_from_record(record)) if error is None else (index, None, error)
+                for index, record, error in records
+            )
+        else:
+            results = self._convert_in_pool(records, workers)
+
+        return PlanImport(results)
+
+    def iter_plans_from_bundle(self, source: Union[str, bytes, BinaryIO], trusted: bool = False) -> PlanImport:
+        """
+        Importe en flux les plans d'une archive compressée (voir utils.plan_bundle)
+
+        Les plans sont lus et décodés un à un; un plan corrompu est signalé
+        dans PlanImport.errors (numéro = position dans l'archive, à partir de 1)
+        sans interrompre l'import.
+
+        Args:
+            source: Chemin, contenu de l'archive ou fichier positionnable ouvert en lecture binaire
+            trusted: Chargement de confiance, pour les archives produites localement
+                     (voir TrainingPlan.from_bytes)
+
+        Returns:
+            Flux des plans importés, avec les erreurs par plan
+
+        Raises:
+            ValueError: Si les données ne sont pas une archive de plans valide
+        """
+        reader = PlanBundleReader(source)
+
+        def results() -> Iterator[Tuple[int, Optional[TrainingPlan], Optional[str]]]:
+            with reader:
+                for index in range(len(reader)):
+                    try:
+                        yield index + 1, reader.load(index, trusted=trusted), None
+                    except RECORD_ERRORS as e:
+                        yield index + 1, None, f"{type(e).__name__}: {e}"
+
+        return PlanImport(results())
+
+    def _iter_json_records(self, source: Union[str, TextIO, BinaryIO]) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """
+        Décode un à un les enregistrements d'un fichier JSON lines ou d'un tableau JSON
+
+        Args:
+            source: Chemin du fichier ou fichier ouvert en lecture
+
+        Yields:
+            Tuples (numéro d'enregistrement, enregistrement, message d'erreur de décodage)
+        """
+        if isinstance(source, str):
+            with open(source, 'r', encoding='utf-8') as f:
+                yield from self._iter_json_records(f)
+            return
+
+        if isinstance(source.read(0), bytes):
+            source = io.TextIOWrapper(source, encoding='utf-8')
+
+        # Le premier caractère significatif détermine le format
+        buffer = ""
+        while not buffer.strip():
+            chunk = source.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            buffer += chunk
+
+        content = buffer.lstrip()
+        if content.startswith("["):
+            yield from self._iter_json_array(source, content[1:])
+        else:
+            yield from self._iter_json_lines(source, buffer)
+
+    def _iter_json_lines(self, source: TextIO, buffer: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """Décode un fichier JSON lines (les lignes invalides sont signalées puis ignorées)"""
+        # Compléter la dernière ligne du bloc déjà lu, puis lire ligne à ligne
+        first_lines = (buffer + source.readline()).split("\n")
+        if not first_lines[-1]:
+            first_lines.pop()
+
+        for line_number, line in enumerate(itertools.chain(first_lines, source), 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"JSONDecodeError: {e}"
+
+    def _iter_json_array(self, source: TextIO, buffer: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """
+        Décode les éléments d'un tableau JSON au fur et à mesure de la lecture
+
+        Une erreur de syntaxe rendant la suite du tableau illisible est
+        signalée sur l'élément concerné et termine l'import.
+        """
+        decoder = json.JSONDecoder()
+        position = 0
+        index = 0
+        eof = False
+
+        while True:
+            # Passer les séparateurs entre éléments
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+
+            if position >= len(buffer):
+                if eof:
+                    index += 1
+                    yield index, None, "JSONDecodeError: fin de fichier avant la fin du tableau"
+                    return
+                buffer = source.read(READ_CHUNK_SIZE)
+                position = 0
+                eof = not buffer
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                # Enregistrement incomplet: lire la suite du fichier, au moins
+                # autant que ce qui est déjà en attente, pour que le nombre de
+                # décodages reste logarithmique en la taille de l'enregistrement
+                pending = len(buffer) - position
+                if not eof and pending < MAX_RECORD_SIZE:
+                    chunk = source.read(max(READ_CHUNK_SIZE, pending))
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+
+                index += 1
+                yield index, None, f"JSONDecodeError: {e}"
+                return
+
+            index += 1
+            yield index, record, None
+            buffer = buffer[end:]
+            position = 0
+
+    def _convert_in_pool(self, records: Iterator[Tuple[int, Any, Optional[str]]],
+                         workers: Optional[int]) -> Iterator[Tuple[int, Optional[TrainingPlan], Optional[str]]]:
+        """
+        Convertit les enregistrements en plans sur un pool de processus, dans l'ordre du fichier
+
+        Le nombre d'enregistrements en cours est borné pour conserver une
+        lecture en flux.
+
+        Args:
+            records: Enregistrements décodés
+            workers: Nombre de processus (None = nombre de CPU)
+
+        Yields:
+            Tuples (numéro d'enregistrement, plan, message d'erreur)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            max_pending = workers * 4
+            pending = deque()
+
+            for index, record, error in records:
+                if error is not None:
+                    pending.append((index, None, error))
+                else:
+                    pending.append((index, executor.submit(_plan_from_record, record), None))
+
+                while len(pending) > max_pending or (pending and pending[0][1] is None):
+                    yield self._pop_result(pending)
+
+            while pending:
+                yield self._pop_result(pending)
+
+    def _pop_result(self, pending: deque) -> Tuple[int, Optional[TrainingPlan], Optional[str]]:
+        """Attend et retourne le résultat le plus ancien"""
+        index, future, error = pending.popleft()
+        if future is None:
+            return index, None, error
+        return (index, *future.result())
+
     def adjust_plan_to_current_date(self, plan: TrainingPlan, current_date: Optional[date] = None) -> TrainingPlan:
         """
         Ajuste un plan d'entraînement à la date courante
@@ -0,0 +1,247 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from models.plan import TrainingPlan
+from models.user_data import UserData
+
+# Version des règles de génération: à incrémenter lorsque le résultat de
+# PlanGenerator change, afin d'invalider les plans mis en cache sur disque
+CACHE_VERSION = "3"
+
+
+class PlanCache:
+    """
+    Cache LRU des plans générés, indexé par l'empreinte des données utilisateur
+
+    Les plans sont conservés au format binaire (voir models.plan_binary) et
+    chaque lecture en décode une copie: un plan renvoyé peut être modifié
+    sans affecter le cache ni les autres sessions. Le cache est borné en
+    nombre d'entrées et en taille (octets du format binaire). Il peut être
+    adossé à un répertoire pour conserver les plans entre deux redémarrages
+    du serveur.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: Optional[str] = None):
+        """
+        Initialise le cache
+
+        Args:
+            max_entries: Nombre maximal de plans conservés en mémoire
+            max_bytes: Taille maximale (octets) des plans conservés en mémoire
+            cache_dir: Répertoire de persistance des plans (None = mémoire
+                       uniquement), créé à la première écriture
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(user_data: UserData) -> str:
+        """
+        Calcule la clé de cache associée à des données utilisateur
+
+        Args:
+            user_data: Données utilisateur
+
+        Returns:
+            Clé composée de la version du cache et de l'empreinte des données
+        """
+        return f"v{CACHE_VERSION}-{user_data.fingerprint()}"
+
+    def get(self, user_data: UserData) -> Optional[TrainingPlan]:
+        """
+        Récupère le plan associé à des données utilisateur
+
+        Args:
+            user_data: Données utilisateur
+
+        Returns:
+            Copie du plan en cache ou None si absent
+        """
+        key = self.make_key(user_data)
+
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if data is None:
+            data = self._load_from_disk(key)
+            if data is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+            self._store(key, data, persist=False)
+
+        try:
+            return TrainingPlan.from_bytes(data, trusted=True)
+        except ValueError as e:
+            print(f"Erreur lors du décodage du plan en cache {key}: {e}")
+            return None
+
+    def put(self, user_data: UserData, plan: TrainingPlan) -> None:
+        """
+        Ajoute un plan au cache
+
+        Args:
+            user_data: Données utilisateur ayant servi à générer le plan
+            plan: Plan généré (le cache en conserve une copie)
+        """
+        self._store(self.make_key(user_data), plan.to_bytes(), persist=True)
+
+    def get_or_generate(self, user_data: UserData,
+                        generate: Callable[[UserData], TrainingPlan]) -> TrainingPlan:
+        """
+        Récupère le plan en cache ou le génère puis le met en cache
+
+        Args:
+            user_data: Données utilisateur
+            generate: Fonction de génération appelée en cas d'absence
+
+        Returns:
+            Plan d'entraînement
+        """
+        plan = self.get(user_data)
+        if plan is None:
+            plan = generate(user_data)
+            self.put(user_data, plan)
+        return plan
+
+    def clear(self, include_disk: bool = False) -> None:
+        """
+        Vide le cache
+
+        Args:
+            include_disk: Si True, supprime également les plans persistés
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+        if include_disk and self.cache_dir and os.path.exists(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(".plan"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, filename))
+                    except OSError as e:
+                        print(f"Erreur lors de la suppression du plan en cache {filename}: {e}")
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques d'utilisation du cache
+
+        Returns:
+            Dictionnaire avec les succès, échecs, évictions, le taux de succès,
+            le nombre d'entrées et la taille occupée en mémoire
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size
+            }
+
+    def _store(self, key: str, data: bytes, persist: bool) -> None:
+        """
+        Insère un plan en mémoire (et sur disque si demandé) puis applique les limites
+
+        Args:
+            key: Clé de cache
+            data: Plan au format binaire
+            persist: Si True, écrit également le plan dans le répertoire du cache
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            # Un plan plus grand que le cache entier n'est conservé que sur disque
+            if len(data) <= self.max_bytes:
+                self._entries[key] = data
+                self._size += len(data)
+
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+        if persist:
+            self._save_to_disk(key, data)
+
+    def _save_to_disk(self, key: str, data: bytes) -> None:
+        """
+        Écrit un plan dans le répertoire du cache (écriture atomique)
+
+        Args:
+            key: Clé de cache
+            data: Plan au format binaire
+        """
+        if not self.cache_dir:
+            return
+
+        filepath = os.path.join(self.cache_dir, f"{key}.plan")
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, filepath)
+        except IOError as e:
+            print(f"Erreur lors de la mise en cache du plan: {e}")
+
+    def _load_from_disk(self, key: str) -> Optional[bytes]:
+        """
+        Charge un plan depuis le répertoire du cache
+
+        La somme de contrôle est vérifiée ici: les lectures suivantes, depuis
+        la mémoire, ne la recalculent pas.
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Plan au format binaire ou None s'il n'est pas persisté ou invalide
+        """
+        if not self.cache_dir:
+            return None
+
+        filepath = os.path.join(self.cache_dir, f"{key}.plan")
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            TrainingPlan.from_bytes(data, trusted=True)
+            return data
+        except (IOError, ValueError) as e:
+            print(f"Erreur lors du chargement du plan en cache {key}: {e}")
+            return None
+
+
+# Cache partagé par les générateurs de plans de l'application
+plan_cache = PlanCache()
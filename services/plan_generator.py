@@ -1,25 +1,108 @@
-from datetime import date
-from typing import Dict
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from models.plan import TrainingPlan
 from models.user_data import UserData
 from models.session import Session, TrainingPhase
 from .phase_calculator import PhaseCalculator
+from .plan_cache import PlanCache, plan_cache
 from .volume_calculator import VolumeCalculator
 from .session_distributor import SessionDistributor
 
+# Fin de l'itérable d'entrée de PlanGenerator._generate_in_pool
+_END = object()
+
+
+def _generate_plan_timed(user_data: UserData) -> Tuple[TrainingPlan, float]:
+    """
+    Génère un plan et mesure la durée de génération
+
+    Exécutée dans les processus de travail, sans cache: le plan passe par le
+    pipeline complet (PlanGenerator._build_plan). Le générateur aléatoire de
+    chaque semaine étant dérivé de ses paramètres et les séances étant rangées
+    par date, le résultat est identique à celui de
+    PlanGenerator().generate_plan(user_data).
+
+    Args:
+        user_data: Données utilisateur
+
+    Returns:
+        Tuple (plan généré, durée de génération en secondes)
+    """
+    started = time.perf_counter()
+    plan = PlanGenerator(cache=None).generate_plan(user_data)
+    return plan, time.perf_counter() - started
+
+
+class PlanBatch:
+    """
+    Flux de plans générés en lot, accompagné de statistiques de débit
+
+    Les plans sont produits au fur et à mesure de l'itération; les statistiques
+    reflètent les plans déjà produits et sont complètes une fois le flux épuisé.
+    """
+
+    def __init__(self, results: Iterator[Tuple[TrainingPlan, float]]):
+        self._results = results
+        self._latencies: List[float] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def __iter__(self) -> Iterator[TrainingPlan]:
+        self._started = time.perf_counter()
+        for plan, latency in self._results:
+            self._latencies.append(latency)
+            yield plan
+        self._finished = time.perf_counter()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques de débit de la génération
+
+        Returns:
+            Dictionnaire avec le nombre de plans, la durée écoulée (s), le débit
+            (plans/s) et les latences de génération p50/p95 (s)
+        """
+        count = len(self._latencies)
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+
+        return {
+            "plans": count,
+            "elapsed": elapsed,
+            "plans_per_second": count / elapsed if elapsed > 0 else 0.0,
+            "latency_p50": float(np.percentile(self._latencies, 50)) if count else 0.0,
+            "latency_p95": float(np.percentile(self._latencies, 95)) if count else 0.0
+        }
+
 
 class PlanGenerator:
     """Génère un plan d'entraînement complet"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[PlanCache] = plan_cache):
+        """
+        Initialise le générateur
+
+        Args:
+            cache: Cache des plans générés (cache partagé par défaut, None pour le désactiver)
+        """
         self.phase_calculator = PhaseCalculator()
         self.volume_calculator = VolumeCalculator()
-        self.session_distributor = SessionDistributor()
+        self.cache = cache
 
     def generate_plan(self, user_data: UserData) -> TrainingPlan:
         """
-        Génère un plan d'entraînement complet
+        Génère un plan d'entraînement complet, ou le récupère depuis le cache
+        si des données identiques ont déjà été traitées
 
         Args:
             user_data: Données utilisateur
@@ -27,36 +110,131 @@ class PlanGenerator:
         Returns:
             Plan d'entraînement complet
         """
-        # 1. Calculer les phases
-        phases = self.phase_calculator.calculate_phases(
-            user_data.start_date,
-            user_data.main_race.race_date
-        )
+        if self.cache is None:
+            return self._build_plan(user_data)
 
-        # 2. Calculer les volumes hebdomadaires
-        weekly_volumes = self.volume_calculator.calculate_volumes(
-            user_data.min_volume,
-            user_data.max_volume,
-            phases,
-            user_data.intermediate_races
+        return self.cache.get_or_generate(user_data, self._build_plan)
+
+    def regenerate_plan(self, previous_plan: TrainingPlan, user_data: UserData) -> TrainingPlan:
+        """
+        Régénère un plan après modification des données utilisateur en ne
+        recalculant que les étapes invalidées par la modification
+
+        Les phases sont reprises si les dates sont inchangées, les volumes si les
+        volumes et courses intermédiaires le sont, et seules les semaines dont les
+        paramètres ont changé sont redistribuées. Le résultat est identique à
+        celui de generate_plan(user_data).
+
+        Args:
+            previous_plan: Plan précédent, produit par ce générateur
+            user_data: Nouvelles données utilisateur
+
+        Returns:
+            Plan d'entraînement complet
+        """
+        if self.cache is None:
+            return self._build_plan(user_data, previous_plan)
+
+        return self.cache.get_or_generate(
+            user_data,
+            lambda data: self._build_plan(data, previous_plan)
         )
 
+    def _build_plan(self, user_data: UserData, previous_plan: Optional[TrainingPlan] = None) -> TrainingPlan:
+        """
+        Exécute le pipeline de génération, en réutilisant si possible les
+        résultats intermédiaires d'un plan précédent
+
+        Args:
+            user_data: Données utilisateur
+            previous_plan: Plan précédent dont les étapes inchangées sont reprises
+
+        Returns:
+            Plan d'entraînement complet
+        """
+        previous_data = previous_plan.user_data if previous_plan is not None else None
+
+        # 1. Calculer les phases (inchangées si les dates de début et de course le sont)
+        if (previous_data is not None
+                and previous_data.start_date == user_data.start_date
+                and previous_data.main_race.race_date == user_data.main_race.race_date):
+            phases = previous_plan.phase_schedule
+        else:
+            phases = self.phase_calculator.calculate_phases(
+                user_data.start_date,
+                user_data.main_race.race_date
+            )
+
+        # 2. Calculer les volumes hebdomadaires (inchangés si les phases, les bornes
+        # de volume et les semaines de course le sont)
+        if (previous_data is not None
+                and phases is previous_plan.phase_schedule
+                and previous_data.min_volume == user_data.min_volume
+                and previous_data.max_volume == user_data.max_volume
+                and self._race_weeks(previous_data) == self._race_weeks(user_data)):
+            weekly_volumes = dict(previous_plan.weekly_volumes)
+        else:
+            weekly_volumes = self.volume_calculator.calculate_volumes(
+                user_data.min_volume,
+                user_data.max_volume,
+                phases,
+                user_data.intermediate_races
+            )
+
         # 3. Calculer l'allure d'endurance fondamentale
         ef_pace = user_data.calculate_ef_pace()
 
-        # 4. Distribuer les séances
-        sessions = self.session_distributor.distribute_sessions(
+        # 4. Distribuer les séances, en ne redistribuant que les semaines modifiées
+        session_distributor = SessionDistributor()
+        week_contexts = session_distributor.get_week_contexts(
             user_data.start_date,
             phases,
             weekly_volumes,
-            user_data.sessions_per_week,
-            ef_pace,
-            user_data.specific_pace,
             user_data.intermediate_races
         )
 
+        previous_keys = {}
+        if previous_data is not None:
+            previous_contexts = session_distributor.get_week_contexts(
+                previous_data.start_date,
+                previous_plan.phase_schedule,
+                previous_plan.weekly_volumes,
+                previous_data.intermediate_races
+            )
+            previous_ef_pace = previous_data.calculate_ef_pace()
+            previous_keys = {
+                week_idx: session_distributor.get_week_key(
+                    week_idx, context, previous_data.sessions_per_week,
+                    previous_ef_pace, previous_data.specific_pace
+                )
+                for week_idx, context in previous_contexts.items()
+            }
+
+        sessions = {}
+        for week_idx, context in week_contexts.items():
+            week_key = session_distributor.get_week_key(
+                week_idx, context, user_data.sessions_per_week,
+                ef_pace, user_data.specific_pace
+            )
+            week_dates = [context["week_start"] + timedelta(days=i) for i in range(7)]
+
+            if (previous_keys.get(week_idx) == week_key
+                    and all(day in previous_plan.sessions for day in week_dates)):
+                # Semaine inchangée: reprendre les séances du plan précédent
+                sessions.update({day: previous_plan.sessions[day] for day in week_dates})
+            else:
+                sessions.update(session_distributor.distribute_week(
+                    week_idx, context, user_data.sessions_per_week,
+                    ef_pace, user_data.specific_pace
+                ))
+
         # 5. Ajouter la course principale
-        race_session = Session.create_race_session(
+        previous_race_session = None
+        if previous_data is not None and previous_data.main_race == user_data.main_race \
+                and previous_data.specific_pace == user_data.specific_pace:
+            previous_race_session = previous_plan.sessions.get(user_data.main_race.race_date)
+
+        race_session = previous_race_session or Session.create_race_session(
             session_date=user_data.main_race.race_date,
             phase=TrainingPhase.TAPER,
             race_distance=user_data.main_race.get_standard_distance,
@@ -66,16 +244,103 @@ class PlanGenerator:
 
         sessions[user_data.main_race.race_date] = race_session
 
-        # 6. Créer le plan complet
+        # 6. Créer le plan complet, séances dans l'ordre des dates: le plan (et
+        # son encodage binaire) ne dépend pas des semaines reprises
         plan = TrainingPlan(
             user_data=user_data,
-            sessions=sessions,
+            sessions=dict(sorted(sessions.items())),
             phase_dates=phases,
             weekly_volumes=weekly_volumes
         )
+        plan.recompute_aggregates()
 
         return plan
 
+    def _race_weeks(self, user_data: UserData) -> List[int]:
+        """
+        Liste les semaines (0-indexed) des courses intermédiaires
+
+        Args:
+            user_data: Données utilisateur
+
+        Returns:
+            Indices de semaine triés, une entrée par course
+        """
+        return sorted(
+            (race.race_date - user_data.start_date).days // 7
+            for race in user_data.intermediate_races
+        )
+
+    def generate_plans(self, users: Iterable[UserData], workers: Optional[int] = None,
+                       ordered: bool = True) -> PlanBatch:
+        """
+        Génère des plans d'entraînement pour plusieurs utilisateurs en parallèle
+
+        Chaque plan est généré dans un processus de travail par le pipeline
+        complet (voir _generate_plan_timed), ce qui rend le résultat identique
+        à la génération unitaire.
+
+        Args:
+            users: Données utilisateur (itérable, consommé au fur et à mesure)
+            workers: Nombre de processus (None = nombre de CPU, 1 = dans le processus courant)
+            ordered: Si True, les plans sont produits dans l'ordre d'entrée,
+                     sinon dans l'ordre de fin de génération
+
+        Returns:
+            Flux de plans avec statistiques de débit (plans/s, latences p50/p95)
+        """
+        if workers == 1:
+            return PlanBatch(_generate_plan_timed(user_data) for user_data in users)
+
+        return PlanBatch(self._generate_in_pool(users, workers, ordered))
+
+    def _generate_in_pool(self, users: Iterable[UserData], workers: Optional[int],
+                          ordered: bool) -> Iterator[Tuple[TrainingPlan, float]]:
+        """
+        Distribue la génération sur un pool de processus
+
+        Le nombre de plans en cours est borné pour que l'itérable d'entrée et
+        les résultats soient traités en flux.
+
+        Args:
+            users: Données utilisateur
+            workers: Nombre de processus (None = nombre de CPU)
+            ordered: Si True, respecter l'ordre d'entrée
+
+        Yields:
+            Tuples (plan généré, durée de génération en secondes)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            max_pending = workers * 4
+            users_iter = iter(users)
+            pending = deque()
+
+            def submit_next() -> bool:
+                user_data = next(users_iter, _END)
+                if user_data is _END:
+                    return False
+                pending.append(executor.submit(_generate_plan_timed, user_data))
+                return True
+
+            while len(pending) < max_pending and submit_next():
+                pass
+
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [future for future in pending if future in completed]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    submit_next()
+                    yield future.result()
+
     def adjust_plan(self, plan: TrainingPlan, current_date: date) -> TrainingPlan:
         """
         Ajuste un plan existant à la date courante
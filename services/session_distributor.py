@@ -1,8 +1,10 @@
 from datetime import date, timedelta
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Any, Dict, List, Mapping, Tuple, Optional, Set
+import hashlib
 import random
 
 from models.course import Course
+from models.phase_schedule import PhaseSchedule
 from models.session import Session, TrainingPhase
 from config.constants import (
     DEFAULT_LONG_RUN_DAY,
@@ -17,15 +19,23 @@ from config.constants import (
 class SessionDistributor:
     """Distribue les séances d'entraînement selon les règles définies"""
 
-    def __init__(self):
-        # Générer une seed pour les opérations aléatoires (pour reproductibilité)
-        self.random_seed = 42
-        random.seed(self.random_seed)
+    DEFAULT_SEED = 42
 
-        # Garder une trace des intervalles de seuil pour alterner
-        self._threshold_interval_idx = 0
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialise le distributeur
+
+        Chaque semaine est distribuée avec son propre générateur aléatoire, dont
+        la graine dérive de cette graine de base et des paramètres de la semaine:
+        une semaine ne dépend donc que de ses propres données (reproductibilité,
+        génération parallèle et régénération partielle).
 
-    def distribute_sessions(self, start_date: date, phases: Dict[TrainingPhase, List[date]],
+        Args:
+            seed: Graine de base (DEFAULT_SEED par défaut)
+        """
+        self.random_seed = self.DEFAULT_SEED if seed is None else seed
+
+    def distribute_sessions(self, start_date: date, phases: Mapping[TrainingPhase, List[date]],
                             weekly_volumes: Dict[int, float], sessions_per_week: int,
                             ef_pace: timedelta, specific_pace: timedelta,
                             intermediate_races: List[Course] = None) -> Dict[date, Session]:
@@ -34,7 +44,7 @@ class SessionDistributor:
 
         Args:
             start_date: Date de début du plan
-            phases: Dictionnaire des phases d'entraînement et leurs dates
+            phases: Planning des phases (ou dictionnaire des phases et leurs dates)
             weekly_volumes: Dictionnaire des volumes hebdomadaires
             sessions_per_week: Nombre de séances par semaine
             ef_pace: Allure d'endurance fondamentale
@@ -44,74 +54,138 @@ class SessionDistributor:
         Returns:
             Dictionnaire des séances indexées par date
         """
-        if intermediate_races is None:
-            intermediate_races = []
-
         # Initialiser le dictionnaire des séances
         sessions = {}
 
-        # Trouver la date de course principale (dernière journée du plan)
-        race_dates = [race.race_date for race in intermediate_races]
+        week_contexts = self.get_week_contexts(start_date, phases, weekly_volumes, intermediate_races)
+
+        # Traiter chaque semaine pour déterminer le placement des séances
+        for week_idx, context in week_contexts.items():
+            week_sessions = self.distribute_week(week_idx, context, sessions_per_week, ef_pace, specific_pace)
+
+            # Ajouter les séances au dictionnaire global
+            sessions.update(week_sessions)
+
+        return sessions
+
+    def get_week_contexts(self, start_date: date, phases: Mapping[TrainingPhase, List[date]],
+                          weekly_volumes: Dict[int, float],
+                          intermediate_races: List[Course] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Détermine les paramètres de distribution de chaque semaine
+
+        Args:
+            start_date: Date de début du plan
+            phases: Planning des phases (ou dictionnaire des phases et leurs dates)
+            weekly_volumes: Dictionnaire des volumes hebdomadaires
+            intermediate_races: Liste des courses intermédiaires
+
+        Returns:
+            Dictionnaire avec l'indice de semaine comme clé et ses paramètres
+            (début, phase, volume, course intermédiaire, course principale) comme valeur
+        """
+        if intermediate_races is None:
+            intermediate_races = []
 
         # Trouver la dernière date du plan
-        last_date = None
-        for phase_dates in phases.values():
-            if phase_dates:
-                if last_date is None or max(phase_dates) > last_date:
-                    last_date = max(phase_dates)
+        schedule = PhaseSchedule.from_date_lists(phases, start_date)
+        last_date = schedule.last_date
 
         # Si c'est la dernière semaine (semaine de la course), on doit s'assurer
         # qu'elle contient la course principale
         main_race_date = last_date
 
-        # Traiter chaque semaine pour déterminer le placement des séances
+        contexts = {}
         for week_idx, volume in weekly_volumes.items():
-            # Déterminer la phase de la semaine
             week_start = start_date + timedelta(days=week_idx * 7)
             week_end = week_start + timedelta(days=6)
-            week_dates = [week_start + timedelta(days=i) for i in range(7)]
 
             # Vérifier si cette semaine contient la course principale
-            is_main_race_week = any(d == main_race_date for d in week_dates)
-
-            # Déterminer la phase prédominante de la semaine
-            week_phase_counts = {phase: 0 for phase in TrainingPhase}
-            for day in week_dates:
-                for phase, phase_dates in phases.items():
-                    if day in phase_dates:
-                        week_phase_counts[phase] += 1
-                        break
-
-            week_phase = max(week_phase_counts.items(), key=lambda x: x[1])[0]
+            is_main_race_week = main_race_date is not None and week_start <= main_race_date <= week_end
 
             # Vérifier s'il y a une course intermédiaire cette semaine
             week_races = [race for race in intermediate_races
-                          if any(day == race.race_date for day in week_dates)]
-
-            has_intermediate_race = len(week_races) > 0
-            intermediate_race = week_races[0] if has_intermediate_race else None
-
-            # Distribuer les séances pour cette semaine, en tenant compte
-            # de la spécificité de la semaine d'affûtage
-            week_sessions = self._distribute_week_sessions(
-                week_idx, week_start, week_phase, volume,
-                sessions_per_week, ef_pace, specific_pace,
-                intermediate_race,
-                is_main_race_week=is_main_race_week,
-                main_race_date=main_race_date if is_main_race_week else None
-            )
+                          if week_start <= race.race_date <= week_end]
+
+            contexts[week_idx] = {
+                "week_start": week_start,
+                # Déterminer la phase prédominante de la semaine
+                "phase": schedule.predominant_phase(week_start),
+                "volume": volume,
+                "intermediate_race": week_races[0] if week_races else None,
+                "is_main_race_week": is_main_race_week,
+                "main_race_date": main_race_date if is_main_race_week else None
+            }
+
+        return contexts
+
+    def get_week_key(self, week_idx: int, context: Dict[str, Any], sessions_per_week: int,
+                     ef_pace: timedelta, specific_pace: timedelta) -> Tuple:
+        """
+        Construit la clé regroupant tout ce dont dépendent les séances d'une semaine
 
-            # Ajouter les séances au dictionnaire global
-            sessions.update(week_sessions)
+        Deux semaines de même clé reçoivent exactement les mêmes séances.
 
-        return sessions
+        Args:
+            week_idx: Indice de la semaine
+            context: Paramètres de la semaine (voir get_week_contexts)
+            sessions_per_week: Nombre de séances par semaine
+            ef_pace: Allure d'endurance fondamentale
+            specific_pace: Allure spécifique de la course
+
+        Returns:
+            Tuple des paramètres de la semaine
+        """
+        return (
+            week_idx,
+            context["week_start"],
+            context["phase"],
+            context["volume"],
+            context["intermediate_race"],
+            context["is_main_race_week"],
+            context["main_race_date"],
+            sessions_per_week,
+            ef_pace,
+            specific_pace
+        )
+
+    def distribute_week(self, week_idx: int, context: Dict[str, Any], sessions_per_week: int,
+                        ef_pace: timedelta, specific_pace: timedelta) -> Dict[date, Session]:
+        """
+        Distribue les séances d'une semaine avec un générateur aléatoire propre à la semaine
+
+        Args:
+            week_idx: Indice de la semaine
+            context: Paramètres de la semaine (voir get_week_contexts)
+            sessions_per_week: Nombre de séances par semaine
+            ef_pace: Allure d'endurance fondamentale
+            specific_pace: Allure spécifique de la course
+
+        Returns:
+            Dictionnaire des séances de la semaine indexées par date
+        """
+        week_key = self.get_week_key(week_idx, context, sessions_per_week, ef_pace, specific_pace)
+        digest = hashlib.sha256(f"{self.random_seed}:{week_key!r}".encode("utf-8")).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+
+        # Distribuer les séances pour cette semaine, en tenant compte
+        # de la spécificité de la semaine d'affûtage
+        return self._distribute_week_sessions(
+            week_idx, context["week_start"], context["phase"], context["volume"],
+            sessions_per_week, ef_pace, specific_pace,
+            context["intermediate_race"],
+            is_main_race_week=context["is_main_race_week"],
+            main_race_date=context["main_race_date"],
+            rng=rng
+        )
 
     def _distribute_week_sessions(self, week_idx: int, week_start: date, phase: TrainingPhase,
                                   volume: float, sessions_per_week: int,
                                   ef_pace: timedelta, specific_pace: timedelta,
                                   intermediate_race: Optional[Course] = None,
                                   is_main_race_week: bool = False,
-                                  main_race_date: Optional[date] = None) -> Dict[date, Session]:
+                                  main_race_date: Optional[date] = None,
+                                  rng: Optional[random.Random] = None) -> Dict[date, Session]:
         """
         Distribue les séances pour une semaine spécifique
 
@@ -126,10 +200,14 @@ class SessionDistributor:
             intermediate_race: Course intermédiaire de la semaine (si présente)
             is_main_race_week: Si True, cette semaine contient la course principale
             main_race_date: Date de la course principale (si dans cette semaine)
+            rng: Générateur aléatoire de la semaine
 
         Returns:
             Dictionnaire des séances de la semaine indexées par date
         """
+        if rng is None:
+            rng = random.Random(self.random_seed)
+
         sessions = {}
 
         # L'allure "hors seuil" ou allure de récupération est l'allure EF (Endurance Fondamentale)
@@ -267,16 +345,14 @@ class SessionDistributor:
                     # En phase spécifique, utiliser l'allure de la course principale
                     interval_minutes = THRESHOLD_INTERVAL_MINUTES.get("other", [2, 3])
                     if isinstance(interval_minutes, list):
-                        interval_minute = interval_minutes[self._threshold_interval_idx % len(interval_minutes)]
-                        self._threshold_interval_idx += 1
+                        interval_minute = interval_minutes[week_idx % len(interval_minutes)]
                     else:
                         interval_minute = interval_minutes
                 else:
                     # En phase développement, alterner les allures
                     interval_minutes = THRESHOLD_INTERVAL_MINUTES.get("other", [2, 3])
                     if isinstance(interval_minutes, list):
-                        interval_minute = interval_minutes[self._threshold_interval_idx % len(interval_minutes)]
-                        self._threshold_interval_idx += 1
+                        interval_minute = interval_minutes[week_idx % len(interval_minutes)]
                     else:
                         interval_minute = interval_minutes
 
@@ -299,7 +375,7 @@ class SessionDistributor:
 
         if ef_days_count > 0:
             # Particulièrement important pour la phase d'affûtage
-            ef_volumes = self._distribute_ef_volumes(ef_volume, ef_days_count)
+            ef_volumes = self._distribute_ef_volumes(ef_volume, ef_days_count, rng)
 
             for i, day in enumerate(sorted(training_days)):
                 ef_date = week_start + timedelta(days=day)
@@ -361,13 +437,15 @@ class SessionDistributor:
 
         return training_days, rest_days
 
-    def _distribute_ef_volumes(self, total_volume: float, sessions_count: int) -> List[float]:
+    def _distribute_ef_volumes(self, total_volume: float, sessions_count: int,
+                               rng: random.Random) -> List[float]:
         """
         Distribue le volume total d'EF entre plusieurs séances
 
         Args:
             total_volume: Volume total à distribuer (km)
             sessions_count: Nombre de séances
+            rng: Générateur aléatoire à utiliser
 
         Returns:
             Liste des volumes pour chaque séance (km)
@@ -386,7 +464,7 @@ class SessionDistributor:
         # Générer des coefficients aléatoires
         coefficients = []
         for _ in range(sessions_count):
-            coef = random.uniform(min_coef, max_coef)
+            coef = rng.uniform(min_coef, max_coef)
             coefficients.append(coef)
 
         # Normaliser les coefficients pour qu'ils somment à 1
@@ -1,7 +1,11 @@
+import random
 from datetime import date, timedelta
-from typing import Dict, List
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
 
 from models.course import Course
+from models.phase_schedule import PhaseSchedule
 from models.session import TrainingPhase
 from config.constants import (
     VOLUME_REDUCTION_RACE_WEEK,
@@ -10,11 +14,39 @@ from config.constants import (
     TAPER_FINAL_WEEK_RATIO
 )
 
+
+def _round_tenth(values: np.ndarray) -> np.ndarray:
+    """
+    Arrondit un tableau au dixième exactement comme la fonction round() de Python
+
+    np.round multiplie par 10 avant d'arrondir, ce qui diffère de round() lorsque
+    le produit tombe pile sur une demi-unité (ex: 1.05). On reconstitue donc le
+    produit exact x * 10 = 8x + 2x (TwoSum) pour décider de l'arrondi.
+
+    Args:
+        values: Tableau de valeurs à arrondir
+
+    Returns:
+        Tableau arrondi au dixième (arrondi au pair en cas d'égalité exacte)
+    """
+    eight, two = values * 8.0, values * 2.0
+    product = eight + two
+    residual = product - eight
+    error = (eight - (product - residual)) + (two - residual)
+
+    floor = np.floor(product)
+    # Écart (exact) entre x * 10 et floor + 0.5
+    delta = ((product - floor) - 0.5) + error
+    round_up = (delta > 0) | ((delta == 0) & (np.fmod(floor, 2) != 0))
+
+    return (floor + round_up) / 10.0
+
+
 class VolumeCalculator:
     """Calcule les volumes hebdomadaires selon les règles définies"""
 
     def calculate_volumes(self, min_volume: float, max_volume: float,
-                          phases: Dict[TrainingPhase, List[date]],
+                          phases: Mapping[TrainingPhase, List[date]],
                           intermediate_races: List[Course] = None) -> Dict[int, float]:
         """
         Calcule les volumes hebdomadaires pour chaque semaine du plan
@@ -22,164 +54,168 @@ class VolumeCalculator:
         Args:
             min_volume: Volume hebdomadaire minimal (km)
             max_volume: Volume hebdomadaire maximal (km)
-            phases: Dictionnaire des phases d'entraînement et leurs dates
+            phases: Planning des phases (ou dictionnaire des phases et leurs dates)
             intermediate_races: Liste des courses intermédiaires
 
         Returns:
             Dictionnaire avec les indices de semaine (0-indexed) comme clés
             et les volumes hebdomadaires (km) comme valeurs
         """
-        # Initialiser les courses intermédiaires
-        if intermediate_races is None:
-            intermediate_races = []
+        volumes = self.calculate_volumes_batch([(min_volume, max_volume)], phases, intermediate_races)
 
-        # Obtenir les dates de début et de fin de chaque phase
-        phase_boundaries = {}
-        for phase, dates in phases.items():
-            if dates:
-                phase_boundaries[phase] = (min(dates), max(dates))
-
-        # Déterminer le nombre total de semaines
-        if not phase_boundaries:
+        if volumes.shape[1] == 0:
             return {}
 
-        start_date = min([boundaries[0] for boundaries in phase_boundaries.values()])
-        end_date = max([boundaries[1] for boundaries in phase_boundaries.values()])
+        return {week: float(volume) for week, volume in enumerate(volumes[0])}
+
+    def calculate_volumes_batch(self, volume_bounds: Sequence[Tuple[float, float]],
+                                phases: Mapping[TrainingPhase, List[date]],
+                                intermediate_races: List[Course] = None) -> np.ndarray:
+        """
+        Calcule les volumes hebdomadaires de plusieurs plans partageant les mêmes phases
+
+        Args:
+            volume_bounds: Liste de couples (volume minimal, volume maximal) en km
+            phases: Planning des phases (ou dictionnaire des phases et leurs dates)
+            intermediate_races: Liste des courses intermédiaires
+
+        Returns:
+            Tableau (nombre de plans × nombre de semaines) des volumes hebdomadaires (km)
+        """
+        num_weeks, charge_weeks, taper_weeks, race_weeks = self.get_week_layout(phases, intermediate_races)
+
+        return self.compute_weekly_volumes(volume_bounds, num_weeks, charge_weeks, taper_weeks, race_weeks)
+
+    def get_week_layout(self, phases: Mapping[TrainingPhase, List[date]],
+                        intermediate_races: List[Course] = None) -> Tuple[int, List[int], List[int], List[int]]:
+        """
+        Détermine la structure hebdomadaire du plan à partir des phases
+
+        Args:
+            phases: Planning des phases (ou dictionnaire des phases et leurs dates)
+            intermediate_races: Liste des courses intermédiaires
+
+        Returns:
+            Tuple (nombre de semaines, semaines de développement et spécifiques,
+            semaines d'affûtage, semaines contenant une course intermédiaire)
+        """
+        # Initialiser les courses intermédiaires
+        if intermediate_races is None:
+            intermediate_races = []
 
-        # Générer les semaines (lundi au dimanche)
-        weeks = []
-        current_date = start_date
-        while current_date <= end_date:
-            # S'assurer que la date est un lundi
-            if current_date.weekday() != 0:
-                current_date = current_date - timedelta(days=current_date.weekday())
+        # Obtenir les plages de dates de chaque phase
+        schedule = PhaseSchedule.from_date_lists(phases)
 
-            # Fin de la semaine (dimanche)
-            week_end = current_date + timedelta(days=6)
-            weeks.append((current_date, week_end))
+        if not schedule.ranges:
+            return 0, [], [], []
 
-            # Passer à la semaine suivante
-            current_date = current_date + timedelta(days=7)
+        # Les semaines vont du lundi de la première date au dimanche de la dernière
+        first_monday = schedule.first_date - timedelta(days=schedule.first_date.weekday())
+        num_weeks = (schedule.last_date - first_monday).days // 7 + 1
 
-        # Déterminer les semaines pour chaque phase
-        dev_weeks = []
-        specific_weeks = []
+        # Assigner chaque semaine à la phase qui a le plus de jours
+        charge_weeks = []
         taper_weeks = []
+        for i in range(num_weeks):
+            predominant_phase = schedule.predominant_phase(first_monday + timedelta(days=i * 7))
 
-        for i, (week_start, week_end) in enumerate(weeks):
-            # Compter le nombre de jours dans chaque phase
-            days_in_phase = {phase: 0 for phase in TrainingPhase}
-
-            for day_offset in range(7):
-                day_date = week_start + timedelta(days=day_offset)
-                for phase, dates in phases.items():
-                    if day_date in dates:
-                        days_in_phase[phase] += 1
-                        break
-
-            # Assigner la semaine à la phase qui a le plus de jours
-            predominant_phase = max(days_in_phase.items(), key=lambda x: x[1])[0]
-
-            if predominant_phase == TrainingPhase.DEVELOPMENT:
-                dev_weeks.append(i)
-            elif predominant_phase == TrainingPhase.SPECIFIC:
-                specific_weeks.append(i)
-            elif predominant_phase == TrainingPhase.TAPER:
+            if predominant_phase == TrainingPhase.TAPER:
                 taper_weeks.append(i)
+            else:
+                charge_weeks.append(i)
+
+        # Semaine de chaque course intermédiaire (une entrée par course)
+        race_weeks = []
+        for race in intermediate_races:
+            week_idx = (race.race_date - first_monday).days // 7
+            if 0 <= week_idx < num_weeks:
+                race_weeks.append(week_idx)
 
-        # Calculer les volumes hebdomadaires
-        volumes = {}
+        return num_weeks, charge_weeks, taper_weeks, race_weeks
 
-        # IMPORTANT: S'assurer que toutes les semaines ont un volume
-        all_weeks = set(i for i in range(len(weeks)))
+    def compute_weekly_volumes(self, volume_bounds: Sequence[Tuple[float, float]], num_weeks: int,
+                               charge_weeks: Sequence[int], taper_weeks: Sequence[int],
+                               race_weeks: Sequence[int] = ()) -> np.ndarray:
+        """
+        Calcule les volumes hebdomadaires par opérations vectorisées
+
+        Les semaines de développement et spécifiques suivent le cycle
+        CHARGE_DISCHARGE_PATTERN (progression linéaire des semaines à charge),
+        l'affûtage décroît linéairement jusqu'à TAPER_FINAL_WEEK_RATIO du volume
+        minimal et chaque course intermédiaire réduit le volume de sa semaine.
 
-        # 1. Calculer pour les phases développement et spécifique
-        # Calculer le volume initial et final pour les phases de développement et spécifique
-        initial_volume = min_volume
-        final_volume = max_volume
+        Args:
+            volume_bounds: Liste de couples (volume minimal, volume maximal) en km
+            num_weeks: Nombre total de semaines du plan
+            charge_weeks: Indices des semaines de développement et spécifiques
+            taper_weeks: Indices des semaines d'affûtage
+            race_weeks: Indices des semaines contenant une course (une entrée par course)
 
-        # Nombre de semaines à charge (hors décharge)
-        dev_specific_weeks = sorted(dev_weeks + specific_weeks)
-        charge_pattern = {}
-        pattern_index = 0
+        Returns:
+            Tableau (nombre de plans × nombre de semaines) des volumes arrondis au dixième
+        """
+        bounds = np.asarray(volume_bounds, dtype=float).reshape(-1, 2)
+        min_volumes = bounds[:, 0]
+        max_volumes = bounds[:, 1]
+        num_plans = len(bounds)
 
-        for i in dev_specific_weeks:
-            charge_pattern[i] = CHARGE_DISCHARGE_PATTERN[pattern_index % len(CHARGE_DISCHARGE_PATTERN)]
-            pattern_index += 1
+        # Semaines sans volume assigné: volume minimal par défaut
+        volumes = np.repeat(min_volumes[:, None], num_weeks, axis=1)
 
-        charge_weeks_count = sum(1 for i in dev_specific_weeks if charge_pattern.get(i, 0) == 1)
+        # 1. Phases développement et spécifique: cycle charge/décharge
+        dev_specific_weeks = np.sort(np.asarray(charge_weeks, dtype=int))
+        is_charge = np.resize(np.asarray(CHARGE_DISCHARGE_PATTERN) == 1, len(dev_specific_weeks))
+        charge_weeks_count = int(is_charge.sum())
 
         if charge_weeks_count > 1:
             # Progression linéaire des semaines à charge
-            volume_increment = (final_volume - initial_volume) / (charge_weeks_count - 1)
+            volume_increment = (max_volumes - min_volumes) / (charge_weeks_count - 1)
         else:
-            volume_increment = 0
-
-        # Calculer le volume pour chaque semaine de développement et spécifique
-        current_volume = initial_volume
-        last_charge_volume = initial_volume
-
-        for i in dev_specific_weeks:
-            if charge_pattern.get(i, 0) == 1:  # Semaine à charge
-                volumes[i] = current_volume
-                last_charge_volume = current_volume
-                current_volume += volume_increment
-            else:  # Semaine à décharge
-                volumes[i] = last_charge_volume * (1 - DISCHARGE_REDUCTION)
-
-        # 2. Calculer pour les semaines d'affûtage
-        taper_weeks = sorted(taper_weeks)
-
-        if taper_weeks:
-            # Déterminer le volume de départ pour l'affûtage
-            taper_start_volume = max(volumes.values()) if volumes else max_volume
+            volume_increment = np.zeros(num_plans)
+
+        # Volumes des semaines à charge, cumulés comme l'addition successive de l'incrément
+        steps = np.repeat(volume_increment[:, None], charge_weeks_count, axis=1)
+        if charge_weeks_count:
+            steps[:, 0] = min_volumes
+        charge_volumes = np.cumsum(steps, axis=1)
+
+        # Chaque semaine à décharge reprend le volume de la dernière semaine à charge
+        last_charge_idx = np.cumsum(is_charge) - 1
+        previous_charge = np.concatenate([min_volumes[:, None], charge_volumes], axis=1)[:, last_charge_idx + 1]
+        dev_specific_volumes = np.where(is_charge, previous_charge, previous_charge * (1 - DISCHARGE_REDUCTION))
+        volumes[:, dev_specific_weeks] = dev_specific_volumes
+
+        # 2. Phase d'affûtage: décroissance linéaire
+        taper_weeks = np.sort(np.asarray(taper_weeks, dtype=int))
+
+        if len(taper_weeks):
+            # Le volume de départ est le volume maximal atteint avant l'affûtage
+            if len(dev_specific_weeks):
+                taper_start_volume = dev_specific_volumes.max(axis=1)
+            else:
+                taper_start_volume = max_volumes
 
-            # Volume final = 50% du volume minimal pour l'avant-dernière semaine
-            # et 20% pour la dernière semaine (qui contient la course)
-            taper_final_volume = min_volume * TAPER_FINAL_WEEK_RATIO
+            taper_final_volume = min_volumes * TAPER_FINAL_WEEK_RATIO
 
-            # Progression linéaire pour l'affûtage
             if len(taper_weeks) > 1:
                 taper_decrement = (taper_start_volume - taper_final_volume) / (len(taper_weeks) - 1)
             else:
-                taper_decrement = 0
-
-            # Appliquer la réduction progressive
-            current_taper_volume = taper_start_volume
-            for i in taper_weeks:
-                volumes[i] = current_taper_volume
-                current_taper_volume -= taper_decrement
-
-        # ASSUREZ-VOUS QUE TOUTES LES SEMAINES ONT UN VOLUME
-        # C'est crucial pour que toutes les semaines soient traitées
-        for week_idx in all_weeks:
-            if week_idx not in volumes:
-                # Semaine sans volume assigné (rare, mais possible)
-                # Assigner un volume par défaut basé sur la phase
-                if week_idx in taper_weeks:
-                    volumes[week_idx] = min_volume * 0.5  # 50% du volume minimal
-                else:
-                    volumes[week_idx] = min_volume
+                taper_decrement = np.zeros(num_plans)
 
-        # 3. Appliquer la réduction pour les semaines avec courses intermédiaires
-        for race in intermediate_races:
-            race_date = race.race_date
+            taper_steps = np.repeat(-taper_decrement[:, None], len(taper_weeks), axis=1)
+            taper_steps[:, 0] = taper_start_volume
+            volumes[:, taper_weeks] = np.cumsum(taper_steps, axis=1)
 
-            # Trouver la semaine de la course
-            for i, (week_start, week_end) in enumerate(weeks):
-                if week_start <= race_date <= week_end:
-                    # Réduire le volume de la semaine de course
-                    if i in volumes:
-                        volumes[i] = volumes[i] * (1 - VOLUME_REDUCTION_RACE_WEEK)
-                    break
+        # 3. Réduction pour les semaines avec courses intermédiaires
+        if len(race_weeks):
+            np.multiply.at(volumes, (slice(None), np.asarray(race_weeks, dtype=int)), 1 - VOLUME_REDUCTION_RACE_WEEK)
 
         # Arrondir les volumes au dixième
-        volumes = {week: round(volume, 1) for week, volume in volumes.items()}
+        volumes = _round_tenth(volumes)
 
         # Vérification finale: s'assurer qu'aucun volume n'est à zéro
-        for week_idx in volumes:
-            if volumes[week_idx] <= 0:
-                volumes[week_idx] = max(min_volume * 0.2, 5.0)  # Au moins 5 km ou 20% du min
+        floor_volumes = np.maximum(min_volumes * 0.2, 5.0)  # Au moins 5 km ou 20% du min
+        volumes = np.where(volumes <= 0, floor_volumes[:, None], volumes)
 
         return volumes
 
@@ -204,15 +240,15 @@ class VolumeCalculator:
         # pour éviter d'avoir des séances identiques
 
         # Générer des coefficients aléatoires entre 0.15 et 0.6
-        import random
-        random.seed(total_volume + sessions_count)  # Pour la reproductibilité
+        # Générateur local pour la reproductibilité (sans toucher à l'état global)
+        rng = random.Random(total_volume + sessions_count)
 
         coefficients = []
         min_coef = 0.15
         max_coef = 0.6
 
         for _ in range(sessions_count):
-            coef = random.uniform(min_coef, max_coef)
+            coef = rng.uniform(min_coef, max_coef)
             coefficients.append(coef)
 
         # Normaliser les coefficients pour qu'ils somment à 1
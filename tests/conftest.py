@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+import pytest
+
+from models.course import Course, RaceType
+from models.user_data import UserData
+from services.plan_generator import PlanGenerator
+
+
+def make_user_data(weeks: int = 16, sessions_per_week: int = 5) -> UserData:
+    """Données utilisateur d'un marathon préparé en weeks semaines"""
+    start_date = date(2025, 1, 6)
+    return UserData(
+        start_date=start_date,
+        main_race=Course(race_date=start_date + timedelta(weeks=weeks, days=6), race_type=RaceType.MARATHON),
+        pace_5k=timedelta(minutes=4),
+        pace_10k=timedelta(minutes=4, seconds=10),
+        pace_half_marathon=timedelta(minutes=4, seconds=25),
+        pace_marathon=timedelta(minutes=4, seconds=40),
+        sessions_per_week=sessions_per_week,
+        min_volume=40,
+        max_volume=70
+    )
+
+
+@pytest.fixture
+def plan():
+    """Plan généré sans cache (séances de seuil avec blocs fractionnés)"""
+    return PlanGenerator(cache=None).generate_plan(make_user_data())
@@ -0,0 +1,33 @@
+import gc
+
+from controllers.plan_controller import PlanController
+from services.export_cache import ExportCache, export_cache
+from services.export_service import ICS_DTSTAMP_PLACEHOLDER, ExportService
+
+
+def test_discarded_controller_releases_its_exports(plan):
+    export_cache.clear()
+    controller = PlanController()
+    controller.current_plan = plan
+    controller.export_to_ics()
+    owner = controller.export_service.owner
+    assert owner in export_cache._owners
+    assert export_cache.stats["entries"] == 1
+
+    del controller
+    gc.collect()
+    assert owner not in export_cache._owners
+    assert export_cache.stats["entries"] == 0
+
+
+def test_cached_ics_is_stamped_at_each_export(plan):
+    cache = ExportCache()
+    service = ExportService(cache=cache)
+
+    content = service.export_to_ics(plan)
+    stored = next(iter(cache._entries.values()))
+
+    placeholder = ICS_DTSTAMP_PLACEHOLDER.encode("ascii")
+    dtstamp = content.split(b"DTSTAMP:")[1][:len(placeholder)]
+    assert placeholder in stored and placeholder not in content
+    assert content == stored.replace(b"DTSTAMP:" + placeholder, b"DTSTAMP:" + dtstamp)
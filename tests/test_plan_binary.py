@@ -0,0 +1,127 @@
+import hashlib
+import struct
+import zlib
+from datetime import date, timedelta
+
+import pytest
+
+from models import plan_binary
+from models.mapped_plan import MappedTrainingPlan
+from models.plan import TrainingPlan
+from models.session import (BlockRepeat, Session, SessionBlock, SessionType, TrainingPhase,
+                            INTERVAL_LABEL, RECOVERY_LABEL)
+from tests.conftest import make_user_data
+
+# Empreinte de l'encodage de small_plan(): à ne mettre à jour qu'avec FORMAT_VERSION
+SMALL_PLAN_SHA256 = "c4e7b5daf66df2faa611b1a7904f9099eaa71177ff2b1970612e06067bb2f59b"
+
+
+def small_plan() -> TrainingPlan:
+    """Plan construit à la main (indépendant du générateur) couvrant chaque type d'enregistrement"""
+    pace = timedelta(minutes=5)
+    start = date(2025, 1, 6)
+    sessions = {
+        start: Session(start, SessionType.EF, TrainingPhase.DEVELOPMENT,
+                       [SessionBlock(10.0, pace, "Footing")], "Endurance"),
+        start + timedelta(days=2): Session(
+            start + timedelta(days=2), SessionType.THRESHOLD, TrainingPhase.SPECIFIC,
+            [SessionBlock(2.0, pace, "Échauffement"),
+             BlockRepeat(5, [SessionBlock(1.0, timedelta(minutes=4), label=INTERVAL_LABEL),
+                             SessionBlock(0.4, timedelta(minutes=6), label=RECOVERY_LABEL)]),
+             SessionBlock(2.0, pace, "Retour au calme")],
+            "Seuil 5×1 km"),
+        start + timedelta(days=5): Session(start + timedelta(days=5), SessionType.RACE, TrainingPhase.TAPER,
+                                           [SessionBlock(10.0, timedelta(minutes=4))], "10 km",
+                                           is_intermediate_race=True),
+        start + timedelta(days=6): Session.create_rest_session(start + timedelta(days=6), TrainingPhase.TAPER),
+    }
+    phases = {
+        TrainingPhase.DEVELOPMENT: [start, start + timedelta(days=1)],
+        TrainingPhase.SPECIFIC: [start + timedelta(days=2), start + timedelta(days=4)],
+        TrainingPhase.TAPER: [start + timedelta(days=5), start + timedelta(days=6)],
+    }
+    return TrainingPlan(user_data=make_user_data(), sessions=sessions, phase_dates=phases,
+                        weekly_volumes={0: 34.0})
+
+
+def with_crc(payload: bytes) -> bytes:
+    """Complète une charge utile modifiée avec une somme de contrôle valide"""
+    return payload + struct.pack("<I", zlib.crc32(payload))
+
+
+def test_round_trip(plan):
+    data = plan.to_bytes()
+    for trusted in (False, True):
+        decoded = TrainingPlan.from_bytes(data, trusted=trusted)
+        assert decoded.sessions == plan.sessions
+        assert decoded.weekly_volumes == plan.weekly_volumes
+        assert decoded.user_data == plan.user_data
+        assert decoded.phase_schedule.ranges == plan.phase_schedule.ranges
+        assert decoded.to_bytes() == data
+
+
+def test_round_trip_keeps_repeats_and_aggregates():
+    plan = small_plan()
+    decoded = TrainingPlan.from_bytes(plan.to_bytes())
+    for session_date, session in plan.sessions.items():
+        restored = decoded.sessions[session_date]
+        assert restored.compact_blocks == session.compact_blocks
+        assert restored.is_intermediate_race == session.is_intermediate_race
+        assert restored.total_distance == session.total_distance
+        assert restored.total_duration == session.total_duration
+        assert restored.get_difficulty_score() == session.get_difficulty_score()
+
+
+def test_format_is_stable():
+    data = small_plan().to_bytes()
+    assert data[:8] == plan_binary.HEADER.pack(b"AIRP", 1, 0)
+    assert plan_binary.FORMAT_VERSION == 1
+    assert hashlib.sha256(data).hexdigest() == SMALL_PLAN_SHA256
+
+
+@pytest.mark.parametrize("size", [0, 3, 8, 11, 100, -5, -4, -1])
+def test_truncated_data_is_rejected(plan, size):
+    data = plan.to_bytes()
+    with pytest.raises(ValueError):
+        TrainingPlan.from_bytes(data[:size], trusted=True)
+
+
+def test_corrupted_data_is_rejected(plan):
+    data = bytearray(plan.to_bytes())
+    data[len(data) // 2] ^= 0xFF
+    with pytest.raises(ValueError, match="somme de contrôle"):
+        TrainingPlan.from_bytes(bytes(data), trusted=True)
+
+    data = plan.to_bytes()
+    with pytest.raises(ValueError, match="somme de contrôle"):
+        TrainingPlan.from_bytes(data[:-4] + bytes(4))
+
+
+@pytest.mark.parametrize("version", [0, plan_binary.FORMAT_VERSION + 1])
+def test_other_versions_are_rejected(plan, version):
+    payload = bytearray(plan.to_bytes()[:-4])
+    struct.pack_into("<H", payload, 4, version)
+    with pytest.raises(ValueError, match="Version"):
+        TrainingPlan.from_bytes(with_crc(bytes(payload)))
+
+
+def test_forged_aggregates_are_recomputed_when_untrusted(plan):
+    data = plan.to_bytes()
+    layout = plan_binary.read_layout(data)
+    payload = bytearray(data[:-4])
+    # Distance totale du premier enregistrement de séance (voir SESSION_RECORD)
+    struct.pack_into("<d", payload, layout.sessions_offset + 15, 999.0)
+    forged = with_crc(bytes(payload))
+
+    assert TrainingPlan.from_bytes(forged, trusted=True).get_total_volume() != plan.get_total_volume()
+    untrusted = TrainingPlan.from_bytes(forged, trusted=False)
+    assert untrusted.get_total_volume() == plan.get_total_volume()
+    assert untrusted.sessions == plan.sessions
+    assert MappedTrainingPlan(forged, trusted=False).get_total_volume() == plan.get_total_volume()
+
+
+def test_foreign_data_is_rejected(plan):
+    assert plan_binary.is_binary_plan(plan.to_bytes())
+    assert not plan_binary.is_binary_plan(plan.to_json().encode("utf-8"))
+    with pytest.raises(ValueError, match="en-tête"):
+        TrainingPlan.from_bytes(with_crc(b"AIRB" + plan.to_bytes()[4:-4]))
@@ -0,0 +1,113 @@
+import io
+import json
+import struct
+import zlib
+
+import pytest
+
+from tests.test_plan_binary import small_plan
+from utils import plan_bundle
+from utils.plan_bundle import PlanBundleReader, PlanBundleWriter, is_plan_bundle
+
+
+def write_bundle(*plans) -> bytes:
+    sink = io.BytesIO()
+    with PlanBundleWriter(sink) as writer:
+        for i, plan in enumerate(plans):
+            writer.add(plan, name=f"plan-{i}")
+    return sink.getvalue()
+
+
+def test_round_trip(plan):
+    plans = [plan, small_plan()]
+    data = write_bundle(*plans)
+    assert is_plan_bundle(data)
+
+    with PlanBundleReader(data) as reader:
+        assert len(reader) == 2
+        assert [entry["name"] for entry in reader.entries] == ["plan-0", "plan-1"]
+        assert reader.entries[0]["sessions"] == len(plan.sessions)
+        assert reader.entries[0]["total_volume"] == plan.get_total_volume()
+        for index, expected in enumerate(plans):
+            assert reader.read_bytes(index) == expected.to_bytes()
+        assert [loaded.to_bytes() for loaded in reader] == [p.to_bytes() for p in plans]
+
+
+def test_format_is_stable():
+    plan = small_plan()
+    data = write_bundle(plan)
+    assert data[:8] == struct.pack("<4sHH", b"AIRB", 1, 0)
+    assert plan_bundle.FORMAT_VERSION == 1
+
+    manifest_offset, manifest_length, magic = struct.unpack("<QI4s", data[-16:])
+    assert magic == b"AIRB"
+    assert manifest_offset + manifest_length == len(data) - 16
+    manifest = zlib.decompress(data[manifest_offset:manifest_offset + manifest_length])
+    entry = json.loads(manifest)["plans"][0]
+    assert entry["offset"] == 8
+    assert zlib.decompress(data[8:8 + entry["length"]]) == plan.to_bytes()
+
+
+@pytest.mark.parametrize("size", [0, 7, 8, 20, -17, -16, -1])
+def test_truncated_bundle_is_rejected(size):
+    data = write_bundle(small_plan())
+    with pytest.raises(ValueError, match="tronquée"):
+        PlanBundleReader(data[:size])
+
+
+def test_corrupted_plan_is_rejected():
+    data = bytearray(write_bundle(small_plan(), small_plan()))
+    data[8 + 10] ^= 0xFF
+    with PlanBundleReader(bytes(data)) as reader:
+        with pytest.raises(ValueError):
+            reader.load(0)
+        assert reader.load(1).to_bytes() == small_plan().to_bytes()
+
+
+def test_corrupted_plan_with_valid_compression_is_rejected():
+    plan_data = bytearray(small_plan().to_bytes())
+    plan_data[len(plan_data) // 2] ^= 0xFF
+    sink = io.BytesIO()
+    sink.write(struct.pack("<4sHH", b"AIRB", 1, 0))
+    compressed = zlib.compress(bytes(plan_data))
+    sink.write(compressed)
+    manifest = zlib.compress(b'{"plans":[{"offset":8,"length":%d}]}' % len(compressed))
+    sink.write(manifest)
+    sink.write(struct.pack("<QI4s", 8 + len(compressed), len(manifest), b"AIRB"))
+
+    with PlanBundleReader(sink.getvalue()) as reader:
+        with pytest.raises(ValueError, match="somme de contrôle"):
+            reader.load(0)
+
+
+def test_corrupted_manifest_is_rejected():
+    data = bytearray(write_bundle(small_plan()))
+    manifest_offset, _, _ = struct.unpack("<QI4s", data[-16:])
+    data[manifest_offset + 4] ^= 0xFF
+    with pytest.raises(ValueError, match="Manifeste"):
+        PlanBundleReader(bytes(data))
+
+
+def test_newer_version_is_rejected():
+    data = bytearray(write_bundle(small_plan()))
+    struct.pack_into("<H", data, 4, plan_bundle.FORMAT_VERSION + 1)
+    with pytest.raises(ValueError, match="Version"):
+        PlanBundleReader(bytes(data))
+
+
+def test_foreign_data_is_rejected():
+    plan_data = small_plan().to_bytes()
+    assert not is_plan_bundle(plan_data)
+    with pytest.raises(ValueError, match="archive de plans"):
+        PlanBundleReader(plan_data)
+
+
+def test_incomplete_bundle_is_not_finalized(tmp_path):
+    path = str(tmp_path / "plans.airb")
+    with pytest.raises(RuntimeError):
+        with PlanBundleWriter(path) as writer:
+            writer.add(small_plan())
+            raise RuntimeError("interruption")
+
+    with pytest.raises(ValueError, match="tronquée"):
+        PlanBundleReader(path)
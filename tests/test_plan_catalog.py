@@ -0,0 +1,103 @@
+import struct
+
+import pytest
+
+from tests.test_plan_binary import small_plan
+from utils import plan_catalog
+from utils.plan_catalog import PlanCatalog, write_plan_catalog
+
+
+@pytest.fixture
+def catalog_path(tmp_path, plan):
+    path = str(tmp_path / "templates.catalog")
+    write_plan_catalog(path, [plan, small_plan()], ["marathon", "semaine"])
+    return path
+
+
+def patched(path: str, offset: int, data: bytes) -> None:
+    """Remplace des octets du fichier en place"""
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_round_trip(catalog_path, plan):
+    with PlanCatalog(catalog_path) as catalog:
+        assert len(catalog) == 2
+        assert catalog.find("semaine") == 1
+        assert catalog.find("absent") is None
+        assert catalog.entries[0]["total_volume"] == plan.get_total_volume()
+
+        for index, expected in enumerate([plan, small_plan()]):
+            loaded = catalog.load(index)
+            assert loaded.user_data == expected.user_data
+            assert loaded.weekly_volumes == expected.weekly_volumes
+            assert dict(loaded.sessions) == dict(expected.sessions)
+            assert loaded.get_total_volume() == expected.get_total_volume()
+
+
+def test_format_is_stable(catalog_path, plan):
+    with open(catalog_path, "rb") as f:
+        data = f.read()
+
+    magic, version, reserved, count, metadata_offset, metadata_length = struct.unpack_from("<4sHHIQI", data)
+    assert (magic, version, reserved, count) == (b"AIRC", 1, 0, 2)
+    assert plan_catalog.FORMAT_VERSION == 1
+    assert metadata_offset + metadata_length == len(data)
+
+    for index, (offset, length) in enumerate(struct.iter_unpack("<QI", data[24:24 + 12 * count])):
+        assert offset % 8 == 0
+        expected = [plan, small_plan()][index]
+        assert data[offset:offset + 4] == b"AIRP"
+        assert data[offset:offset + length] == type(expected)(
+            user_data=expected.user_data,
+            sessions=dict(sorted(expected.sessions.items())),
+            phase_dates=expected.phase_schedule,
+            weekly_volumes=expected.weekly_volumes,
+            version=expected.version
+        ).to_bytes()
+
+
+def test_truncated_catalog_is_rejected(catalog_path):
+    with open(catalog_path, "rb") as f:
+        data = f.read()
+
+    for size in (10, 24, len(data) // 2, len(data) - 1):
+        with open(catalog_path, "wb") as f:
+            f.write(data[:size])
+        with pytest.raises(ValueError, match="tronqué"):
+            PlanCatalog(catalog_path)
+
+
+def test_corrupted_plan_is_rejected(catalog_path):
+    with PlanCatalog(catalog_path) as catalog:
+        entry = catalog.entries[1]
+    patched(catalog_path, entry["offset"] + entry["length"] // 2, b"\xff\xff")
+
+    with PlanCatalog(catalog_path) as catalog:
+        with pytest.raises(ValueError, match="somme de contrôle"):
+            catalog.load(1)
+        catalog.load(0)
+
+
+def test_out_of_bounds_entry_is_rejected(catalog_path):
+    with PlanCatalog(catalog_path) as catalog:
+        metadata_offset = catalog.entries[1]["offset"] + catalog.entries[1]["length"]
+    patched(catalog_path, 24 + 12, struct.pack("<QI", metadata_offset - 4, 8))
+
+    with pytest.raises(ValueError, match="hors limites"):
+        PlanCatalog(catalog_path)
+
+
+def test_newer_version_is_rejected(catalog_path):
+    patched(catalog_path, 4, struct.pack("<H", plan_catalog.FORMAT_VERSION + 1))
+    with pytest.raises(ValueError, match="Version"):
+        PlanCatalog(catalog_path)
+
+
+def test_foreign_data_is_rejected(tmp_path):
+    path = str(tmp_path / "plan.airp")
+    with open(path, "wb") as f:
+        f.write(small_plan().to_bytes())
+    with pytest.raises(ValueError, match="catalogue de plans"):
+        PlanCatalog(path)
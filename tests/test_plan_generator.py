@@ -0,0 +1,34 @@
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from services.plan_generator import PlanGenerator
+from tests.conftest import make_user_data
+
+
+@pytest.mark.parametrize("changes", [
+    {"sessions_per_week": 4},
+    {"max_volume": 80},
+    {"pace_marathon": timedelta(minutes=4, seconds=45)},
+])
+def test_regenerate_plan_matches_full_generation(changes):
+    generator = PlanGenerator(cache=None)
+    previous = generator.generate_plan(make_user_data())
+    user_data = replace(previous.user_data, **changes)
+
+    regenerated = generator.regenerate_plan(previous, user_data)
+
+    assert regenerated.to_bytes() == generator.generate_plan(user_data).to_bytes()
+    assert regenerated.weekly_volumes is not previous.weekly_volumes
+    assert list(regenerated.sessions) == sorted(regenerated.sessions)
+
+
+def test_pool_does_not_stop_at_a_none_input():
+    user_data = make_user_data()
+    plans = iter(PlanGenerator(cache=None).generate_plans([user_data, None, user_data], workers=2))
+
+    assert next(plans).user_data == user_data
+    # None est une entrée (invalide) et non la fin du flux
+    with pytest.raises(AttributeError):
+        next(plans)
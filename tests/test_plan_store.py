@@ -0,0 +1,25 @@
+import json
+
+from utils.plan_store import PlanStore, split_plan
+
+
+def test_chunked_manifest_keeps_phase_ranges(plan):
+    _, manifest_data, _ = split_plan(plan)
+    manifest = json.loads(manifest_data)
+
+    assert "phase_dates" not in manifest
+    assert manifest["phase_ranges"] == {
+        phase.value: [start.isoformat(), end.isoformat()]
+        for phase, (start, end) in plan.phase_schedule.ranges.items()
+    }
+
+
+def test_chunked_round_trip(tmp_path, plan):
+    store = PlanStore(str(tmp_path / "plans.db"))
+    plan_id = store.save_plan(plan, plan_format="chunked")
+
+    for loaded in (store.load_plan(plan_id), store.load_plan(plan_id, trusted=False),
+                   store.load_plan_lazy(plan_id)):
+        assert loaded.phase_schedule.ranges == plan.phase_schedule.ranges
+        assert dict(loaded.sessions) == dict(plan.sessions)
+        assert loaded.weekly_volumes == plan.weekly_volumes
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import pytest
+
+from models.mapped_plan import MappedTrainingPlan
+from models.session import Session, SessionBlock, SessionType, TrainingPhase
+
+
+def test_indexed_session_type_and_phase_are_read_only(plan):
+    session_date, session = next((d, s) for d, s in plan.sessions.items()
+                                 if s.session_type == SessionType.EF)
+    plan.get_sessions_by_type()
+
+    with pytest.raises(AttributeError):
+        session.session_type = SessionType.THRESHOLD
+    with pytest.raises(AttributeError):
+        session.phase = session.phase
+
+    retyped = Session(session_date, SessionType.THRESHOLD, session.phase,
+                      session.compact_blocks, session.description)
+    ef_count = len(plan.get_sessions_by_type()[SessionType.EF])
+    plan.add_session(retyped)
+
+    by_type = plan.get_sessions_by_type()
+    assert len(by_type[SessionType.EF]) == ef_count - 1
+    assert any(s is retyped for s in by_type[SessionType.THRESHOLD])
+    assert all(s is not session for s in by_type[SessionType.EF])
+
+
+def test_session_is_editable_until_indexed():
+    session = Session.create_rest_session(date(2025, 1, 6), TrainingPhase.DEVELOPMENT)
+    session.session_type = SessionType.EF
+    session.phase = TrainingPhase.SPECIFIC
+    assert (session.session_type, session.phase) == (SessionType.EF, TrainingPhase.SPECIFIC)
+
+
+def test_blocks_are_immutable(plan):
+    session = next(s for s in plan.sessions.values() if s.blocks)
+    distance = session.total_distance
+
+    assert isinstance(session.blocks, tuple)
+    with pytest.raises(AttributeError):
+        session.blocks[0].distance = 99
+    with pytest.raises(AttributeError):
+        session.blocks[0].pace = session.blocks[0].pace
+
+    session.blocks = session.blocks[1:]
+    assert session.total_distance < distance
+
+
+def test_replacing_blocks_refreshes_plan_aggregates(plan):
+    session_date, session = next((d, s) for d, s in plan.sessions.items() if s.total_distance > 8)
+    week_num = plan.get_week_number(session_date)
+    week_distance = plan.get_week_stats(week_num)["distance"]
+    week_duration = plan.get_weekly_duration(week_num)
+    total_volume = plan.get_total_volume()
+    total_duration = plan.get_total_duration()
+    block_distance = plan.blocks_frame()["distance"].sum()
+    removed = session.total_distance - 7.3
+
+    session.blocks = [SessionBlock(7.3, timedelta(minutes=5), "Footing")]
+
+    assert plan.get_week_stats(week_num)["distance"] == pytest.approx(week_distance - removed)
+    assert plan.get_weekly_duration(week_num) != week_duration
+    assert plan.get_total_volume() == pytest.approx(total_volume - removed, abs=0.1)
+    assert plan.get_total_duration() != total_duration
+    assert plan.blocks_frame()["distance"].sum() != pytest.approx(block_distance)
+
+
+def test_replacing_blocks_refreshes_mapped_plan_frame(plan):
+    mapped = MappedTrainingPlan(plan.to_bytes())
+    total_volume = mapped.get_total_volume()
+    session = next(s for s in mapped.sessions.values() if s.total_distance > 8)
+    removed = session.total_distance - 7.3
+
+    session.blocks = [SessionBlock(7.3, timedelta(minutes=5), "Footing")]
+
+    assert mapped.get_total_volume() == pytest.approx(total_volume - removed, abs=0.1)
+
+
+def test_in_place_union_invalidates_index(plan):
+    session_date, session = next((d, s) for d, s in plan.sessions.items()
+                                 if s.session_type == SessionType.EF)
+    ef_count = len(plan.get_sessions_by_type()[SessionType.EF])
+
+    plan.sessions |= {session_date: Session(session_date, SessionType.THRESHOLD, session.phase,
+                                            session.compact_blocks)}
+
+    assert len(plan.get_sessions_by_type()[SessionType.EF]) == ef_count - 1
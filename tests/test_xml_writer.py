@@ -0,0 +1,68 @@
+import io
+
+from benchmarks.tcx_export import export_to_tcx_minidom
+from models.session import BlockRepeat
+from services.export_service import ExportService
+from utils import xml_writer
+from utils.xml_writer import XmlWriter, escape_xml
+
+
+def test_escape_xml():
+    assert escape_xml('a & b < c > "d"') == "a &amp; b &lt; c &gt; &quot;d&quot;"
+    assert escape_xml("sans échappement") == "sans échappement"
+
+
+def test_writer_matches_minidom_layout():
+    sink = io.BytesIO()
+    writer = XmlWriter(sink)
+    writer.start("Root", [("xmlns", "urn:test")])
+    writer.start("Empty")
+    writer.end()
+    writer.element("Name", "A & B")
+    writer.element("Notes", None)
+    writer.close()
+
+    assert sink.getvalue().decode("utf-8") == (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<Root xmlns="urn:test">\n'
+        '  <Empty/>\n'
+        '  <Name>A &amp; B</Name>\n'
+        '  <Notes/>\n'
+        '</Root>\n'
+    )
+
+
+def test_writer_flushes_by_chunks(monkeypatch):
+    monkeypatch.setattr(xml_writer, "FLUSH_SIZE", 64)
+
+    class Sink(io.BytesIO):
+        writes = 0
+
+        def write(self, data):
+            Sink.writes += 1
+            return super().write(data)
+
+    sink = Sink()
+    writer = XmlWriter(sink)
+    writer.start("Root")
+    for i in range(50):
+        writer.start("Item")
+        writer.element("Value", str(i))
+        writer.end()
+
+    # Le tampon est vidé en cours d'écriture, pas seulement à la fermeture
+    assert Sink.writes > 1
+    writer.close()
+    assert sink.getvalue().count(b"<Item>") == 50
+
+
+def test_tcx_export_is_byte_identical_to_minidom(plan):
+    # Le plan doit contenir des séances fractionnées (blocs répétés)
+    assert any(isinstance(block, BlockRepeat)
+               for session in plan.sessions.values() for block in session.compact_blocks)
+
+    service = ExportService(cache=None)
+    for lang in ("fr", "en"):
+        expected = export_to_tcx_minidom(plan, lang)
+        assert service.export_to_tcx(plan, lang) == expected
+        assert b"".join(service.iter_tcx(plan, lang, chunk_size=1024)) == expected
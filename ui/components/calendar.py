@@ -4,7 +4,7 @@ from typing import Optional, Callable
 
 from models.plan import TrainingPlan
 from models.session import Session, SessionType, TrainingPhase
-from utils.date_utils import format_date, get_week_number
+from utils.date_utils import format_date
 from utils.time_converter import format_timedelta, format_pace, format_duration_for_calendar
 from utils.i18n import _ as translate
 from config.languages import DAYS_TRANSLATIONS, SESSION_TYPE_TRANSLATIONS
@@ -145,8 +145,7 @@ def render_weekly_summary(
     duration = plan.get_weekly_duration(current_week)
 
     # Compter les types de séances
-    sessions = [s for s in plan.sessions.values()
-                if get_week_number(s.session_date, plan.user_data.start_date) == current_week]
+    sessions = plan.get_week_sessions(current_week)
 
     session_types = {}
     for session in sessions:
@@ -157,18 +156,9 @@ def render_weekly_summary(
             )
             session_types[type_name] = session_types.get(type_name, 0) + 1
 
-    # Calculer l'intensité moyenne (si applicable)
-    active_sessions = [
-        s for s in sessions if s.session_type != SessionType.REST]
-    intensity_percent = 0
-
-    if active_sessions:
-        total_distance = sum(s.total_distance for s in active_sessions)
-        if total_distance > 0:
-            avg_intensity = sum(s.get_difficulty_score() * (s.total_distance / total_distance)
-                                for s in active_sessions if s.total_distance > 0)
-            # Convertir en pourcentage (0-100)
-            intensity_percent = min(100, int(avg_intensity * 33))
+    # Intensité moyenne pondérée par la distance, convertie en pourcentage (0-100)
+    avg_intensity = plan.get_week_stats(current_week)["intensity"]
+    intensity_percent = min(100, int(avg_intensity * 33))
 
     # Afficher les statistiques dans une mise en page responsive
     col1, col2, col3 = st.columns(3)
@@ -4,9 +4,11 @@ from typing import Optional
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
 
 from models.plan import TrainingPlan
+from models.plan_frame import SESSION_TYPES, SESSION_TYPE_CODES
 from models.session import SessionType, TrainingPhase
 from utils.i18n import _ as translate 
 from config.languages import PHASE_TRANSLATIONS, SESSION_TYPE_TRANSLATIONS
@@ -197,51 +199,28 @@ def render_intensity_distribution(
         plan: Plan d'entraînement
         lang: Code de langue
     """
-    # Calculer le temps passé à différentes intensités
-    intensity_bins = {
-        translate("recovery", "intensity"): 0,
-        translate("easy", "intensity"): 0,
-        translate("moderate", "intensity"): 0,
-        translate("threshold", "intensity"): 0,
-        translate("interval", "intensity"): 0,
-        translate("race", "intensity"): 0
-    }
+    # Classer les blocs par intensité en fonction de l'allure:
+    # <= 3:30/km, 3:30-4:00, 4:00-4:30, 4:30-5:30, 5:30-6:30, > 6:30/km
+    zones = [
+        translate("race", "intensity"),
+        translate("interval", "intensity"),
+        translate("threshold", "intensity"),
+        translate("moderate", "intensity"),
+        translate("easy", "intensity"),
+        translate("recovery", "intensity")
+    ]
+    pace_limits = np.array([210, 240, 270, 330, 390])
 
-    # Pour calculer aussi la distance à chaque intensité
-    distance_bins = {k: 0 for k in intensity_bins.keys()}
+    blocks = plan.blocks_frame()
+    blocks = blocks.select(blocks["type"] != SESSION_TYPE_CODES[SessionType.REST])
+    zone_codes = np.searchsorted(pace_limits, blocks["pace"], side="left")
 
-    for session in plan.sessions.values():
-        if session.session_type == SessionType.REST:
-            continue
+    # Temps (en minutes) et distance passés à chaque intensité
+    minutes_by_zone = np.bincount(zone_codes, weights=blocks["duration"] / 60, minlength=len(zones))
+    distance_by_zone = np.bincount(zone_codes, weights=blocks["distance"], minlength=len(zones))
 
-        for block in session.blocks:
-            # Classer l'intensité en fonction de l'allure
-            pace_seconds = block.pace.total_seconds()
-            duration_mins = block.duration.total_seconds() / 60  # En minutes
-            distance = block.distance
-
-            if pace_seconds > 390:  # > 6:30/km
-                intensity_bins[translate(
-                    "recovery", "intensity")] += duration_mins
-                distance_bins[translate("recovery", "intensity")] += distance
-            elif pace_seconds > 330:  # 5:30-6:30/km
-                intensity_bins[translate("easy", "intensity")] += duration_mins
-                distance_bins[translate("easy", "intensity")] += distance
-            elif pace_seconds > 270:  # 4:30-5:30/km
-                intensity_bins[translate(
-                    "moderate", "intensity")] += duration_mins
-                distance_bins[translate("moderate", "intensity")] += distance
-            elif pace_seconds > 240:  # 4:00-4:30/km
-                intensity_bins[translate(
-                    "threshold", "intensity")] += duration_mins
-                distance_bins[translate("threshold", "intensity")] += distance
-            elif pace_seconds > 210:  # 3:30-4:00/km
-                intensity_bins[translate(
-                    "interval", "intensity")] += duration_mins
-                distance_bins[translate("interval", "intensity")] += distance
-            else:  # < 3:30/km
-                intensity_bins[translate("race", "intensity")] += duration_mins
-                distance_bins[translate("race", "intensity")] += distance
+    intensity_bins = {zones[code]: float(minutes_by_zone[code]) for code in reversed(range(len(zones)))}
+    distance_bins = {zones[code]: float(distance_by_zone[code]) for code in reversed(range(len(zones)))}
 
     # Convertir en heures pour l'affichage et filtrer les valeurs nulles
     intensity_hours_dict = {
@@ -378,20 +357,17 @@ def render_session_type_distribution(
     session_types_volume = {}
     session_types_count = {}
 
-    for session in plan.sessions.values():
-        if session.session_type != SessionType.REST:
-            session_type = session.session_type.value
+    frame = plan.frame()
+    volumes = frame.group_sum("type", "distance", len(SESSION_TYPES))
+    counts = frame.group_count("type", len(SESSION_TYPES))
+
+    for type_code, session_type in enumerate(SESSION_TYPES):
+        if session_type != SessionType.REST and counts[type_code] > 0:
             translated_type = SESSION_TYPE_TRANSLATIONS.get(lang, {}).get(
-                session_type, session_type
+                session_type.value, session_type.value
             )
-
-            # Accumulation du volume
-            session_types_volume[translated_type] = session_types_volume.get(
-                translated_type, 0) + session.total_distance
-
-            # Comptage des séances
-            session_types_count[translated_type] = session_types_count.get(
-                translated_type, 0) + 1
+            session_types_volume[translated_type] = float(volumes[type_code])
+            session_types_count[translated_type] = int(counts[type_code])
 
     if not session_types_volume:
         st.warning(translate("no_data_available", "charts"))
@@ -586,40 +562,24 @@ def render_training_load_chart(
         current_week: Numéro de la semaine actuelle (pour mise en évidence)
     """
     # Calculer la charge d'entraînement par semaine
-    sessions_by_week = plan.get_sessions_by_week()
-
-    weeks = sorted(sessions_by_week.keys())
-    loads = []
-    intensities = []
-    volumes = []
+    frame = plan.frame()
+    weeks = np.unique(frame["week"])
 
-    for week in weeks:
-        week_sessions = sessions_by_week[week]
-
-        # Somme des scores de difficulté pondérés par la distance
-        total_distance = sum(s.total_distance for s in week_sessions
-                             if s.session_type != SessionType.REST)
-        volumes.append(total_distance)
+    # Intensité moyenne = somme des scores de difficulté pondérés par la distance
+    volumes = frame.group_sum("week", "distance")[weeks]
+    weighted_difficulty = np.bincount(frame["week"], weights=frame["difficulty"] * frame["distance"])[weeks]
+    intensities = np.divide(weighted_difficulty, volumes, out=np.zeros_like(volumes), where=volumes > 0)
 
-        if total_distance > 0:
-            # Calcul de l'intensité moyenne
-            avg_intensity = sum(s.get_difficulty_score() * (s.total_distance / total_distance)
-                                for s in week_sessions if s.total_distance > 0)
-            intensities.append(avg_intensity)
-
-            # Charge = intensité * volume (normalisée pour l'affichage)
-            loads.append(avg_intensity * total_distance / 10)
-        else:
-            intensities.append(0)
-            loads.append(0)
+    # Charge = intensité * volume (normalisée pour l'affichage)
+    loads = intensities * volumes / 10
 
     # Convertir en numéros de semaine (1-based)
-    week_numbers = [week + 1 for week in weeks]
+    week_numbers = weeks + 1
 
     # Déterminer les phases pour chaque semaine
     phases = []
     for week in weeks:
-        week_start, _ = plan.get_week_dates(week)
+        week_start, _ = plan.get_week_dates(int(week))
         phase = None
         for day in range(7):
             day_date = week_start + timedelta(days=day)
@@ -803,9 +763,9 @@ def render_weekly_distance_by_type(
         lang: Code de langue
     """
     # Récupérer les séances de la semaine
-    sessions_by_week = plan.get_sessions_by_week()
+    week_sessions = plan.get_week_sessions(week_num)
 
-    if week_num not in sessions_by_week:
+    if not week_sessions:
         st.warning(translate("no_data_available", "charts"))
         return
 
@@ -820,7 +780,7 @@ def render_weekly_distance_by_type(
         SessionType.RACE: "#FDD835"       # Jaune
     }
 
-    for session in sessions_by_week[week_num]:
+    for session in week_sessions:
         if session.session_type == SessionType.REST:
             continue
 
@@ -3,6 +3,7 @@ import hashlib
 import io
 import json
 from datetime import date
+from typing import Optional
 
 import streamlit as st
 
@@ -24,6 +25,55 @@ from utils.date_utils import format_date
 from utils.i18n import _ as translate
 from utils.time_converter import format_timedelta
 
+# Options par défaut simples pour les exports rapides
+ICS_QUICK_OPTIONS = {
+    "include_rest_days": False,
+    "reminder_time": 30,
+    "start_time": 18,
+    "ics_calendar_name": "All-in-Run Plan"
+}
+PDF_QUICK_OPTIONS = {
+    "include_charts": True,
+    "include_details": True,
+    "paper_size": "A4",
+    "orientation": "portrait"
+}
+
+
+def export_plan(plan_controller: PlanController, export_format: str, options: dict = None) -> Optional[bytes]:
+    """
+    Exporte le plan courant dans un format (voir PlanController.export_all)
+
+    Args:
+        plan_controller: Contrôleur du plan d'entraînement
+        export_format: Format d'export (ics, tcx, pdf, json)
+        options: Options du format
+
+    Returns:
+        Contenu exporté ou None si aucun plan n'est disponible
+    """
+    exports = plan_controller.export_all([export_format], options={export_format: options})
+    return exports[export_format] if exports else None
+
+
+def handle_export_all(plan_controller: PlanController):
+    """
+    Gestionnaire pour l'export de tous les formats en une archive ZIP
+
+    Args:
+        plan_controller: Contrôleur du plan d'entraînement
+    """
+    zip_data = plan_controller.export_all(options={
+        "ics": ICS_QUICK_OPTIONS,
+        "pdf": PDF_QUICK_OPTIONS
+    }, as_zip=True)
+
+    if zip_data:
+        # Créer un lien de téléchargement
+        b64 = base64.b64encode(zip_data).decode()
+        href = f'<a href="data:application/zip;base64,{b64}" download="training_plan.zip">{translate("download_all", "plan_page")}</a>'
+        st.markdown(href, unsafe_allow_html=True)
+
 
 def handle_export_ics(plan_controller: PlanController):
     """
@@ -32,15 +82,7 @@ def handle_export_ics(plan_controller: PlanController):
     Args:
         plan_controller: Contrôleur du plan d'entraînement
     """
-    # Options par défaut simples pour l'export simple
-    options = {
-        "include_rest_days": False,
-        "reminder_time": 30,
-        "start_time": 18,
-        "ics_calendar_name": "All-in-Run Plan"
-    }
-
-    ics_data = plan_controller.export_to_ics(options=options)
+    ics_data = export_plan(plan_controller, "ics", ICS_QUICK_OPTIONS)
 
     if ics_data:
         # Créer un lien de téléchargement
@@ -56,7 +98,7 @@ def handle_export_tcx(plan_controller: PlanController):
     Args:
         plan_controller: Contrôleur du plan d'entraînement
     """
-    tcx_data = plan_controller.export_to_tcx()
+    tcx_data = export_plan(plan_controller, "tcx")
 
     if tcx_data:
         # Créer un lien de téléchargement
@@ -72,15 +114,7 @@ def handle_export_pdf(plan_controller: PlanController):
     Args:
         plan_controller: Contrôleur du plan d'entraînement
     """
-    # Options par défaut simples pour l'export simple
-    options = {
-        "include_charts": True,
-        "include_details": True,
-        "paper_size": "A4",
-        "orientation": "portrait"
-    }
-
-    pdf_data = plan_controller.export_to_pdf(options=options)
+    pdf_data = export_plan(plan_controller, "pdf", PDF_QUICK_OPTIONS)
 
     if pdf_data:
         # Créer un lien de téléchargement
@@ -96,11 +130,11 @@ def handle_export_json(plan_controller: PlanController):
     Args:
         plan_controller: Contrôleur du plan d'entraînement
     """
-    json_data = plan_controller.export_to_json()
+    json_data = export_plan(plan_controller, "json")
 
     if json_data:
         # Créer un lien de téléchargement
-        b64 = base64.b64encode(json_data.encode()).decode()
+        b64 = base64.b64encode(json_data).decode()
         href = f'<a href="data:application/json;base64,{b64}" download="training_plan.json">{translate("download_json", "plan_page")}</a>'
         st.markdown(href, unsafe_allow_html=True)
 
@@ -294,7 +328,7 @@ def render_export_import_section(plan_controller: PlanController):
         "ICS/Calendrier", "PDF", "Données", "Garmin"
     ])
 
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
         # Export ICS
@@ -316,6 +350,11 @@ def render_export_import_section(plan_controller: PlanController):
         if st.button(translate("export_tcx", "plan_page")):
             handle_export_tcx(plan_controller)
 
+    with col5:
+        # Export de tous les formats (produits en parallèle)
+        if st.button(translate("export_all", "plan_page")):
+            handle_export_all(plan_controller)
+
     # Import JSON
     st.subheader(translate("import_plan", "plan_page"))
 
@@ -530,7 +569,7 @@ def render_export_view(plan_controller):
                     "ics_calendar_name": calendar_name
                 }
 
-                ics_data = plan_controller.export_to_ics(options=ics_options)
+                ics_data = export_plan(plan_controller, "ics", ics_options)
 
                 if ics_data:
                     # Créer un lien de téléchargement
@@ -594,7 +633,7 @@ def render_export_view(plan_controller):
                     "orientation": orientation.lower() if isinstance(orientation, str) else "portrait"
                 }
 
-                pdf_data = plan_controller.export_to_pdf(options=pdf_options)
+                pdf_data = export_plan(plan_controller, "pdf", pdf_options)
 
                 if pdf_data:
                     # Créer un lien de téléchargement
@@ -714,12 +753,11 @@ def render_export_view(plan_controller):
                 with col1:
                     if st.button(translate("export_to_json", "plan_page"), use_container_width=True):
                         with st.spinner(translate("generating_json", "plan_page")):
-                            json_data = plan_controller.export_to_json()
+                            json_data = export_plan(plan_controller, "json")
 
                             if json_data:
                                 # Créer un lien de téléchargement
-                                b64 = base64.b64encode(
-                                    json_data.encode('utf-8')).decode()
+                                b64 = base64.b64encode(json_data).decode()
                                 filename = "plan_entrainement.json"
                                 href = f'<a href="data:application/json;base64,{b64}" download="{filename}" class="download-link">{translate("download_json", "plan_page")}</a>'
 
@@ -764,7 +802,7 @@ def render_export_view(plan_controller):
 
             if st.button(translate("export_to_tcx", "plan_page"), use_container_width=True):
                 with st.spinner(translate("generating_tcx", "plan_page")):
-                    tcx_data = plan_controller.export_to_tcx()
+                    tcx_data = export_plan(plan_controller, "tcx")
 
                     if tcx_data:
                         # Créer un lien de téléchargement
@@ -794,8 +832,7 @@ def render_export_view(plan_controller):
                         "start_time": 18
                     }
 
-                    apple_ics_data = plan_controller.export_to_ics(
-                        options=apple_options)
+                    apple_ics_data = export_plan(plan_controller, "ics", apple_options)
 
                     if apple_ics_data:
                         # Créer un lien de téléchargement
@@ -830,7 +867,7 @@ def render_export_view(plan_controller):
     with upload_col:
         uploaded_file = st.file_uploader(
             translate("upload_json", "plan_page"),
-            type=["json"],
+            type=["json", "plan"],
             help=translate("upload_json_help", "plan_page")
         )
 
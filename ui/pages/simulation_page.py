@@ -36,12 +36,16 @@ def handle_simulation():
     st.session_state["run_simulation"] = True
 
 
-def handle_keep_simulation():
+def handle_keep_simulation(plan_controller: PlanController):
     """
     Gestionnaire pour conserver la simulation comme plan principal
+
+    Args:
+        plan_controller: Contrôleur du plan
     """
     if "simulated_plan" in st.session_state:
-        st.session_state["current_plan"] = st.session_state["simulated_plan"]
+        kept_plan = plan_controller.keep_simulation(st.session_state["simulated_plan"])
+        st.session_state["current_plan"] = kept_plan
         del st.session_state["simulated_plan"]
         st.session_state["page"] = "plan_view"
         st.rerun()
@@ -243,9 +247,12 @@ def render_custom_simulation_form():
         )
 
 
-def render_comparison_view():
+def render_comparison_view(plan_controller: PlanController):
     """
     Affiche la vue de comparaison entre le plan original et le plan simulé
+
+    Args:
+        plan_controller: Contrôleur du plan
     """
     st.header(translate("comparison", "simulation_page"))
 
@@ -314,7 +321,8 @@ def render_comparison_view():
     # Bouton pour conserver la simulation comme plan principal
     st.button(
         translate("keep_simulation", "simulation_page"),
-        on_click=handle_keep_simulation
+        on_click=handle_keep_simulation,
+        args=(plan_controller,)
     )
 
 
@@ -368,7 +376,7 @@ def render_simulation_page(
 
     # Afficher la comparaison si un plan simulé existe
     if "simulated_plan" in st.session_state:
-        render_comparison_view()
+        render_comparison_view(plan_controller)
 
     # Bouton pour retourner à la page du plan
     st.divider()
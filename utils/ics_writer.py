@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+# Longueur maximale d'une ligne de contenu, fin de ligne exclue (RFC 5545, 3.1)
+MAX_LINE_OCTETS = 75
+
+# Taille (octets) au-delà de laquelle le tampon est écrit dans la destination
+FLUSH_SIZE = 64 * 1024
+
+Parameters = Sequence[Tuple[str, str]]
+
+
+def escape_text(value: str) -> str:
+    """
+    Échappe une valeur de type TEXT (RFC 5545, 3.3.11)
+
+    Args:
+        value: Texte à échapper
+
+    Returns:
+        Texte avec \\, ;, , et les retours à la ligne échappés
+    """
+    return (value.replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n"))
+
+
+def fold_line(line: str) -> bytes:
+    """
+    Encode une ligne de contenu et la replie à 75 octets (RFC 5545, 3.1)
+
+    Les lignes de continuation commencent par une espace; un caractère
+    multi-octets n'est jamais coupé.
+
+    Args:
+        line: Ligne de contenu, sans fin de ligne
+
+    Returns:
+        Ligne encodée en UTF-8, terminée par CRLF
+    """
+    data = line.encode("utf-8")
+    if len(data) <= MAX_LINE_OCTETS:
+        return data + b"\r\n"
+
+    parts = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while len(data) - start > limit:
+        end = start + limit
+        # Reculer jusqu'au début d'un caractère (octets de continuation: 10xxxxxx)
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start = end
+        # L'espace de continuation compte dans la longueur de la ligne
+        limit = MAX_LINE_OCTETS - 1
+    parts.append(data[start:])
+
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def format_datetime_utc(value: datetime) -> str:
+    """Formate une date et heure au format DATE-TIME UTC (ex: 20250114T180000Z)"""
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_duration(value: timedelta) -> str:
+    """
+    Formate une durée au format DURATION (RFC 5545, 3.3.6)
+
+    Args:
+        value: Durée (éventuellement négative)
+
+    Returns:
+        Durée formatée (ex: PT1H15M, -PT30M, P1DT2H)
+    """
+    sign = "-" if value < timedelta(0) else ""
+    total_seconds = int(abs(value).total_seconds())
+    days, remainder = divmod(total_seconds, 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    time_part = "".join(f"{amount}{unit}" for amount, unit in ((hours, "H"), (minutes, "M"), (seconds, "S")) if amount)
+    if days:
+        return f"{sign}P{days}D" + (f"T{time_part}" if time_part else "")
+    return f"{sign}PT{time_part or '0S'}"
+
+
+class IcsWriter:
+    """
+    Écriture en flux d'un calendrier iCalendar (RFC 5545)
+
+    Chaque propriété est échappée, repliée et encodée dès son écriture;
+    aucune représentation intermédiaire des événements n'est construite.
+
+    Exemple:
+        writer = IcsWriter(sink)
+        writer.begin("VCALENDAR")
+        writer.text("SUMMARY", "Séance de seuil")
+        writer.end("VCALENDAR")
+        writer.flush()
+    """
+
+    def __init__(self, sink: BinaryIO):
+        """
+        Args:
+            sink: Destination ouverte en écriture binaire (fichier, BytesIO...)
+        """
+        self.sink = sink
+        self._parts: List[bytes] = []
+        self._size = 0
+
+    def property(self, name: str, value: str, parameters: Optional[Parameters] = None) -> None:
+        """
+        Écrit une propriété dont la valeur est déjà au format iCalendar
+
+        Args:
+            name: Nom de la propriété
+            value: Valeur formatée (non échappée)
+            parameters: Paramètres (nom, valeur) de la propriété
+        """
+        if parameters:
+            name += "".join(f";{key}={parameter}" for key, parameter in parameters)
+        line = fold_line(f"{name}:{value}")
+        self._parts.append(line)
+        self._size += len(line)
+        if self._size >= FLUSH_SIZE:
+            self.flush()
+
+    def text(self, name: str, value: str) -> None:
+        """Écrit une propriété de type TEXT (valeur échappée)"""
+        self.property(name, escape_text(value))
+
+    def begin(self, component: str) -> None:
+        """Ouvre un composant (VCALENDAR, VEVENT, VALARM...)"""
+        self.property("BEGIN", component)
+
+    def end(self, component: str) -> None:
+        """Ferme un composant"""
+        self.property("END", component)
+
+    def flush(self) -> None:
+        """Écrit le contenu en attente dans la destination"""
+        if self._parts:
+            self.sink.write(b"".join(self._parts))
+        self._parts = []
+        self._size = 0
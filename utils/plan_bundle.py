@@ -0,0 +1,264 @@
+import io
+import json
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+# Archive multi-plans (petit-boutiste):
+#   en-tête     MAGIC, version du format (u16), réservé (u16)
+#   plans       plans au format binaire (voir models.plan_binary), compressés
+#               un à un avec zlib pour permettre la lecture d'un plan isolé
+#   manifeste   JSON compact compressé: métadonnées, position et taille de chaque plan
+#   pied        position (u64) et taille (u32) du manifeste, puis MAGIC
+# L'archive s'écrit en flux (sans retour en arrière) et se lit en accès
+# direct à partir du pied.
+
+MAGIC = b"AIRB"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHH")
+FOOTER = struct.Struct("<QI4s")
+
+# Niveau de compression zlib des plans et du manifeste
+COMPRESSION_LEVEL = 6
+
+
+def is_plan_bundle(data: Union[bytes, bytearray, memoryview]) -> bool:
+    """
+    Indique si des données commencent par l'en-tête d'une archive de plans
+
+    Args:
+        data: Données (ou leurs premiers octets)
+
+    Returns:
+        True si les données sont une archive de plans
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def plan_metadata(plan) -> Dict[str, Any]:
+    """Métadonnées d'un plan conservées dans le manifeste"""
+    user_data = plan.user_data
+    return {
+        "start_date": user_data.start_date.isoformat(),
+        "race_date": user_data.main_race.race_date.isoformat(),
+        "race_type": user_data.main_race.race_type.value,
+        "weeks": user_data.total_weeks,
+        "total_volume": plan.get_total_volume(),
+        "sessions": len(plan.sessions)
+    }
+
+
+class PlanBundleWriter:
+    """
+    Écriture en flux d'une archive de plans
+
+    Chaque plan est encodé et écrit dès son ajout; seul le manifeste est
+    conservé en mémoire jusqu'à la fermeture. La destination n'a pas besoin
+    d'être positionnable (tube, réponse HTTP...).
+
+    Exemple:
+        with PlanBundleWriter("saison.airb") as writer:
+            for plan in plans:
+                writer.add(plan)
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], level: int = COMPRESSION_LEVEL):
+        """
+        Ouvre l'archive et écrit son en-tête
+
+        Args:
+            target: Chemin du fichier ou fichier ouvert en écriture binaire
+            level: Niveau de compression zlib (1 à 9)
+        """
+        if isinstance(target, str):
+            self._file = open(target, 'wb')
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+
+        self.level = level
+        self.entries: List[Dict[str, Any]] = []
+        self._position = 0
+        self._closed = False
+        self._write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._position += len(data)
+
+    def add(self, plan, name: Optional[str] = None) -> int:
+        """
+        Ajoute un plan à l'archive
+
+        Args:
+            plan: Plan d'entraînement
+            name: Nom du plan dans l'archive (facultatif)
+
+        Returns:
+            Position du plan dans l'archive (0-indexed)
+        """
+        if self._closed:
+            raise ValueError("Archive de plans déjà fermée")
+
+        data = zlib.compress(plan.to_bytes(), self.level)
+
+        entry = plan_metadata(plan)
+        entry.update(offset=self._position, length=len(data))
+        if name is not None:
+            entry["name"] = name
+
+        self._write(data)
+        self.entries.append(entry)
+        return len(self.entries) - 1
+
+    def close(self) -> None:
+        """Écrit le manifeste et le pied de l'archive"""
+        if self._closed:
+            return
+        self._closed = True
+
+        manifest = zlib.compress(
+            json.dumps({"plans": self.entries}, separators=(",", ":")).encode("utf-8"),
+            self.level
+        )
+        manifest_offset = self._position
+        self._write(manifest)
+        self._write(FOOTER.pack(manifest_offset, len(manifest), MAGIC))
+
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> 'PlanBundleWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None and self._owns_file:
+            # Archive incomplète: ne pas écrire de manifeste
+            self._closed = True
+            self._file.close()
+            return
+        self.close()
+
+
+class PlanBundleReader:
+    """
+    Lecture en accès direct d'une archive de plans
+
+    Seuls le pied et le manifeste sont lus à l'ouverture: les métadonnées
+    (entries) sont disponibles sans décoder les plans, et chaque plan est
+    lu et décompressé à la demande.
+    """
+
+    def __init__(self, source: Union[str, bytes, BinaryIO]):
+        """
+        Ouvre une archive de plans
+
+        Args:
+            source: Chemin du fichier, contenu de l'archive ou fichier
+                    positionnable ouvert en lecture binaire
+
+        Raises:
+            ValueError: Si les données ne sont pas une archive de plans valide
+        """
+        if isinstance(source, str):
+            self._file = open(source, 'rb')
+            self._owns_file = True
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._file = io.BytesIO(source)
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+
+        try:
+            self.entries = self._read_manifest()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_manifest(self) -> List[Dict[str, Any]]:
+        """Lit et vérifie l'en-tête, le pied et le manifeste"""
+        self._file.seek(0)
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Archive de plans tronquée")
+
+        magic, version, _ = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Données non reconnues comme une archive de plans")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Version d'archive non supportée: {version}")
+
+        self._file.seek(0, 2)
+        size = self._file.tell()
+        if size < HEADER.size + FOOTER.size:
+            raise ValueError("Archive de plans tronquée")
+
+        self._file.seek(size - FOOTER.size)
+        manifest_offset, manifest_length, end_magic = FOOTER.unpack(self._file.read(FOOTER.size))
+        if end_magic != MAGIC or manifest_offset + manifest_length != size - FOOTER.size:
+            raise ValueError("Archive de plans tronquée ou incomplète")
+
+        self._file.seek(manifest_offset)
+        try:
+            manifest = json.loads(zlib.decompress(self._file.read(manifest_length)).decode("utf-8"))
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Manifeste d'archive corrompu: {e}")
+
+        return manifest["plans"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def read_bytes(self, index: int) -> bytes:
+        """
+        Lit un plan au format binaire, sans le décoder
+
+        Args:
+            index: Position du plan dans l'archive (0-indexed)
+
+        Returns:
+            Plan au format binaire (voir TrainingPlan.to_bytes)
+
+        Raises:
+            ValueError: Si les données du plan sont corrompues
+        """
+        entry = self.entries[index]
+        self._file.seek(entry["offset"])
+        try:
+            return zlib.decompress(self._file.read(entry["length"]))
+        except zlib.error as e:
+            raise ValueError(f"Plan {index} de l'archive corrompu: {e}")
+
+    def load(self, index: int, trusted: bool = False):
+        """
+        Lit et décode un plan
+
+        Args:
+            index: Position du plan dans l'archive (0-indexed)
+            trusted: Chargement de confiance (voir TrainingPlan.from_bytes)
+
+        Returns:
+            Plan d'entraînement
+        """
+        from models.plan import TrainingPlan
+
+        return TrainingPlan.from_bytes(self.read_bytes(index), trusted=trusted)
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self.entries)):
+            yield self.load(index)
+
+    def close(self) -> None:
+        """Ferme le fichier de l'archive s'il a été ouvert par le lecteur"""
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> 'PlanBundleReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,246 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .plan_bundle import plan_metadata
+
+# Catalogue de plans en lecture seule (petit-boutiste), destiné à être
+# projeté en mémoire et partagé entre processus:
+#   en-tête     MAGIC, version du format (u16), réservé (u16), nombre de plans (u32),
+#               position (u64) et taille (u32) des métadonnées
+#   table       position (u64) et taille (u32) de chaque plan, à position fixe
+#   plans       plans au format binaire non compressé (voir models.plan_binary),
+#               séances triées par date, alignés sur 8 octets
+#   métadonnées JSON compact: nom et métadonnées de chaque plan
+
+PLAN_CATALOG_FILENAME = "templates.catalog"
+
+MAGIC = b"AIRC"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHHIQI")
+ENTRY = struct.Struct("<QI")
+
+ALIGNMENT = 8
+
+
+def write_plan_catalog(path: str, plans: Iterable, names: Optional[Iterable[str]] = None) -> int:
+    """
+    Écrit un catalogue de plans
+
+    Le catalogue est écrit dans un fichier temporaire puis renommé: les
+    processus qui projettent l'ancien catalogue continuent de le lire
+    jusqu'à sa réouverture.
+
+    Args:
+        path: Chemin du catalogue
+        plans: Plans d'entraînement
+        names: Nom de chaque plan (par défaut "Plan 1", "Plan 2"...)
+
+    Returns:
+        Nombre de plans écrits
+    """
+    from models.plan import TrainingPlan
+
+    plans = list(plans)
+    names = list(names) if names is not None else [f"Plan {i + 1}" for i in range(len(plans))]
+    if len(names) != len(plans):
+        raise ValueError("Un nom est attendu pour chaque plan du catalogue")
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    table_end = HEADER.size + ENTRY.size * len(plans)
+
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b"\0" * table_end)
+            position = table_end
+
+            table = []
+            metadata = []
+            for plan, name in zip(plans, names):
+                padding = -position % ALIGNMENT
+                f.write(b"\0" * padding)
+                position += padding
+
+                # Séances triées par date: les recherches par date se font par dichotomie
+                sorted_plan = TrainingPlan(
+                    user_data=plan.user_data,
+                    sessions=dict(sorted(plan.sessions.items())),
+                    phase_dates=plan.phase_schedule,
+                    weekly_volumes=plan.weekly_volumes,
+                    version=plan.version
+                )
+                data = sorted_plan.to_bytes()
+                f.write(data)
+
+                table.append(ENTRY.pack(position, len(data)))
+                metadata.append({"name": name, **plan_metadata(plan)})
+                position += len(data)
+
+            metadata_data = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+            f.write(metadata_data)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(plans), position, len(metadata_data)))
+            f.write(b"".join(table))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return len(plans)
+
+
+class PlanCatalog:
+    """
+    Catalogue de plans projeté en mémoire, en lecture seule
+
+    Les plans sont renvoyés sous forme de MappedTrainingPlan qui lisent
+    leurs séances dans la projection: ouvrir plusieurs fois le même plan, ou
+    le même catalogue depuis plusieurs processus, ne duplique pas les
+    données des séances (elles restent dans le cache de pages du système).
+    La somme de contrôle de chaque plan est vérifiée une fois par catalogue
+    ouvert.
+    """
+
+    def __init__(self, path: str):
+        """
+        Ouvre et projette un catalogue
+
+        Args:
+            path: Chemin du catalogue
+
+        Raises:
+            ValueError: Si le fichier n'est pas un catalogue valide
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if stat.st_size < HEADER.size:
+                raise ValueError("Catalogue de plans tronqué")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._view = memoryview(self._mmap)
+        self._verified: Set[int] = set()
+        self._lock = threading.Lock()
+
+        try:
+            self.entries = self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self) -> List[Dict[str, Any]]:
+        """Lit l'en-tête, la table des plans et leurs métadonnées"""
+        magic, version, _, count, metadata_offset, metadata_length = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ValueError("Données non reconnues comme un catalogue de plans")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Version de catalogue non supportée: {version}")
+        if metadata_offset + metadata_length != len(self._view):
+            raise ValueError("Catalogue de plans tronqué ou incomplet")
+
+        metadata = json.loads(str(self._view[metadata_offset:metadata_offset + metadata_length], "utf-8"))
+
+        entries = []
+        for index, (entry, (offset, length)) in enumerate(
+                zip(metadata, ENTRY.iter_unpack(self._view[HEADER.size:HEADER.size + ENTRY.size * count]))):
+            if offset + length > metadata_offset:
+                raise ValueError(f"Plan {index} du catalogue hors limites")
+            entries.append({**entry, "index": index, "offset": offset, "length": length})
+
+        return entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find(self, name: str) -> Optional[int]:
+        """
+        Recherche un plan par son nom
+
+        Args:
+            name: Nom du plan
+
+        Returns:
+            Position du plan dans le catalogue ou None
+        """
+        for entry in self.entries:
+            if entry["name"] == name:
+                return entry["index"]
+        return None
+
+    def plan_bytes(self, index: int) -> memoryview:
+        """
+        Vue (sans copie) sur un plan au format binaire
+
+        Args:
+            index: Position du plan dans le catalogue
+
+        Returns:
+            Plan au format binaire
+        """
+        entry = self.entries[index]
+        return self._view[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def load(self, index: int, trusted: bool = True):
+        """
+        Ouvre un plan du catalogue
+
+        Chaque appel renvoie un nouveau plan (modifiable sans affecter les
+        autres lecteurs), qui partage les données de la projection.
+
+        Args:
+            index: Position du plan dans le catalogue
+            trusted: Si True, les données utilisateur ne sont pas revalidées
+
+        Returns:
+            Plan d'entraînement (MappedTrainingPlan)
+
+        Raises:
+            ValueError: Si le plan est corrompu
+        """
+        from models.mapped_plan import MappedTrainingPlan
+
+        with self._lock:
+            verify = index not in self._verified
+
+        plan = MappedTrainingPlan(self.plan_bytes(index), trusted=trusted, verify=verify)
+
+        if verify:
+            with self._lock:
+                self._verified.add(index)
+        return plan
+
+    def is_stale(self) -> bool:
+        """Indique si le fichier du catalogue a été remplacé depuis son ouverture"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self.signature
+
+    def close(self) -> None:
+        """
+        Libère la projection
+
+        Si des plans ouverts y font encore référence, la projection est
+        libérée avec le dernier d'entre eux.
+        """
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> 'PlanCatalog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,684 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Nom de la base des plans dans le répertoire de stockage
+PLAN_STORE_FILENAME = "plans.db"
+
+# Formats de corps de plan acceptés: plan entier en JSON ou binaire, ou
+# "chunked" (séances stockées une seule fois, adressées par leur empreinte)
+PLAN_FORMATS = ("json", "binary", "chunked")
+
+# Nombre de suppressions après lequel l'espace libéré est récupéré en arrière-plan
+COMPACT_AFTER_DELETES = 32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    race_date TEXT NOT NULL,
+    race_type TEXT NOT NULL,
+    weeks INTEGER NOT NULL,
+    total_volume REAL NOT NULL,
+    format TEXT NOT NULL,
+    source TEXT UNIQUE,
+    body BLOB NOT NULL,
+    manifest TEXT
+);
+CREATE INDEX IF NOT EXISTS plans_created_at ON plans (created_at, id);
+CREATE INDEX IF NOT EXISTS plans_race_date ON plans (race_date);
+CREATE INDEX IF NOT EXISTS plans_race_type ON plans (race_type, created_at);
+CREATE TABLE IF NOT EXISTS store_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS manifests (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS manifest_chunks (
+    manifest TEXT NOT NULL,
+    chunk TEXT NOT NULL,
+    PRIMARY KEY (manifest, chunk)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS manifest_chunks_chunk ON manifest_chunks (chunk);
+"""
+
+# Index créés après la mise à jour du schéma des bases existantes
+SCHEMA_INDEXES = """
+CREATE INDEX IF NOT EXISTS plans_manifest ON plans (manifest);
+"""
+
+# Colonnes de métadonnées renvoyées par list_plans (sans le corps du plan)
+METADATA_COLUMNS = ("id", "created_at", "start_date", "race_date", "race_type", "weeks", "total_volume")
+
+
+class PlanStore:
+    """
+    Base SQLite des plans sauvegardés
+
+    Chaque plan est une ligne de la table plans: ses métadonnées (date de
+    création, dates et type de course, nombre de semaines, volume total) sont
+    des colonnes indexées, et le plan sérialisé (JSON ou binaire) est conservé
+    en blob. Le listage ne lit donc jamais le corps des plans. La référence au
+    plan courant est conservée dans la table store_state.
+
+    Au format "chunked", le plan est stocké par adressage de contenu: chaque
+    séance est conservée une seule fois dans la table chunks, sous l'empreinte
+    SHA-256 de son contenu hors date, et le plan n'est plus qu'un manifeste
+    (données utilisateur, phases, volumes et empreinte de la séance de chaque
+    date). Des séances identiques à des dates différentes, comme les séances
+    d'un plan décalé dans le temps, partagent donc leur entrée. Sauvegarder un
+    plan légèrement modifié n'écrit que les séances modifiées, et un plan
+    identique à un plan déjà stocké n'écrit que sa ligne de métadonnées.
+
+    Chaque opération ouvre sa propre connexion, ce qui permet de partager la
+    base entre threads et processus. Les écritures sont des transactions
+    journalisées (WAL) qui prennent le verrou d'écriture dès leur début et
+    sont synchronisées sur disque à la validation: un plan enregistré n'est
+    jamais perdu ni à moitié écrit, même avec plusieurs écrivains concurrents.
+    L'espace libéré par les suppressions est récupéré en arrière-plan.
+    """
+
+    def __init__(self, db_path: str, compact_after: int = COMPACT_AFTER_DELETES):
+        """
+        Initialise la base (créée si elle n'existe pas)
+
+        Args:
+            db_path: Chemin du fichier SQLite
+            compact_after: Nombre de suppressions déclenchant un compactage en
+                           arrière-plan (0 = jamais)
+        """
+        self.db_path = db_path
+        self.compact_after = compact_after
+
+        self._deletes = 0
+        self._compaction: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with self._connect() as conn:
+            # auto_vacuum n'est pris en compte qu'à la création de la base
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+            # Bases créées avant le stockage adressé par contenu
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(plans)")}
+            if "manifest" not in columns:
+                conn.execute("ALTER TABLE plans ADD COLUMN manifest TEXT")
+            conn.executescript(SCHEMA_INDEXES)
+
+    @contextmanager
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Ouvre une connexion à la base
+
+        Args:
+            write: Si True, ouvre une transaction d'écriture (BEGIN IMMEDIATE),
+                   validée en fin de bloc et annulée en cas d'erreur
+
+        Yields:
+            Connexion SQLite
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=FULL")
+            if not write:
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def save_plan(self, plan, plan_format: str = "json", make_current: bool = True,
+                  created_at: Optional[datetime] = None, source: Optional[str] = None) -> int:
+        """
+        Enregistre un plan
+
+        L'insertion et la mise à jour du plan courant sont faites dans la même
+        transaction.
+
+        Args:
+            plan: Plan d'entraînement
+            plan_format: Format du corps du plan ("json" ou "binary")
+            make_current: Si True, le plan devient le plan courant
+            created_at: Date de création (None = maintenant)
+            source: Nom du fichier d'origine (plans migrés)
+
+        Returns:
+            Identifiant du plan
+        """
+        if plan_format not in PLAN_FORMATS:
+            raise ValueError(f"Format de plan inconnu: {plan_format}")
+
+        manifest = None
+        if plan_format == "chunked":
+            body = b""
+            manifest, manifest_data, chunks = split_plan(plan)
+        elif plan_format == "binary":
+            body = plan.to_bytes()
+        else:
+            body = plan.to_json(checksum=True).encode("utf-8")
+
+        created_at = created_at or datetime.now()
+        user_data = plan.user_data
+
+        with self._connect(write=True) as conn:
+            if manifest is not None:
+                self._insert_manifest(conn, manifest, manifest_data, chunks)
+
+            cursor = conn.execute(
+                "INSERT INTO plans (created_at, start_date, race_date, race_type, weeks, "
+                "total_volume, format, source, body, manifest) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                 user_data.start_date.isoformat(),
+                 user_data.main_race.race_date.isoformat(),
+                 user_data.main_race.race_type.value,
+                 user_data.total_weeks,
+                 plan.get_total_volume(),
+                 plan_format,
+                 source,
+                 sqlite3.Binary(body),
+                 manifest)
+            )
+            plan_id = cursor.lastrowid
+
+            if make_current:
+                self._set_current(conn, plan_id)
+
+        return plan_id
+
+    def _insert_manifest(self, conn: sqlite3.Connection, manifest: str, manifest_data: bytes,
+                         chunks: Dict[str, bytes]) -> None:
+        """
+        Enregistre un manifeste et ses séances absents de la base (transaction en cours)
+
+        Un manifeste déjà présent n'écrit rien; sinon seules les séances
+        inconnues sont écrites.
+        """
+        if conn.execute("SELECT 1 FROM manifests WHERE hash = ?", (manifest,)).fetchone() is not None:
+            return
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO chunks (hash, data) VALUES (?, ?)",
+            [(chunk, sqlite3.Binary(data)) for chunk, data in chunks.items()]
+        )
+        conn.executemany(
+            "INSERT INTO manifest_chunks (manifest, chunk) VALUES (?, ?)",
+            [(manifest, chunk) for chunk in chunks]
+        )
+        conn.execute("INSERT INTO manifests (hash, data) VALUES (?, ?)",
+                     (manifest, sqlite3.Binary(manifest_data)))
+
+    def load_plan(self, plan_id: int, trusted: bool = True):
+        """
+        Charge un plan
+
+        Args:
+            plan_id: Identifiant du plan
+            trusted: Si True, le plan n'est pas revalidé (seules la version et
+                     la somme de contrôle sont vérifiées)
+
+        Returns:
+            Plan d'entraînement ou None si le plan n'existe pas
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT body, manifest FROM plans WHERE id = ?", (plan_id,)).fetchone()
+            if row is None:
+                return None
+
+            body, manifest = row
+            if manifest is None:
+                return decode_plan_body(body, trusted)
+
+            manifest_row = conn.execute("SELECT data FROM manifests WHERE hash = ?", (manifest,)).fetchone()
+            chunks = dict(conn.execute(
+                "SELECT c.hash, c.data FROM manifest_chunks mc JOIN chunks c ON c.hash = mc.chunk "
+                "WHERE mc.manifest = ?", (manifest,)
+            ).fetchall())
+
+        if manifest_row is None:
+            raise ValueError(f"Manifeste du plan {plan_id} introuvable")
+
+        return join_plan(manifest, manifest_row[0], chunks, trusted)
+
+    def load_plan_lazy(self, plan_id: int, trusted: bool = True):
+        """
+        Charge un plan sans ses séances, qui sont lues à la demande semaine par semaine
+
+        Seuls les plans au format "chunked" sont chargés à la demande: le
+        manifeste sert d'index des séances. Les autres formats sont chargés
+        en entier.
+
+        Args:
+            plan_id: Identifiant du plan
+            trusted: Voir load_plan
+
+        Returns:
+            Plan (LazyTrainingPlan pour le format "chunked") ou None si le plan n'existe pas
+        """
+        from models.lazy_plan import LazyTrainingPlan
+        from models.plan import TrainingPlan
+        from models.session import Session
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT m.hash, m.data FROM plans p JOIN manifests m ON m.hash = p.manifest WHERE p.id = ?",
+                (plan_id,)
+            ).fetchone()
+
+        if row is None:
+            return self.load_plan(plan_id, trusted)
+
+        data = _read_manifest(*row)
+        session_index = {date.fromisoformat(session_date): chunk_hash
+                         for session_date, chunk_hash in data["sessions"].items()}
+
+        # Plan sans séances: données utilisateur, phases et volumes
+        data["sessions"] = {}
+        base = TrainingPlan.from_verified_dict(data) if trusted else TrainingPlan.from_dict(data)
+
+        def load_sessions(keys: Dict[date, str]) -> Dict[date, Session]:
+            hashes = sorted(set(keys.values()))
+            with self._connect() as conn:
+                chunks = dict(conn.execute(
+                    f"SELECT hash, data FROM chunks WHERE hash IN ({', '.join('?' * len(hashes))})",
+                    hashes
+                ).fetchall())
+
+            return {
+                session_date: Session.from_dict(_read_chunk(session_date.isoformat(), chunk_hash, chunks),
+                                                trusted=trusted)
+                for session_date, chunk_hash in keys.items()
+            }
+
+        return LazyTrainingPlan(
+            user_data=base.user_data,
+            phase_dates=base.phase_schedule,
+            weekly_volumes=base.weekly_volumes,
+            session_index=session_index,
+            load_sessions=load_sessions,
+            version=base.version
+        )
+
+    def load_current_plan(self, trusted: bool = True, lazy: bool = False):
+        """
+        Charge le plan courant
+
+        Args:
+            trusted: Voir load_plan
+            lazy: Si True, les séances sont chargées à la demande (voir load_plan_lazy)
+
+        Returns:
+            Plan d'entraînement ou None si aucun plan courant
+        """
+        plan_id = self.get_current_id()
+        if plan_id is None:
+            return None
+        if lazy:
+            return self.load_plan_lazy(plan_id, trusted)
+        return self.load_plan(plan_id, trusted)
+
+    def get_current_id(self) -> Optional[int]:
+        """
+        Retourne l'identifiant du plan courant
+
+        Returns:
+            Identifiant ou None si aucun plan courant
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM store_state WHERE key = 'current_plan'").fetchone()
+        return int(row[0]) if row is not None else None
+
+    def set_current(self, plan_id: int) -> None:
+        """
+        Définit le plan courant
+
+        Args:
+            plan_id: Identifiant du plan
+        """
+        with self._connect(write=True) as conn:
+            self._set_current(conn, plan_id)
+
+    def _set_current(self, conn: sqlite3.Connection, plan_id: int) -> None:
+        """Met à jour la référence au plan courant dans la transaction en cours"""
+        conn.execute(
+            "INSERT OR REPLACE INTO store_state (key, value) VALUES ('current_plan', ?)",
+            (str(plan_id),)
+        )
+
+    def list_plans(self, offset: int = 0, limit: Optional[int] = None,
+                   race_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Liste les métadonnées des plans, du plus récent au plus ancien
+
+        Args:
+            offset: Nombre de plans à sauter (pagination)
+            limit: Nombre maximal de plans renvoyés (None = tous)
+            race_type: Ne renvoyer que les plans de ce type de course
+
+        Returns:
+            Liste de dictionnaires de métadonnées (voir METADATA_COLUMNS)
+        """
+        query = f"SELECT {', '.join(METADATA_COLUMNS)} FROM plans"
+        params: List[Any] = []
+
+        if race_type is not None:
+            query += " WHERE race_type = ?"
+            params.append(race_type)
+
+        query += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [dict(zip(METADATA_COLUMNS, row)) for row in rows]
+
+    def count_plans(self, race_type: Optional[str] = None) -> int:
+        """
+        Compte les plans enregistrés
+
+        Args:
+            race_type: Ne compter que les plans de ce type de course
+
+        Returns:
+            Nombre de plans
+        """
+        with self._connect() as conn:
+            if race_type is None:
+                row = conn.execute("SELECT COUNT(*) FROM plans").fetchone()
+            else:
+                row = conn.execute("SELECT COUNT(*) FROM plans WHERE race_type = ?", (race_type,)).fetchone()
+        return row[0]
+
+    def delete_plan(self, plan_id: int) -> bool:
+        """
+        Supprime un plan (et la référence au plan courant s'il l'était)
+
+        Les séances qui ne sont plus référencées par aucun plan sont supprimées
+        par collect_garbage, appelé à chaque compactage.
+
+        Args:
+            plan_id: Identifiant du plan
+
+        Returns:
+            True si le plan existait
+        """
+        with self._connect(write=True) as conn:
+            deleted = conn.execute("DELETE FROM plans WHERE id = ?", (plan_id,)).rowcount
+            conn.execute(
+                "DELETE FROM store_state WHERE key = 'current_plan' AND value = ?",
+                (str(plan_id),)
+            )
+
+        if deleted:
+            with self._lock:
+                self._deletes += 1
+                due = self.compact_after and self._deletes >= self.compact_after
+            if due:
+                self.compact_in_background()
+
+        return deleted > 0
+
+    def collect_garbage(self) -> Dict[str, int]:
+        """
+        Supprime les manifestes et séances qui ne sont plus référencés par aucun plan
+
+        Returns:
+            Dictionnaire avec le nombre de manifestes et de séances supprimés
+        """
+        with self._connect(write=True) as conn:
+            manifests = conn.execute(
+                "DELETE FROM manifests WHERE hash NOT IN "
+                "(SELECT manifest FROM plans WHERE manifest IS NOT NULL)"
+            ).rowcount
+            conn.execute(
+                "DELETE FROM manifest_chunks WHERE manifest NOT IN (SELECT hash FROM manifests)"
+            )
+            chunks = conn.execute(
+                "DELETE FROM chunks WHERE hash NOT IN (SELECT chunk FROM manifest_chunks)"
+            ).rowcount
+
+        return {"manifests": manifests, "chunks": chunks}
+
+    def disk_usage(self) -> Dict[str, Any]:
+        """
+        Bilan de l'occupation de la base
+
+        Returns:
+            Dictionnaire avec le nombre de plans, de manifestes et de séances
+            stockées, la taille des données stockées (stored_bytes), la taille
+            qu'auraient les mêmes plans sans déduplication (logical_bytes), le
+            ratio de déduplication et la taille du fichier de la base
+        """
+        with self._connect() as conn:
+            plans, plan_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM plans").fetchone()
+            manifests, manifest_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM manifests").fetchone()
+            chunks, chunk_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM chunks").fetchone()
+            # Taille des plans adressés par contenu s'ils étaient stockés en entier
+            chunked_bytes, = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(m.data)), 0) FROM plans p JOIN manifests m ON m.hash = p.manifest"
+            ).fetchone()
+            chunked_bytes += conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(c.data)), 0) FROM plans p "
+                "JOIN manifest_chunks mc ON mc.manifest = p.manifest JOIN chunks c ON c.hash = mc.chunk"
+            ).fetchone()[0]
+            page_count, = conn.execute("PRAGMA page_count").fetchone()
+            page_size, = conn.execute("PRAGMA page_size").fetchone()
+
+        stored_bytes = plan_bytes + manifest_bytes + chunk_bytes
+        logical_bytes = plan_bytes + chunked_bytes
+
+        return {
+            "plans": plans,
+            "manifests": manifests,
+            "chunks": chunks,
+            "stored_bytes": stored_bytes,
+            "logical_bytes": logical_bytes,
+            "dedup_ratio": logical_bytes / stored_bytes if stored_bytes else 1.0,
+            "file_bytes": page_count * page_size
+        }
+
+    def compact(self) -> None:
+        """
+        Supprime les données non référencées, récupère l'espace libéré et vide
+        le journal WAL
+
+        Une base créée sans auto_vacuum incrémental est reconstruite (VACUUM).
+        """
+        with self._lock:
+            self._deletes = 0
+
+        self.collect_garbage()
+
+        with self._connect() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                conn.executescript("PRAGMA incremental_vacuum;")
+            else:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """
+        Lance compact dans un thread (sans effet si un compactage est en cours)
+
+        Returns:
+            Thread de compactage, ou None si un compactage était déjà en cours
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return None
+            self._compaction = threading.Thread(target=self._compact_quietly, daemon=True)
+            self._compaction.start()
+            return self._compaction
+
+    def _compact_quietly(self) -> None:
+        """Compacte la base en signalant les erreurs sans les propager"""
+        try:
+            self.compact()
+        except sqlite3.Error as e:
+            print(f"Erreur lors du compactage de la base des plans: {e}")
+
+    def find_source(self, source: str) -> Optional[int]:
+        """
+        Retourne l'identifiant du plan migré depuis un fichier
+
+        Args:
+            source: Nom du fichier d'origine
+
+        Returns:
+            Identifiant du plan ou None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT id FROM plans WHERE source = ?", (source,)).fetchone()
+        return row[0] if row is not None else None
+
+
+def decode_plan_body(body: bytes, trusted: bool = False):
+    """
+    Désérialise un plan au format JSON ou binaire (détecté d'après l'en-tête)
+
+    Les plans JSON écrits sans somme de contrôle sont toujours revalidés.
+
+    Args:
+        body: Plan sérialisé
+        trusted: Chargement de confiance (voir TrainingPlan.from_dict)
+
+    Returns:
+        Plan d'entraînement
+    """
+    from models.plan import TrainingPlan, has_plan_checksum
+    from models.plan_binary import is_binary_plan
+
+    if is_binary_plan(body):
+        return TrainingPlan.from_bytes(bytes(body), trusted=trusted)
+
+    plan_json = bytes(body).decode('utf-8')
+    return TrainingPlan.from_json(plan_json, trusted=trusted and has_plan_checksum(plan_json))
+
+
+def _content_hash(data: bytes) -> str:
+    """Empreinte SHA-256 (hexadécimale) d'un contenu"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def split_plan(plan) -> Tuple[str, bytes, Dict[str, bytes]]:
+    """
+    Découpe un plan en manifeste et séances adressées par leur empreinte
+
+    Chaque séance est sérialisée en JSON compact (avec ses agrégats), sans sa
+    date; le manifeste contient les données du plan hors séances, dont les
+    phases sous forme de plages (clé "phase_ranges": début et fin de chaque
+    phase), et, pour chaque date, l'empreinte de la séance.
+
+    Args:
+        plan: Plan d'entraînement
+
+    Returns:
+        Tuple (empreinte du manifeste, manifeste sérialisé, {empreinte: séance sérialisée})
+    """
+    data = plan.to_dict(aggregates=True)
+
+    chunks: Dict[str, bytes] = {}
+    session_hashes = {}
+    for session_date, session_data in data["sessions"].items():
+        del session_data["session_date"]
+        chunk = json.dumps(session_data, separators=(",", ":")).encode("utf-8")
+        chunk_hash = _content_hash(chunk)
+        chunks[chunk_hash] = chunk
+        session_hashes[session_date] = chunk_hash
+
+    data["sessions"] = session_hashes
+    del data["phase_dates"]
+    data["phase_ranges"] = {
+        phase.value: [start.isoformat(), end.isoformat()]
+        for phase, (start, end) in plan.phase_schedule.ranges.items()
+    }
+    manifest_data = json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    return _content_hash(manifest_data), manifest_data, chunks
+
+
+def join_plan(manifest: str, manifest_data: bytes, chunks: Dict[str, bytes], trusted: bool = False):
+    """
+    Reconstitue un plan à partir de son manifeste et de ses séances
+
+    L'empreinte de chaque partie est vérifiée: en chargement de confiance, le
+    plan n'est ensuite pas revalidé.
+
+    Args:
+        manifest: Empreinte du manifeste
+        manifest_data: Manifeste sérialisé
+        chunks: Séances sérialisées, indexées par empreinte
+        trusted: Chargement de confiance (voir TrainingPlan.from_dict)
+
+    Returns:
+        Plan d'entraînement
+
+    Raises:
+        ValueError: Si une partie est absente ou ne correspond pas à son empreinte
+    """
+    from models.plan import TrainingPlan
+
+    data = _read_manifest(manifest, manifest_data)
+    data["sessions"] = {
+        session_date: _read_chunk(session_date, chunk_hash, chunks)
+        for session_date, chunk_hash in data["sessions"].items()
+    }
+
+    if trusted:
+        return TrainingPlan.from_verified_dict(data)
+    return TrainingPlan.from_dict(data)
+
+
+def _read_manifest(manifest: str, manifest_data: bytes) -> Dict[str, Any]:
+    """
+    Vérifie l'empreinte d'un manifeste et le désérialise au format de
+    TrainingPlan.to_dict (hors séances)
+
+    Les plages de phases sont rendues par leurs seules bornes: le chargement
+    d'un plan ne retient que la première et la dernière date de chaque phase.
+    """
+    if _content_hash(bytes(manifest_data)) != manifest:
+        raise ValueError("Manifeste de plan corrompu (empreinte invalide)")
+    data = json.loads(bytes(manifest_data).decode("utf-8"))
+    if "phase_ranges" in data:
+        data["phase_dates"] = data.pop("phase_ranges")
+    return data
+
+
+def _read_chunk(session_date: str, chunk_hash: str, chunks: Dict[str, bytes]) -> Dict[str, Any]:
+    """Vérifie l'empreinte d'une séance, la désérialise et lui attribue sa date"""
+    chunk = chunks.get(chunk_hash)
+    if chunk is None:
+        raise ValueError(f"Séance du {session_date} introuvable")
+    if _content_hash(bytes(chunk)) != chunk_hash:
+        raise ValueError(f"Séance du {session_date} corrompue (empreinte invalide)")
+    session_data = json.loads(bytes(chunk).decode("utf-8"))
+    session_data["session_date"] = session_date
+    return session_data
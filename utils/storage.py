@@ -1,101 +1,220 @@
 import json
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Dict, Any, Iterable, Optional, List
 
 import streamlit as st
 
+from .plan_catalog import PLAN_CATALOG_FILENAME, PlanCatalog, write_plan_catalog
+from .plan_store import PLAN_FORMATS, PLAN_STORE_FILENAME, PlanStore, decode_plan_body
+
+
+# Numéros de révision (SEQUENCE) des événements ICS publiés, par plan
+ICS_SEQUENCES_FILENAME = "ics_sequences.json"
+
+# Extensions des anciens fichiers de plan (un fichier par plan), repris par migrate_plan_files
+PLAN_FILE_EXTENSIONS = {"json": ".json", "binary": ".plan"}
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Écrit un fichier JSON de façon atomique
+
+    Le contenu est écrit dans un fichier temporaire du même répertoire,
+    synchronisé sur disque puis renommé: un lecteur concurrent voit soit
+    l'ancien fichier, soit le nouveau, jamais un fichier partiel.
+
+    Args:
+        path: Chemin du fichier
+        data: Données sérialisables en JSON
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 
 class StorageManager:
     """Gestionnaire de stockage local pour l'application"""
 
-    def __init__(self, use_session_state: bool = True):
+    def __init__(self, use_session_state: bool = True, plan_format: str = "chunked",
+                 trusted_load: bool = True):
         """
         Initialise le gestionnaire de stockage
 
         Args:
             use_session_state: Si True, utilise st.session_state comme stockage,
-                              sinon utilise des fichiers locaux
+                              sinon utilise des fichiers locaux (les plans sont
+                              conservés dans une base SQLite, voir PlanStore)
+            plan_format: Format d'écriture des plans ("chunked": séances dédupliquées
+                         par adressage de contenu, "json" ou "binary": plan entier);
+                         à la lecture, le format est détecté automatiquement
+            trusted_load: Si True, les plans relus ne sont pas revalidés (seules la
+                          version et la somme de contrôle sont vérifiées); les
+                          fichiers JSON sans somme de contrôle sont toujours revalidés
         """
+        if plan_format not in PLAN_FORMATS:
+            raise ValueError(f"Format de plan inconnu: {plan_format}")
+
         self.use_session_state = use_session_state
+        self.plan_format = plan_format
+        self.trusted_load = trusted_load
         self.storage_dir = os.path.join(os.path.expanduser("~"), ".all_in_run")
 
         # Créer le répertoire de stockage s'il n'existe pas
         if not self.use_session_state and not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
 
-    def save_plan(self, plan) -> None:
+        self._plan_store: Optional[PlanStore] = None
+        self._plan_catalog: Optional[PlanCatalog] = None
+        self._catalog_lock = threading.Lock()
+        self._sequences_lock = threading.Lock()
+
+    def cache_dir(self, name: str) -> str:
         """
-        Sauvegarde un plan d'entraînement
+        Répertoire d'un cache persistant du processus (exports, plans générés)
 
         Args:
-            plan: Plan d'entraînement à sauvegarder
+            name: Nom du cache
+
+        Returns:
+            Chemin du répertoire, sous le répertoire de stockage (créé par le cache)
         """
-        # Import moved here to avoid circular import
-        from models.plan import TrainingPlan
+        return os.path.join(self.storage_dir, "cache", name)
 
-        if self.use_session_state:
-            # Utiliser st.session_state pour stocker le plan
-            st.session_state["current_plan"] = plan
-        else:
-            # Utiliser un fichier local pour stocker le plan
-            plan_data = plan.to_dict()
-            filename = f"plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            filepath = os.path.join(self.storage_dir, filename)
+    @property
+    def plan_store(self) -> PlanStore:
+        """Base des plans sauvegardés (ouverte à la première utilisation)"""
+        if self._plan_store is None or os.path.dirname(self._plan_store.db_path) != self.storage_dir:
+            self._plan_store = PlanStore(os.path.join(self.storage_dir, PLAN_STORE_FILENAME))
+        return self._plan_store
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(plan_data, f, indent=2)
+    @property
+    def plan_catalog(self) -> Optional[PlanCatalog]:
+        """
+        Catalogue des plans modèles, projeté en mémoire et partagé par toutes
+        les sessions du processus (rouvert s'il a été republié)
 
-            # Sauvegarder également la référence au plan courant
-            current_plan_ref = {"filename": filename}
-            current_plan_path = os.path.join(
-                self.storage_dir, "current_plan.json")
+        Returns:
+            Catalogue ou None s'il n'a pas été publié
+        """
+        path = os.path.join(self.storage_dir, PLAN_CATALOG_FILENAME)
 
-            with open(current_plan_path, 'w', encoding='utf-8') as f:
-                json.dump(current_plan_ref, f, indent=2)
+        with self._catalog_lock:
+            catalog = self._plan_catalog
+            if catalog is None or catalog.path != path or catalog.is_stale():
+                if catalog is not None:
+                    catalog.close()
+                self._plan_catalog = catalog = PlanCatalog(path) if os.path.exists(path) else None
+            return catalog
 
-    def load_plan(self) -> Optional['TrainingPlan']:
+    def publish_template_plans(self, plans: Iterable, names: Optional[Iterable[str]] = None) -> int:
         """
-        Charge le plan d'entraînement courant
+        Publie les plans modèles (remplace le catalogue existant)
+
+        Args:
+            plans: Plans d'entraînement
+            names: Nom de chaque plan
 
         Returns:
-            Plan d'entraînement ou None si aucun plan n'est stocké
+            Nombre de plans publiés
         """
-        # Import moved here to avoid circular import
-        from models.plan import TrainingPlan
+        os.makedirs(self.storage_dir, exist_ok=True)
+        return write_plan_catalog(os.path.join(self.storage_dir, PLAN_CATALOG_FILENAME), plans, names)
 
-        if self.use_session_state:
-            # Récupérer le plan depuis st.session_state
-            return st.session_state.get("current_plan")
-        else:
-            # Récupérer le plan depuis un fichier local
-            current_plan_path = os.path.join(
-                self.storage_dir, "current_plan.json")
+    def list_template_plans(self) -> List[Dict[str, Any]]:
+        """
+        Liste les plans modèles du catalogue, sans les décoder
 
-            if not os.path.exists(current_plan_path):
+        Returns:
+            Liste des plans modèles avec métadonnées (index, name, start_date,
+            race_date, race_type, weeks, total_volume, sessions)
+        """
+        try:
+            catalog = self.plan_catalog
+        except (OSError, ValueError) as e:
+            print(f"Erreur lors de l'ouverture du catalogue de plans: {e}")
+            return []
+
+        if catalog is None:
+            return []
+        return [{key: value for key, value in entry.items() if key not in ("offset", "length")}
+                for entry in catalog.entries]
+
+    def load_template_plan(self, index: int) -> Optional['TrainingPlan']:
+        """
+        Charge un plan modèle du catalogue
+
+        Le plan lit ses séances dans le catalogue projeté en mémoire: les
+        sessions qui consultent le même modèle en partagent les données.
+
+        Args:
+            index: Position du plan dans le catalogue (voir list_template_plans)
+
+        Returns:
+            Plan d'entraînement (MappedTrainingPlan) ou None en cas d'erreur
+        """
+        try:
+            catalog = self.plan_catalog
+            if catalog is None:
                 return None
+            return catalog.load(index, trusted=self.trusted_load)
 
-            try:
-                with open(current_plan_path, 'r', encoding='utf-8') as f:
-                    current_plan_ref = json.load(f)
+        except (OSError, ValueError, IndexError) as e:
+            print(f"Erreur lors du chargement du plan modèle {index}: {e}")
+            return None
 
-                filename = current_plan_ref.get("filename")
-                if not filename:
-                    return None
+    def save_plan(self, plan, make_current: bool = True) -> Optional[int]:
+        """
+        Sauvegarde un plan d'entraînement
 
-                filepath = os.path.join(self.storage_dir, filename)
+        Args:
+            plan: Plan d'entraînement à sauvegarder
+            make_current: Si True, le plan devient le plan courant. Avec
+                          st.session_state, seul le plan courant est conservé
 
-                if not os.path.exists(filepath):
-                    return None
+        Returns:
+            Identifiant du plan dans la base (None avec st.session_state)
+        """
+        if self.use_session_state:
+            # Utiliser st.session_state pour stocker le plan
+            if make_current:
+                st.session_state["current_plan"] = plan
+            return None
 
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    plan_data = json.load(f)
+        # Enregistrer le plan et la référence au plan courant en une transaction
+        return self.plan_store.save_plan(plan, self.plan_format, make_current=make_current)
 
-                return TrainingPlan.from_dict(plan_data)
+    def load_plan(self, lazy: bool = False) -> Optional['TrainingPlan']:
+        """
+        Charge le plan d'entraînement courant
 
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Erreur lors du chargement du plan: {e}")
-                return None
+        Args:
+            lazy: Si True, les séances sont lues à la demande, semaine par
+                  semaine (plans au format "chunked", voir PlanStore.load_plan_lazy)
+
+        Returns:
+            Plan d'entraînement ou None si aucun plan n'est stocké
+        """
+        if self.use_session_state:
+            # Récupérer le plan depuis st.session_state
+            return st.session_state.get("current_plan")
+
+        try:
+            return self.plan_store.load_current_plan(trusted=self.trusted_load, lazy=lazy)
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Erreur lors du chargement du plan: {e}")
+            return None
 
     def save_user_preferences(self, preferences: Dict[str, Any]) -> None:
         """
@@ -112,8 +231,7 @@ class StorageManager:
             preferences_path = os.path.join(
                 self.storage_dir, "preferences.json")
 
-            with open(preferences_path, 'w', encoding='utf-8') as f:
-                json.dump(preferences, f, indent=2)
+            write_json_atomic(preferences_path, preferences)
 
     def load_user_preferences(self) -> Dict[str, Any]:
         """
@@ -143,6 +261,62 @@ class StorageManager:
                 print(f"Erreur lors du chargement des préférences: {e}")
                 return {}
 
+    def save_ics_sequences(self, plan_id: str, sequences: Dict[date, int]) -> None:
+        """
+        Sauvegarde les numéros de révision (SEQUENCE) publiés pour les
+        événements ICS d'un plan
+
+        Args:
+            plan_id: Identifiant du plan dans les UID (voir ics_plan_id)
+            sequences: Numéro de révision de l'événement de chaque date
+        """
+        serializable = {session_date.isoformat(): sequence for session_date, sequence in sequences.items()}
+
+        if self.use_session_state:
+            st.session_state.setdefault("ics_sequences", {})[plan_id] = serializable
+            return
+
+        sequences_path = os.path.join(self.storage_dir, ICS_SEQUENCES_FILENAME)
+        with self._sequences_lock:
+            all_sequences = self._read_ics_sequences(sequences_path)
+            all_sequences[plan_id] = serializable
+            try:
+                write_json_atomic(sequences_path, all_sequences)
+            except (IOError, TypeError) as e:
+                print(f"Erreur lors de la sauvegarde des révisions ICS: {e}")
+
+    def load_ics_sequences(self, plan_id: str) -> Dict[date, int]:
+        """
+        Charge les numéros de révision (SEQUENCE) publiés pour les événements
+        ICS d'un plan
+
+        Args:
+            plan_id: Identifiant du plan dans les UID (voir ics_plan_id)
+
+        Returns:
+            Numéro de révision de l'événement de chaque date (vide si aucun)
+        """
+        if self.use_session_state:
+            stored = st.session_state.get("ics_sequences", {}).get(plan_id, {})
+        else:
+            stored = self._read_ics_sequences(os.path.join(self.storage_dir, ICS_SEQUENCES_FILENAME)).get(plan_id, {})
+
+        return {date.fromisoformat(session_date): int(sequence) for session_date, sequence in stored.items()}
+
+    @staticmethod
+    def _read_ics_sequences(path: str) -> Dict[str, Dict[str, int]]:
+        """Lit le fichier des numéros de révision ICS (vide s'il est absent ou illisible)"""
+        if not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Erreur lors du chargement des révisions ICS: {e}")
+            return {}
+
     def save_user_input(self, user_input: Dict[str, Any]) -> None:
         """
         Sauvegarde les entrées utilisateur
@@ -167,8 +341,7 @@ class StorageManager:
                 else:
                     serializable_input[key] = value
 
-            with open(input_path, 'w', encoding='utf-8') as f:
-                json.dump(serializable_input, f, indent=2)
+            write_json_atomic(input_path, serializable_input)
 
     def load_user_input(self) -> Dict[str, Any]:
         """
@@ -198,12 +371,21 @@ class StorageManager:
                     f"Erreur lors du chargement des entrées utilisateur: {e}")
                 return {}
 
-    def list_saved_plans(self) -> List[Dict[str, Any]]:
+    def list_saved_plans(self, offset: int = 0, limit: Optional[int] = None,
+                         race_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Liste tous les plans sauvegardés
+        Liste les plans sauvegardés, du plus récent au plus ancien
+
+        Seules les métadonnées indexées sont lues, pas le corps des plans.
+
+        Args:
+            offset: Nombre de plans à sauter (pagination)
+            limit: Nombre maximal de plans renvoyés (None = tous)
+            race_type: Ne renvoyer que les plans de ce type de course
 
         Returns:
-            Liste des plans sauvegardés avec métadonnées
+            Liste des plans sauvegardés avec métadonnées (id, created_at,
+            start_date, race_date, race_type, weeks, total_volume)
         """
         if self.use_session_state:
             # Avec st.session_state, on ne peut stocker qu'un seul plan
@@ -215,84 +397,59 @@ class StorageManager:
                     "plan": plan
                 }]
             return []
-        else:
-            # Lister tous les fichiers de plan dans le répertoire de stockage
-            plans = []
-
-            if not os.path.exists(self.storage_dir):
-                return []
-
-            for filename in os.listdir(self.storage_dir):
-                if filename.startswith("plan_") and filename.endswith(".json"):
-                    filepath = os.path.join(self.storage_dir, filename)
 
-                    try:
-                        # Extraire la date de création du nom de fichier
-                        # Enlever "plan_" et ".json"
-                        created_at_str = filename[5:-5]
-                        created_at = datetime.strptime(
-                            created_at_str, "%Y%m%d_%H%M%S")
+        try:
+            return self.plan_store.list_plans(offset, limit, race_type)
 
-                        # Charger juste les métadonnées du plan
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            plan_data = json.load(f)
+        except sqlite3.Error as e:
+            print(f"Erreur lors du listage des plans: {e}")
+            return []
 
-                        # Extraire les informations importantes
-                        user_data = plan_data.get("user_data", {})
+    def count_saved_plans(self, race_type: Optional[str] = None) -> int:
+        """
+        Compte les plans sauvegardés (pour la pagination de list_saved_plans)
 
-                        plans.append({
-                            "filename": filename,
-                            "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                            "race_type": user_data.get("main_race", {}).get("race_type", ""),
-                            "race_date": user_data.get("main_race", {}).get("race_date", ""),
-                            "start_date": user_data.get("start_date", "")
-                        })
+        Args:
+            race_type: Ne compter que les plans de ce type de course
 
-                    except (json.JSONDecodeError, IOError, ValueError) as e:
-                        print(
-                            f"Erreur lors du chargement du plan {filename}: {e}")
+        Returns:
+            Nombre de plans
+        """
+        if self.use_session_state:
+            return 1 if st.session_state.get("current_plan") else 0
 
-            # Trier par date de création (plus récent en premier)
-            return sorted(plans, key=lambda p: p["created_at"], reverse=True)
+        return self.plan_store.count_plans(race_type)
 
-    def load_plan_by_filename(self, filename: str) -> Optional['TrainingPlan']:
+    def load_plan_by_id(self, plan_id: int, lazy: bool = False) -> Optional['TrainingPlan']:
         """
-        Charge un plan d'entraînement à partir de son nom de fichier
+        Charge un plan d'entraînement à partir de son identifiant
 
         Args:
-            filename: Nom du fichier contenant le plan
+            plan_id: Identifiant du plan (voir list_saved_plans)
+            lazy: Si True, les séances sont lues à la demande (voir load_plan)
 
         Returns:
-            Plan d'entraînement ou None si le fichier n'existe pas
+            Plan d'entraînement ou None si le plan n'existe pas
         """
-        # Import moved here to avoid circular import
-        from models.plan import TrainingPlan
-
         if self.use_session_state:
             # Avec st.session_state, on ne peut charger que le plan courant
             return st.session_state.get("current_plan")
-        else:
-            filepath = os.path.join(self.storage_dir, filename)
 
-            if not os.path.exists(filepath):
-                return None
-
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    plan_data = json.load(f)
+        try:
+            if lazy:
+                return self.plan_store.load_plan_lazy(plan_id, trusted=self.trusted_load)
+            return self.plan_store.load_plan(plan_id, trusted=self.trusted_load)
 
-                return TrainingPlan.from_dict(plan_data)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Erreur lors du chargement du plan {plan_id}: {e}")
+            return None
 
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Erreur lors du chargement du plan {filename}: {e}")
-                return None
-
-    def delete_plan(self, filename: str) -> bool:
+    def delete_plan(self, plan_id: int) -> bool:
         """
-        Supprime un plan d'entraînement
+        Supprime un plan d'entraînement (et la référence au plan courant s'il l'était)
 
         Args:
-            filename: Nom du fichier contenant le plan
+            plan_id: Identifiant du plan
 
         Returns:
             True si la suppression a réussi, False sinon
@@ -303,36 +460,108 @@ class StorageManager:
                 del st.session_state["current_plan"]
                 return True
             return False
-        else:
-            filepath = os.path.join(self.storage_dir, filename)
 
-            if not os.path.exists(filepath):
-                return False
+        try:
+            return self.plan_store.delete_plan(plan_id)
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression du plan {plan_id}: {e}")
+            return False
+
+    def disk_usage(self) -> Dict[str, Any]:
+        """
+        Bilan de l'occupation du stockage des plans (voir PlanStore.disk_usage)
+
+        Returns:
+            Dictionnaire du bilan, vide avec st.session_state
+        """
+        if self.use_session_state:
+            return {}
+
+        return self.plan_store.disk_usage()
+
+    def collect_garbage(self) -> Dict[str, int]:
+        """
+        Supprime les séances et manifestes qui ne sont plus référencés par aucun plan
+
+        Returns:
+            Dictionnaire avec le nombre de manifestes et de séances supprimés
+        """
+        if self.use_session_state:
+            return {"manifests": 0, "chunks": 0}
+
+        return self.plan_store.collect_garbage()
+
+    def migrate_plan_files(self, remove_files: bool = False) -> int:
+        """
+        Importe dans la base les anciens fichiers de plan (plan_*.json, plan_*.plan)
+
+        La date de création est reprise du nom du fichier et la référence
+        current_plan.json est convertie. Un fichier déjà migré est ignoré, la
+        migration peut donc être relancée sans risque.
+
+        Args:
+            remove_files: Si True, supprime les fichiers migrés (et current_plan.json)
+
+        Returns:
+            Nombre de plans importés
+        """
+        if self.use_session_state or not os.path.exists(self.storage_dir):
+            return 0
+
+        store = self.plan_store
+        migrated = []
+        imported = 0
+
+        for filename in sorted(os.listdir(self.storage_dir)):
+            name, extension = os.path.splitext(filename)
+            if not name.startswith("plan_") or extension not in PLAN_FILE_EXTENSIONS.values():
+                continue
+
+            if store.find_source(filename) is not None:
+                migrated.append(filename)
+                continue
+
+            filepath = os.path.join(self.storage_dir, filename)
 
             try:
-                os.remove(filepath)
+                created_at = datetime.strptime(name[5:], "%Y%m%d_%H%M%S")
 
-                # Si c'est le plan courant, supprimer également la référence
-                current_plan_path = os.path.join(
-                    self.storage_dir, "current_plan.json")
+                with open(filepath, 'rb') as f:
+                    plan = decode_plan_body(f.read(), trusted=self.trusted_load)
 
-                if os.path.exists(current_plan_path):
-                    try:
-                        with open(current_plan_path, 'r', encoding='utf-8') as f:
-                            current_plan_ref = json.load(f)
+                store.save_plan(plan, self.plan_format, make_current=False,
+                                created_at=created_at, source=filename)
+                migrated.append(filename)
+                imported += 1
 
-                        if current_plan_ref.get("filename") == filename:
-                            os.remove(current_plan_path)
+            except (json.JSONDecodeError, IOError, ValueError, KeyError, sqlite3.Error) as e:
+                print(f"Erreur lors de la migration du plan {filename}: {e}")
 
-                    except (json.JSONDecodeError, IOError) as e:
-                        print(
-                            f"Erreur lors de la vérification du plan courant: {e}")
+        # Reprendre la référence au plan courant
+        current_plan_path = os.path.join(self.storage_dir, "current_plan.json")
+        if os.path.exists(current_plan_path):
+            try:
+                with open(current_plan_path, 'r', encoding='utf-8') as f:
+                    current_plan_ref = json.load(f)
 
-                return True
+                plan_id = store.find_source(current_plan_ref.get("filename", ""))
+                if plan_id is not None:
+                    store.set_current(plan_id)
+                    if remove_files:
+                        os.remove(current_plan_path)
+
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Erreur lors de la migration du plan courant: {e}")
+
+        if remove_files:
+            for filename in migrated:
+                try:
+                    os.remove(os.path.join(self.storage_dir, filename))
+                except OSError as e:
+                    print(f"Erreur lors de la suppression du plan {filename}: {e}")
 
-            except IOError as e:
-                print(f"Erreur lors de la suppression du plan {filename}: {e}")
-                return False
+        return imported
 
 
 # Créer une instance de StorageManager par défaut
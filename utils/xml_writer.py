@@ -0,0 +1,135 @@
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+# Taille (caractères) au-delà de laquelle le tampon est écrit dans la destination
+FLUSH_SIZE = 64 * 1024
+
+Attributes = Sequence[Tuple[str, str]]
+
+
+def escape_xml(value: str) -> str:
+    """
+    Échappe un texte ou une valeur d'attribut XML
+
+    Args:
+        value: Texte à échapper
+
+    Returns:
+        Texte échappé (&, <, > et ")
+    """
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    return value
+
+
+class XmlWriter:
+    """
+    Écriture en flux d'un document XML indenté, en une seule passe
+
+    Les éléments sont écrits au fur et à mesure dans la destination (par
+    blocs de FLUSH_SIZE caractères): aucun arbre n'est construit. La mise en
+    forme est celle de minidom.toprettyxml: un élément par ligne, texte sur
+    la ligne de son élément, éléments vides auto-fermants.
+
+    Exemple:
+        writer = XmlWriter(sink)
+        writer.start("Workouts")
+        writer.element("Name", "Seuil")
+        writer.end()
+        writer.close()
+    """
+
+    def __init__(self, sink: BinaryIO, indent: str = "  ", encoding: str = "utf-8"):
+        """
+        Initialise l'écriture et écrit la déclaration XML
+
+        Args:
+            sink: Destination ouverte en écriture binaire (fichier, BytesIO...)
+            indent: Indentation d'un niveau
+            encoding: Encodage du document
+        """
+        self.sink = sink
+        self.indent = indent
+        self.encoding = encoding
+        self._parts: List[str] = [f'<?xml version="1.0" encoding="{encoding}"?>\n']
+        self._size = 0
+        self._stack: List[str] = []
+        # Balise ouvrante pas encore terminée (pour écrire <Element/> si l'élément reste vide)
+        self._open = False
+
+    def _close_start_tag(self) -> None:
+        if self._open:
+            self._open = False
+            self._append(">\n")
+
+    def _append(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= FLUSH_SIZE:
+            self.flush()
+
+    @staticmethod
+    def _attributes(attributes: Optional[Attributes]) -> str:
+        if not attributes:
+            return ""
+        return "".join(f' {name}="{escape_xml(value)}"' for name, value in attributes)
+
+    def start(self, tag: str, attributes: Optional[Attributes] = None) -> None:
+        """
+        Ouvre un élément
+
+        Args:
+            tag: Nom de l'élément
+            attributes: Attributs (nom, valeur), dans l'ordre d'écriture
+        """
+        self._close_start_tag()
+        self._append(f"{self.indent * len(self._stack)}<{tag}{self._attributes(attributes)}")
+        self._stack.append(tag)
+        self._open = True
+
+    def end(self) -> None:
+        """Ferme l'élément ouvert en dernier"""
+        tag = self._stack.pop()
+        if self._open:
+            self._append("/>\n")
+            self._open = False
+        else:
+            self._append(f"{self.indent * len(self._stack)}</{tag}>\n")
+
+    def element(self, tag: str, text: Optional[str] = None, attributes: Optional[Attributes] = None) -> None:
+        """
+        Écrit un élément sans enfant
+
+        Args:
+            tag: Nom de l'élément
+            text: Texte de l'élément (None ou vide = élément vide)
+            attributes: Attributs (nom, valeur)
+        """
+        self._close_start_tag()
+        prefix = f"{self.indent * len(self._stack)}<{tag}{self._attributes(attributes)}"
+        if text:
+            self._append(f"{prefix}>{escape_xml(text)}</{tag}>\n")
+        else:
+            self._append(f"{prefix}/>\n")
+
+    def flush(self) -> None:
+        """Écrit le contenu en attente dans la destination"""
+        if self._parts:
+            self.sink.write("".join(self._parts).encode(self.encoding))
+        self._parts = []
+        self._size = 0
+
+    def close(self) -> None:
+        """
+        Ferme les éléments encore ouverts et écrit le contenu en attente
+
+        La destination n'est pas fermée.
+        """
+        while self._stack:
+            self.end()
+        self.flush()